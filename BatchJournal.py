@@ -0,0 +1,214 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+STATE_QUEUED = "queued"
+STATE_OPENED = "opened"
+STATE_SAVED = "saved"
+STATE_FAILED = "failed"
+STATE_SKIPPED = "skipped"  # Left alone on purpose (existing PDF, no password); not retried
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    output_dir TEXT,
+    settings TEXT,
+    summary TEXT
+);
+CREATE TABLE IF NOT EXISTS files (
+    batch_id INTEGER NOT NULL REFERENCES batches(id),
+    idx INTEGER NOT NULL,
+    input_path TEXT NOT NULL,
+    state TEXT NOT NULL,
+    message TEXT,
+    queued_at REAL,
+    opened_at REAL,
+    saved_at REAL,
+    finished_at REAL,
+    PRIMARY KEY (batch_id, idx)
+);
+"""
+
+# Each buffered event is (sql, params); they are replayed in order inside one transaction.
+_QUEUE_SQL = "INSERT OR REPLACE INTO files (batch_id, idx, input_path, state, queued_at) VALUES (?, ?, ?, 'queued', ?)"
+_OPENED_SQL = "UPDATE files SET state = 'opened', opened_at = ? WHERE batch_id = ? AND idx = ?"
+_SAVED_SQL = "UPDATE files SET state = 'saved', saved_at = ? WHERE batch_id = ? AND idx = ?"
+_FINISHED_SQL = (
+    "UPDATE files SET state = ?, message = ?, finished_at = ?, saved_at = COALESCE(saved_at, ?) "
+    "WHERE batch_id = ? AND idx = ?"
+)
+
+
+def default_journal_path() -> str:
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_STATE_HOME") or os.path.join(os.path.expanduser("~"), ".local", "state")
+    return os.path.join(base, "WordToPdfConverter", "journal.sqlite3")
+
+
+class JournalBatch:
+    """Summary of one journaled batch, as read back for resume/retry."""
+
+    def __init__(self, batch_id, started_at, finished_at, output_dir, summary, counts):
+        self.batch_id = batch_id
+        self.started_at = started_at
+        self.finished_at = finished_at
+        self.output_dir = output_dir
+        self.summary = summary
+        self.counts = counts  # state -> number of files
+
+    @property
+    def unfinished(self) -> int:
+        return self.counts.get(STATE_QUEUED, 0) + self.counts.get(STATE_OPENED, 0)
+
+    @property
+    def failed(self) -> int:
+        return self.counts.get(STATE_FAILED, 0)
+
+    @property
+    def skipped(self) -> int:
+        return self.counts.get(STATE_SKIPPED, 0)
+
+
+class BatchJournal:
+    """Durable record of every file's progress through a batch, in SQLite.
+
+    State transitions (queued, opened, saved, failed, skipped) are buffered
+    in memory and written in one transaction once `flush_size` events have
+    accumulated or `flush_interval` seconds have passed (a background thread
+    flushes on time while Word is busy with a long document), so a large
+    batch costs one commit per few hundred files instead of one per file. A
+    crash loses at most the last unflushed interval; those files are simply
+    converted again on resume.
+
+    Recording is safe from any thread. A journal that cannot be written stops
+    recording and keeps the error in `error`; it never fails a conversion.
+    """
+
+    def __init__(self, path=None, flush_size=200, flush_interval=1.0):
+        self.path = path or default_journal_path()
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.batch_id = None
+        self.error = None
+        self._events = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")  # WAL stays consistent; only the last commit may be lost
+            self._db.executescript(_SCHEMA)
+        except sqlite3.Error as e:
+            raise OSError(f"Cannot open the batch journal {self.path}: {e}")
+        self._flusher = threading.Thread(target=self._flush_periodically, name="journal-flush", daemon=True)
+        self._flusher.start()
+
+    # --- Recording ---
+    def begin_batch(self, output_dir=None, settings=None) -> int:
+        with self._lock:
+            self._flush_locked()
+            cursor = self._db.execute(
+                "INSERT INTO batches (started_at, output_dir, settings) VALUES (?, ?, ?)",
+                (time.time(), output_dir or None, json.dumps(settings or {}, sort_keys=True)),
+            )
+            self.batch_id = cursor.lastrowid
+        return self.batch_id
+
+    def file_queued(self, index: int, input_path: str):
+        self._record(_QUEUE_SQL, (self.batch_id, index, os.path.abspath(input_path), time.time()))
+
+    def file_stage(self, index: int, stage: str):
+        """Record a convert_file() stage; only "opened" and "saved" are kept."""
+        if stage == STATE_OPENED:
+            self._record(_OPENED_SQL, (time.time(), self.batch_id, index))
+        elif stage == STATE_SAVED:
+            self._record(_SAVED_SQL, (time.time(), self.batch_id, index))
+
+    def file_finished(self, index: int, success: bool, message: str, skipped: bool = False):
+        now = time.time()
+        state = STATE_SAVED if success else STATE_SKIPPED if skipped else STATE_FAILED
+        self._record(_FINISHED_SQL, (state, message, now, now if success else None, self.batch_id, index))
+
+    def end_batch(self, summary: str):
+        self._record("UPDATE batches SET finished_at = ?, summary = ? WHERE id = ?", (time.time(), summary, self.batch_id))
+        self.flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        self._closed.set()
+        self._flusher.join()
+        self.flush()
+        self._db.close()
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            with self._lock:
+                if self._events and time.monotonic() - self._last_flush >= self.flush_interval:
+                    self._flush_locked()
+
+    def _record(self, sql: str, params: tuple):
+        if self.batch_id is None:
+            return
+        with self._lock:
+            self._events.append((sql, params))
+            if len(self._events) >= self.flush_size or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        events, self._events = self._events, []
+        self._last_flush = time.monotonic()
+        if not events or self.error:
+            return
+        try:
+            self._db.execute("BEGIN")
+            for sql, params in events:
+                self._db.execute(sql, params)
+            self._db.execute("COMMIT")
+        except sqlite3.Error as e:
+            if self._db.in_transaction:
+                self._db.execute("ROLLBACK")
+            self.error = str(e)
+
+    # --- Reading back ---
+    def last_batch(self):
+        """The most recent batch as a JournalBatch, or None."""
+        with self._lock:
+            self._flush_locked()
+            row = self._db.execute(
+                "SELECT id, started_at, finished_at, output_dir, summary FROM batches ORDER BY id DESC LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            counts = dict(self._db.execute(
+                "SELECT state, COUNT(*) FROM files WHERE batch_id = ? GROUP BY state", (row[0],)
+            ).fetchall())
+        return JournalBatch(*row, counts)
+
+    def unfinished_paths(self, batch_id: int) -> list:
+        """Files of `batch_id` that were queued but never finished, in order."""
+        return self._paths_in_states(batch_id, (STATE_QUEUED, STATE_OPENED))
+
+    def failed_paths(self, batch_id: int) -> list:
+        return self._paths_in_states(batch_id, (STATE_FAILED,))
+
+    def _paths_in_states(self, batch_id: int, states) -> list:
+        placeholders = ", ".join("?" for _ in states)
+        with self._lock:
+            self._flush_locked()
+            rows = self._db.execute(
+                f"SELECT input_path FROM files WHERE batch_id = ? AND state IN ({placeholders}) ORDER BY idx",
+                (batch_id, *states),
+            ).fetchall()
+        return [row[0] for row in rows]
@@ -0,0 +1,911 @@
+import os
+import threading
+import time
+
+from ConversionBackend import WordBackend
+from ConversionCache import file_digest
+from DocumentWatchdog import CANCELLED, TIMED_OUT, DocumentWatchdog
+from EncryptionProbe import probe_encryption
+from ExportProfile import find_export_profile
+from OutputPlan import OutputPlan
+from PreflightChecker import PreflightChecker
+from RevisionScanner import shared_revision_scanner
+from StagingArea import StagingArea
+from CostEstimator import CostEstimator, ScheduledQueue
+from ConversionEngine import (
+    REPAIR_OPEN,
+    PasswordRequiredError,
+    convert_file,
+    passwords_to_try,
+)
+from WorkerPool import WorkerPool
+
+
+class BatchFatalError(Exception):
+    """The batch could not continue, e.g. Word is missing or could not be started."""
+
+
+OVERWRITE_POLICIES = ("ask", "skip", "overwrite", "rename", "newer")
+PASSWORD_POLICIES = ("ask", "skip")
+
+
+class PendingPrompt:
+    """A file parked until the user decides what to do with it.
+
+    For an OVERWRITE prompt the answer is "overwrite", "rename" or "skip";
+    for a PASSWORD prompt it is the password. None skips the file.
+    """
+
+    OVERWRITE = "overwrite"
+    PASSWORD = "password"
+
+    def __init__(self, kind: str, index: int, input_path: str, output_path: str, digest=None):
+        self.kind = kind
+        self.index = index
+        self.input_path = input_path
+        self.output_path = output_path
+        self.digest = digest
+        self.answer = None
+
+    @property
+    def pdf_name(self) -> str:
+        return os.path.basename(self.output_path)
+
+
+class BatchListener:
+    """Receives events from a BatchRunner.
+
+    The defaults ignore progress and leave every prompt unanswered (skip),
+    which is what an unattended run wants.
+    """
+
+    def on_status(self, text: str):
+        pass
+
+    def on_progress(self, percent: int):
+        pass
+
+    def on_file_finished(self, index: int, message: str, success: bool):
+        pass
+
+    def on_file_deferred(self, index: int, message: str):
+        pass
+
+    def on_output_plan(self, plan):
+        """Called once before the first conversion with the OutputPlan of the
+        files queued so far, to report collisions and existing PDFs together."""
+        pass
+
+    def resolve_prompts(self, prompts):
+        """Set `answer` on each PendingPrompt. Called once, on the runner's
+        thread, after every other file has been converted."""
+        pass
+
+
+def remove_if_exists(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass  # Already gone since the output plan listed it
+
+
+class BatchRunner:
+    """Converts a batch of documents one after another with a single backend.
+
+    This is the Qt-free core behind ConverterWorker and the command line.
+    With `input_open=True` more files may be queued with add_paths() while
+    the batch runs; the runner waits for them until close_input() is called.
+
+    Every output path is planned up front from one listing per target
+    folder (see OutputPlan); inputs that would write the same PDF get
+    numbered names. Existing PDFs and password-protected files never stall
+    the batch: they are handled by `overwrite_policy` / `password_policy`,
+    and with "ask" they are parked and put to the listener together once
+    the rest is done.
+
+    Word is restarted after `recycle_after` documents, or once it uses more
+    than `max_memory_bytes`, so long runs do not suffer from its leaks.
+
+    With `preflight`, queued files are validated on a thread pool while Word
+    works; lock files, non-Word and damaged files are reported right away
+    and never reach Word.
+
+    `schedule` picks the conversion order: "order" keeps the list order,
+    "longest" and "shortest" go by the cost estimator's predicted durations.
+
+    PDFs are written with the ExportProfile named `export_profile`.
+
+    A document still converting after `document_timeout` seconds is marked
+    as timed out and Word is killed and restarted for the rest of the batch.
+    stop() takes effect between files, or after at most `cancel_timeout`
+    seconds by killing Word.
+
+    With `prefetch` > 0, the next `prefetch` files are copied to a local
+    StagingArea while Word converts, and PDFs are written locally and moved
+    to their destination in the background; for documents on slow shares.
+    """
+
+    def __init__(self, input_paths, output_dir=None, default_password=None, backend_factory=None,
+                 cache=None, listener=None, input_open=False, overwrite_policy="ask", password_policy="ask",
+                 journal=None, metrics=None, recycle_after=None, max_memory_bytes=None, preflight=True,
+                 schedule="order", cost_estimator=None, revision_scanner=None, document_timeout=None,
+                 cancel_timeout=5.0, export_profile=None, prefetch=0, staging_max_bytes=2 * 1024 ** 3):
+        self.input_paths = list(input_paths)
+        self.output_dir = output_dir
+        self.default_password = default_password
+        self.backend_factory = backend_factory or WordBackend  # Called on the runner's thread
+        self.cache = cache  # Optional ConversionCache shared by all files of the batch
+        self.listener = listener or BatchListener()
+        self.journal = journal  # Optional BatchJournal recording each file's progress
+        self.metrics = metrics  # Optional BatchMetrics collecting per-stage timings
+        self.recycle_after = recycle_after
+        self.max_memory_bytes = max_memory_bytes
+        self.passwords = {}  # Store passwords for specific files
+        self.overwrite_policy = overwrite_policy
+        self.password_policy = password_policy
+        self.pending_prompts = []
+        self.export_settings = None
+        self.success_count = 0
+        self._password_answered = set()  # Indices whose password came from a prompt
+        self._documents_since_start = 0
+        self.preflight = PreflightChecker(self.reject_file) if preflight else None
+        self._preflight_started = False
+        self._finish_lock = threading.RLock()  # Pre-flight threads finish rejected files too
+        self.schedule = schedule
+        self.cost_estimator = cost_estimator or CostEstimator()
+        self.predicted_seconds = {}  # file index -> estimated conversion time
+        self.revision_scanner = revision_scanner or shared_revision_scanner()
+        self.revision_scans = {}  # file index -> tracked changes found by the pre-scan (None: unknown)
+        self.output_plan = OutputPlan(output_dir)
+        self._outputs_planned = False
+        self.document_timeout = document_timeout
+        self.cancel_timeout = cancel_timeout
+        self.export_profile = find_export_profile(export_profile)
+        self.open_tiers = {}  # FAST_OPEN / REPAIR_OPEN -> [documents, seconds]
+        self.prefetch = prefetch
+        self.staging_max_bytes = staging_max_bytes
+        self.staging = None  # StagingArea while a batch with prefetching runs
+        self._watchdog = None
+        self._backend_killed = False
+        self._is_running = True
+        self._input_open = input_open
+        self._input_changed = threading.Condition()
+
+    def stop(self):
+        self._is_running = False
+        with self._input_changed:
+            self._input_changed.notify_all()
+        watchdog = self._watchdog
+        if watchdog:
+            watchdog.cancel(self.cancel_timeout)
+
+    def add_paths(self, paths):
+        """Queue more files; safe to call from any thread while the batch runs."""
+        with self._input_changed:
+            if self.journal:
+                for index, path in enumerate(paths, len(self.input_paths)):
+                    self.journal.file_queued(index, path)
+            if self._preflight_started:
+                for index, path in enumerate(paths, len(self.input_paths)):
+                    self.preflight.submit(index, path)
+            if self._outputs_planned:
+                for index, path in enumerate(paths, len(self.input_paths)):
+                    self.output_plan.add(index, path)
+            self.input_paths.extend(paths)
+            self._input_changed.notify_all()
+
+    def close_input(self):
+        """Declare that no more files will be added."""
+        with self._input_changed:
+            self._input_open = False
+            self._input_changed.notify_all()
+
+    def wait_for_input(self, index: int, timeout=None) -> bool:
+        """True once file `index` is queued; False if the input was closed
+        (or stopped, or `timeout` passed) before that."""
+        with self._input_changed:
+            self._input_changed.wait_for(
+                lambda: index < len(self.input_paths) or not self._input_open or not self._is_running,
+                timeout,
+            )
+            return index < len(self.input_paths)
+
+    def total_label(self) -> str:
+        """File count for status messages, with a "+" while more may arrive."""
+        return f"{len(self.input_paths)}{'+' if self._input_open else ''}"
+
+    @property
+    def is_running(self) -> bool:
+        return self._is_running
+
+    def run(self) -> str:
+        """Convert every file and return the summary message.
+
+        Raises BatchFatalError if the backend is unavailable or fails as a whole.
+        """
+        backend = self.backend_factory()
+        try:
+            backend.prepare()
+        except ImportError as e:
+            raise BatchFatalError(f"Fatal Error: {e}")
+
+        if not self.wait_for_input(0):
+            return "No files were selected to process."
+
+        try:
+            self.export_settings = backend.export_settings(self.export_profile)
+            self.begin_journal()
+            self.plan_outputs()
+            self.start_preflight()  # Runs while Word starts
+            self.start_staging()
+            self.listener.on_status(f"Starting {backend.display_name}...")
+            started = time.perf_counter()
+            backend.start()
+            self.record_backend_timing("startup", started)
+            self._watchdog = DocumentWatchdog(backend.kill, self.document_timeout)
+
+            queue = ScheduledQueue(self.schedule)
+            admitted = 0
+            position = 0
+            while self._is_running:
+                # In list order only the next files are needed; otherwise all queued files compete
+                while admitted < len(self.input_paths) and (self.schedule != "order" or len(queue) <= self.prefetch):
+                    if self.preflight_rejected(admitted):
+                        position += 1
+                    else:
+                        queue.push(admitted, self.estimate_cost(admitted))
+                    admitted += 1
+                if not queue:
+                    if self.wait_for_input(admitted):
+                        continue
+                    break
+
+                i = queue.pop()
+                self.prefetch_files(queue.peek(self.prefetch))
+                input_path = self.input_paths[i]
+                file_name = os.path.basename(input_path)
+                self.listener.on_status(f"Processing ({position + 1}/{self.total_label()}): {file_name}")
+                base_progress = int((position / len(self.input_paths)) * 100)
+                self.listener.on_progress(base_progress)
+                task = None
+                try:
+                    task = self.plan_file(i, input_path)
+                    if task is not None:
+                        self._convert_task(backend, task, base_progress)
+                except Exception as e:
+                    self.finish_file(i, f"❌ Error: {str(e)}", False)
+                if task is not None:
+                    self.recycle_backend_if_due(backend)
+                position += 1
+
+            tasks = self.resolve_prompts()
+            while (tasks or self.pending_prompts) and self._is_running:
+                for task in tasks:
+                    if not self._is_running:
+                        break
+                    self.listener.on_status(f"Processing: {os.path.basename(task[1])}")
+                    self._convert_task(backend, task, 99)
+                    self.recycle_backend_if_due(backend)
+                tasks = self.resolve_prompts()  # A renamed or overwritten file may turn out to need a password
+            self.resolve_prompts()  # After a stop, report files still parked as skipped
+            self.stop_staging()  # Reports the files whose PDFs were still being moved
+
+            total_files = len(self.input_paths)
+            self.listener.on_progress(100)
+            summary = self.summary(f"Batch complete. {self.success_count} of {total_files} files converted successfully.")
+            self.end_journal(summary)
+            return summary
+
+        except Exception as e:
+            message = f"A fatal error occurred: {e}\nEnsure MS Word is installed and not blocked."
+            self.end_journal(message)
+            raise BatchFatalError(message)
+
+        finally:
+            self.stop_preflight()
+            self.stop_staging()
+            if self._watchdog:
+                self._watchdog.close()
+            started = time.perf_counter()
+            backend.quit()
+            self.record_backend_timing("quit", started)
+            if self.metrics:
+                self.metrics.finish()
+
+    def _convert_task(self, backend, task, base_progress: int):
+        index, absolute_input_path, output_path, passwords, digest = task
+        stage_progress = {"opened": 25, "revisions": 50, "saved": 90}
+
+        def on_stage(stage):
+            self.listener.on_progress(min(base_progress + stage_progress[stage], 100))
+            self.record_stage(index, stage)
+
+        input_path, pdf_path = self.staged_paths(task)
+        timings = {}
+        self._watchdog.arm(index)
+        try:
+            result = convert_file(backend, input_path, pdf_path, passwords, on_stage, timings,
+                                  self.revision_scans.get(index), self.export_profile)
+        except Exception as e:
+            self.record_file_timings(task, timings, False)
+            self.discard_staged(index)
+            expired = self._watchdog.expired(index)
+            if expired:
+                self._backend_killed = True
+                self.finish_file(index, self.expired_message(expired), False)
+            elif isinstance(e, PasswordRequiredError):
+                self.handle_password_required(task, e)
+            else:
+                self.finish_file(index, f"❌ Error: {str(e)}", False)
+            return
+        finally:
+            self._watchdog.disarm()
+        if self._watchdog.expired(index):
+            self._backend_killed = True  # Killed just as the document finished
+
+        self.record_file_timings(task, timings, True)
+        self.record_open_tier(result.open_tier, timings.get("open", 0.0))
+        self.complete_file(index, output_path, digest, result)
+
+    def complete_file(self, index: int, output_path: str, digest, result):
+        """Finish a converted file; a staged PDF is published first, in the background."""
+        if not self.staging:
+            self.store_cached(digest, output_path, self.export_settings, result.password)
+            self.finish_file(index, result.message, True)
+            return
+
+        def on_published(error):
+            try:
+                if error is not None:
+                    self.finish_file(index, f"❌ Error: the PDF could not be moved to its folder: {error}", False)
+                    return
+                if self.journal:
+                    self.journal.file_stage(index, "saved")  # Only now is the PDF where resume looks for it
+                self.store_cached(digest, output_path, self.export_settings, result.password)
+            except Exception as e:
+                self.finish_file(index, f"❌ Error: {str(e)}", False)
+                return
+            self.finish_file(index, result.message, True)
+
+        self.staging.release_input(index)
+        self.staging.publish(index, output_path, on_published)
+
+    def recycle_backend_if_due(self, backend):
+        """Restart `backend` once it converted `recycle_after` documents or
+        its memory use exceeds `max_memory_bytes`, or after the watchdog
+        killed it."""
+        self._documents_since_start += 1
+        due = bool(self.recycle_after and self._documents_since_start >= self.recycle_after)
+        if self._backend_killed:
+            if not self._is_running:
+                return  # Quitting anyway
+            due = True
+        elif not due and self.max_memory_bytes:
+            memory = backend.memory_usage()
+            due = memory is not None and memory > self.max_memory_bytes
+        if not due:
+            return
+        self._backend_killed = False
+        self.listener.on_status(f"Restarting {backend.display_name}...")
+        started = time.perf_counter()
+        backend.quit()
+        self.record_backend_timing("quit", started)
+        started = time.perf_counter()
+        backend.start()
+        self.record_backend_timing("startup", started)
+        self._documents_since_start = 0
+
+    def plan_file(self, index: int, input_path: str):
+        """Resolve the output path, an existing PDF and the cache for one file.
+
+        Returns the task (index, input_path, output_path, passwords, digest) still
+        to be converted, or None if the file was finished or parked here.
+        """
+        absolute_input_path = os.path.abspath(input_path)
+        planned = self.output_plan.entries.get(index) or self.output_plan.add(index, input_path)
+        output_path = planned.output_path
+
+        if planned.existing is not None:
+            if self.overwrite_policy == "ask":
+                self.defer(PendingPrompt(PendingPrompt.OVERWRITE, index, absolute_input_path, output_path))
+                return None
+            if self.overwrite_policy == "skip":
+                self.finish_file(index, "➖ Skipped (output already exists)", False, skipped=True)
+                return None
+            if self.overwrite_policy == "newer" and planned.existing_mtime() >= os.path.getmtime(input_path):
+                self.finish_file(index, "➖ Skipped (PDF is up to date)", False, skipped=True)
+                return None
+            if self.overwrite_policy == "rename":
+                output_path = self.output_plan.rename(index)
+            else:
+                remove_if_exists(output_path)  # "overwrite", or "newer" with a newer document
+
+        return self.prepare_task(index, absolute_input_path, output_path)
+
+    def prepare_task(self, index: int, absolute_input_path: str, output_path: str):
+        """Serve the file from the cache, or return its conversion task."""
+        # A copy prefetched for the next conversion is read instead of the share; planning
+        # itself never stages, since PoolBatchRunner plans every file long before converting it
+        source = self.staging.staged_input(index, absolute_input_path) if self.staging else absolute_input_path
+        digest = None
+        if self.cache:
+            digest = file_digest(source)
+            known_passwords = (self.default_password, self.passwords.get(absolute_input_path))
+            if self.cache.fetch(digest, self.export_settings, output_path, known_passwords):
+                self.finish_file(index, "✅ Converted (cached)", True)
+                return None
+
+        # Reading the package spares Word a slow Revisions.Count
+        self.revision_scans[index] = self.revision_scanner.scan(source, digest, absolute_input_path)
+
+        # Probing the header spares Word a failed open for every wrong password
+        encryption = probe_encryption(source)
+        passwords = passwords_to_try(self.default_password, self.passwords.get(absolute_input_path), encryption)
+        task = (index, absolute_input_path, output_path, passwords, digest)
+        if not passwords:
+            self.handle_password_required(task, PasswordRequiredError("The document is encrypted and no password is known."))
+            return None
+        return task
+
+    def handle_password_required(self, task, error):
+        index, absolute_input_path, output_path, _, digest = task
+        if index in self._password_answered:
+            self.finish_file(index, f"❌ Error: {str(error)}", False)  # The password given was wrong
+        elif self.password_policy == "ask":
+            self.defer(PendingPrompt(PendingPrompt.PASSWORD, index, absolute_input_path, output_path, digest))
+        else:
+            self.finish_file(index, "❌ Skipped (password required)", False, skipped=True)
+
+    def defer(self, prompt):
+        self.pending_prompts.append(prompt)
+        reason = "password required" if prompt.kind == PendingPrompt.PASSWORD else "output already exists"
+        self.listener.on_file_deferred(prompt.index, f"⏸ Waiting for your decision ({reason})")
+
+    def resolve_prompts(self):
+        """Put every parked file to the listener at once.
+
+        Returns the tasks that should still be converted; the rest are finished
+        as skipped.
+        """
+        prompts, self.pending_prompts = self.pending_prompts, []
+        if not prompts:
+            return []
+        if self._is_running:
+            self.listener.on_status(f"Waiting for decisions on {len(prompts)} files...")
+            self.listener.resolve_prompts(prompts)
+
+        tasks = []
+        for prompt in prompts:
+            try:
+                task = self._task_from_answer(prompt)
+            except Exception as e:
+                self.finish_file(prompt.index, f"❌ Error: {str(e)}", False)
+                continue
+            if task is not None:
+                tasks.append(task)
+        return tasks
+
+    def _task_from_answer(self, prompt):
+        if prompt.kind == PendingPrompt.PASSWORD:
+            if not prompt.answer:
+                # Unanswered because the batch was stopped is not a decision; retry picks those up
+                self.finish_file(prompt.index, "❌ Skipped (password required)", False, skipped=self._is_running)
+                return None
+            self.passwords[prompt.input_path] = prompt.answer
+            self._password_answered.add(prompt.index)
+            return (prompt.index, prompt.input_path, prompt.output_path, [prompt.answer], prompt.digest)
+
+        if prompt.answer == "overwrite":
+            remove_if_exists(prompt.output_path)
+            return self.prepare_task(prompt.index, prompt.input_path, prompt.output_path)
+        if prompt.answer == "rename":
+            return self.prepare_task(prompt.index, prompt.input_path, self.output_plan.rename(prompt.index))
+        self.finish_file(prompt.index, "➖ Skipped (user chose not to overwrite)", False, skipped=self._is_running)
+        return None
+
+    def expired_message(self, reason: str) -> str:
+        if reason == CANCELLED:
+            return "➖ Cancelled (batch stopped)"
+        return f"⏱ Timed out after {self.document_timeout:g} s"
+
+    def store_cached(self, digest, output_path: str, settings: dict, password):
+        if not self.cache or digest is None:
+            return
+        try:
+            self.cache.store(digest, settings, output_path, password)
+        except OSError:
+            pass  # A full or unwritable cache must not fail an otherwise good conversion
+
+    def finish_file(self, index: int, message: str, success: bool, skipped: bool = False):
+        """Report file `index` as done. `skipped` marks a deliberate skip (by
+        policy or the user's answer), which the journal keeps out of retries."""
+        if self.staging:
+            self.staging.release_input(index)
+        with self._finish_lock:
+            if success:
+                self.success_count += 1
+            if self.journal:
+                self.journal.file_finished(index, success, message, skipped)
+            self.listener.on_file_finished(index, message, success)
+        self.forget_file(index)
+
+    def forget_file(self, index: int):
+        """Drop what the runner keeps about file `index` once it is reported,
+        so a hot-folder batch running for months does not hold every file it
+        saw. Its slot in input_paths stays (indices are positions) as None."""
+        self.revision_scans.pop(index, None)
+        self.predicted_seconds.pop(index, None)
+        self._password_answered.discard(index)
+        with self._input_changed:  # add_paths() may still be planning it
+            self.output_plan.forget(index)
+            self.input_paths[index] = None
+
+    def plan_outputs(self):
+        """Plan the output paths of the files queued so far (add_paths() plans
+        the rest) and show the plan to the listener."""
+        with self._input_changed:
+            for index, path in enumerate(self.input_paths):
+                if index not in self.output_plan.entries:
+                    self.output_plan.add(index, path)
+            self._outputs_planned = True
+        self.listener.on_output_plan(self.output_plan)
+
+    def start_preflight(self):
+        """Start validating the files queued so far; add_paths() queues the rest."""
+        if not self.preflight:
+            return
+        with self._input_changed:
+            for index, path in enumerate(self.input_paths):
+                self.preflight.submit(index, path)
+            self._preflight_started = True
+
+    def preflight_rejected(self, index: int) -> bool:
+        """Wait for file `index`'s validation; True if it was rejected (and finished)."""
+        return bool(self.preflight and self.preflight.result(index) is not None)
+
+    def reject_file(self, index: int, reason: str):
+        self.finish_file(index, f"❌ Skipped ({reason})", False)
+
+    def stop_preflight(self):
+        if not self.preflight:
+            return
+        with self._input_changed:
+            self._preflight_started = False
+        self.preflight.shutdown()
+
+    def record_stage(self, index: int, stage: str):
+        if not self.journal:
+            return
+        if stage == "saved" and self.staging:
+            return  # The PDF is still in the staging area; recorded once it is published
+        self.journal.file_stage(index, stage)
+
+    def start_staging(self):
+        if self.prefetch > 0:
+            self.staging = StagingArea(self.prefetch, self.staging_max_bytes)
+
+    def prefetch_files(self, indices):
+        """Start copying the files converted next to the staging area."""
+        if self.staging:
+            for index in indices:
+                self.staging.prefetch(index, self.input_paths[index])
+
+    def staged_paths(self, task):
+        """(input, output) paths Word should use for `task`: local ones when staging."""
+        index, input_path, output_path = task[:3]
+        if not self.staging:
+            return input_path, output_path
+        return self.staging.input_path(index, input_path), self.staging.output_path(index, output_path)
+
+    def discard_staged(self, index: int):
+        if self.staging:
+            self.staging.discard_output(index)
+            self.staging.release_input(index)
+
+    def stop_staging(self):
+        """Wait for the PDFs still being moved, then delete the staging area.
+        Raises what a publish callback raised, once."""
+        staging, self.staging = self.staging, None
+        if staging:
+            staging.close()
+
+    def record_backend_timing(self, stage: str, started: float):
+        if self.metrics:
+            self.metrics.record_backend(stage, time.perf_counter() - started)
+
+    def record_file_timings(self, task, timings: dict, success: bool):
+        if self.metrics:
+            output_path = self.staging and self.staging.local_output(task[0]) or task[2]  # Not moved yet
+            self.metrics.record_file(task[1], output_path, timings, success, self.predicted_seconds.get(task[0]))
+
+    def record_open_tier(self, tier: str, seconds: float):
+        counts = self.open_tiers.setdefault(tier, [0, 0.0])
+        counts[0] += 1
+        counts[1] += seconds
+        if self.metrics:
+            self.metrics.record_open_tier(tier, seconds)
+
+    def estimate_cost(self, index: int) -> float:
+        """Predicted seconds for file `index`; only estimated when they are used."""
+        if self.schedule == "order" and not self.metrics:
+            return 0.0
+        if index not in self.predicted_seconds:
+            try:
+                self.predicted_seconds[index] = self.cost_estimator.estimate(self.input_paths[index])
+            except Exception:
+                self.predicted_seconds[index] = 0.0  # Only orders the files; the file itself may still convert
+        return self.predicted_seconds[index]
+
+    def begin_journal(self):
+        """Start a journal batch and record the files queued so far."""
+        if not self.journal:
+            return
+        with self._input_changed:
+            self.journal.begin_batch(self.output_dir, self.export_settings)
+            for index, path in enumerate(self.input_paths):
+                self.journal.file_queued(index, path)
+
+    def end_journal(self, summary: str):
+        if self.journal:
+            self.journal.end_batch(summary)
+
+    def summary(self, message: str) -> str:
+        parts = [message]
+        if self.open_tiers:
+            tiers = ", ".join(
+                f"{documents} {'with repair' if tier == REPAIR_OPEN else tier} (avg {seconds / documents:.2f} s)"
+                for tier, (documents, seconds) in sorted(self.open_tiers.items())
+            )
+            parts.append(f"Opened: {tiers}.")
+        if self.cache:
+            parts.append(self.cache.summary())
+        return " ".join(parts)
+
+
+class PoolBatchRunner(BatchRunner):
+    """Converts a batch across `pool_size` child processes, each owning its own
+    Word instance.
+
+    Files are planned (output path, existing PDFs, cache) on this thread in
+    list order and dispatched one at a time to idle children. Results come
+    back on one pipe per child and are reported with their original file indices.
+    A child that dies is replaced and its file is retried once before being
+    reported as failed. A child whose document runs over `document_timeout`
+    is killed with its Word and replaced, and the file reported as timed
+    out; after stop(), children get `cancel_timeout` seconds to finish.
+
+    The children come from `worker_pool`, a WorkerPool that stays running
+    after the batch; without one, a pool is started for this batch alone.
+    """
+
+    POLL_INTERVAL = 0.1  # seconds to wait for child results before checking on the children
+
+    def __init__(self, input_paths, output_dir=None, default_password=None, backend_factory=None,
+                 cache=None, listener=None, input_open=False, overwrite_policy="ask", password_policy="ask",
+                 journal=None, metrics=None, recycle_after=None, max_memory_bytes=None, preflight=True,
+                 schedule="order", cost_estimator=None, revision_scanner=None, document_timeout=None,
+                 cancel_timeout=5.0, export_profile=None, prefetch=0, staging_max_bytes=2 * 1024 ** 3,
+                 pool_size=None, max_task_retries=1, worker_pool=None):
+        super().__init__(input_paths, output_dir, default_password, backend_factory, cache, listener,
+                         input_open, overwrite_policy, password_policy, journal, metrics,
+                         recycle_after, max_memory_bytes, preflight, schedule, cost_estimator,
+                         revision_scanner, document_timeout, cancel_timeout, export_profile, prefetch,
+                         staging_max_bytes)
+        self._owns_pool = worker_pool is None
+        if worker_pool is None:
+            worker_pool = WorkerPool(self.backend_factory, pool_size, recycle_after, max_memory_bytes)
+        self.worker_pool = worker_pool
+        self.pool_size = worker_pool.size
+        self.max_task_retries = max_task_retries
+        self.max_restarts = self.pool_size * 3
+        self._restarts = 0
+        self._pending = ScheduledQueue(schedule)
+        self._attempts = {}
+        self._completed = 0
+        self._fatal_message = None
+        self._timings = {}  # file index -> stage timings reported ahead of its result
+
+    def run(self) -> str:
+        if not self.wait_for_input(0):
+            return "No files were selected to process."
+
+        self.export_settings = self.backend_factory().export_settings(self.export_profile)
+        self.begin_journal()
+        self.plan_outputs()
+        self.start_preflight()
+        self.start_staging()
+
+        try:
+            if self._owns_pool:
+                self.listener.on_status(f"Starting {self.pool_size} conversion workers...")
+                initial_size = self.pool_size if self._input_open else min(self.pool_size, len(self.input_paths))
+                self.worker_pool.ensure_size(initial_size)
+            else:
+                self.listener.on_status("Checking the running Word instances...")
+                self.worker_pool.check_health()
+                self.worker_pool.ensure_size()
+
+            i = 0
+            while self._is_running and not self._fatal_message:
+                if not self.wait_for_input(i, timeout=0):
+                    if not self._input_open:
+                        break
+                    self._pump(block=True)  # Keep converting while waiting for more files
+                    continue
+
+                if not self.preflight_rejected(i):
+                    try:
+                        task = self.plan_file(i, self.input_paths[i])
+                        if task is not None:
+                            self._pending.push(task, self.estimate_cost(i))
+                    except Exception as e:
+                        self.finish_file(i, f"❌ Error: {str(e)}", False)
+
+                i += 1
+                self._pump(block=False)
+
+            while self._is_running and not self._fatal_message and (self._pending or self._busy_slots()):
+                self._pump(block=True)
+
+            # Parked files go last, once nothing else is waiting on Word
+            while self._is_running and not self._fatal_message and self.pending_prompts:
+                for task in self.resolve_prompts():
+                    self._pending.push(task, self.estimate_cost(task[0]))
+                while self._is_running and not self._fatal_message and (self._pending or self._busy_slots()):
+                    self._pump(block=True)
+
+            # After a stop, let children finish the files they already hold, for a while
+            cancel_deadline = time.monotonic() + self.cancel_timeout
+            while not self._fatal_message and self._busy_slots():
+                self._pending.clear()
+                if time.monotonic() >= cancel_deadline:
+                    self._cancel_busy_children()
+                    break
+                self._pump(block=True)
+            if not self._fatal_message:
+                self.resolve_prompts()  # Report files still parked as skipped
+
+        except Exception as e:
+            self._fatal_message = str(e)
+
+        finally:
+            self.stop_preflight()
+            try:
+                self.stop_staging()
+            except Exception as e:
+                self._fatal_message = self._fatal_message or str(e)  # The pool is still shut down below
+            if self._owns_pool or self._fatal_message:
+                started = time.perf_counter()
+                self.worker_pool.shutdown()
+                self.record_backend_timing("quit", started)
+            if self.metrics:
+                self.metrics.finish()
+
+        if self._fatal_message:
+            message = f"A fatal error occurred: {self._fatal_message}\nEnsure MS Word is installed and not blocked."
+            self.end_journal(message)
+            raise BatchFatalError(message)
+
+        self.listener.on_progress(100)
+        summary = self.summary(
+            f"Batch complete. {self.success_count} of {len(self.input_paths)} files converted successfully "
+            f"using {self.pool_size} Word instances."
+        )
+        self.end_journal(summary)
+        return summary
+
+    def _busy_slots(self):
+        return self.worker_pool.busy_slots()
+
+    def forget_file(self, index: int):
+        super().forget_file(index)
+        self._attempts.pop(index, None)
+
+    def _pump(self, block: bool):
+        """Dispatch pending files to idle children, then process results."""
+        for slot in self.worker_pool.idle_slots():
+            if not self._pending:
+                break
+            task = self._pending.pop()
+            index, _, _, passwords, _ = task
+            input_path, output_path = self.staged_paths(task)
+            message = (index, input_path, output_path, passwords, self.revision_scans.get(index),
+                       self.export_profile.name)
+            self.worker_pool.send_task(slot, task, message)
+        self.prefetch_files(task[0] for task in self._pending.peek(self.prefetch))
+
+        for message in self.worker_pool.receive(self.POLL_INTERVAL if block else 0):
+            self._handle_result(*message)
+        self._check_children()
+        self._check_timeouts()
+        self.worker_pool.maintain()
+
+    def _handle_result(self, kind, worker_id, index, payload):
+        slot = self.worker_pool.slots.get(worker_id)
+        if slot is None:
+            return
+
+        if kind == "ready":
+            if self.metrics:
+                self.metrics.record_backend("startup", payload["startup_seconds"])
+            return
+        if kind == "timings":
+            self._timings[index] = payload
+            return
+        if kind == "stage":
+            self.record_stage(index, payload)
+            return
+        if kind == "fatal":
+            if not self._restart_child(slot):
+                self._fatal_message = payload
+            return
+
+        task, slot.task = slot.task, None
+        timings = self._timings.pop(index, {})
+        self.record_file_timings(task, timings, kind == "converted")
+        if kind == "converted":
+            _, _, output_path, _, digest = task
+            self.record_open_tier(payload.open_tier, timings.get("open", 0.0))
+            self.complete_file(index, output_path, digest, payload)
+            return
+        self.discard_staged(index)
+        if kind == "error":
+            self.finish_file(index, f"❌ Error: {payload}", False)
+        elif kind == "password":
+            self.handle_password_required(task, payload)
+
+    def _check_children(self):
+        """Replace children that exited unexpectedly and requeue their file."""
+        for slot in self.worker_pool.exited_slots():
+            task, slot.task = slot.task, None
+            if task is not None:
+                index = task[0]
+                self._attempts[index] = self._attempts.get(index, 0) + 1
+                if self._attempts[index] > self.max_task_retries:
+                    self.finish_file(
+                        index, f"❌ Error: Word worker exited unexpectedly (code {slot.process.exitcode})", False
+                    )
+                else:
+                    self._pending.push_front(task)
+
+            if not self._restart_child(slot) and not self._live_slots():
+                self._fatal_message = "All conversion workers exited unexpectedly."
+
+    def _check_timeouts(self):
+        """Kill and replace children whose document ran over `document_timeout`."""
+        if not self.document_timeout:
+            return
+        for slot in self.worker_pool.overdue_slots(self.document_timeout):
+            task, slot.task = slot.task, None
+            self.worker_pool.replace(slot)
+            self.record_file_timings(task, self._timings.pop(task[0], {}), False)
+            self.finish_file(task[0], self.expired_message(TIMED_OUT), False)
+
+    def _cancel_busy_children(self):
+        """Kill the children still converting after a stop; the pool starts
+        new ones for the next batch."""
+        for slot in self._busy_slots():
+            task, slot.task = slot.task, None
+            self.worker_pool.remove(slot)
+            self.finish_file(task[0], self.expired_message(CANCELLED), False)
+
+    def _restart_child(self, slot) -> bool:
+        self.worker_pool.remove(slot)
+        if self._restarts >= self.max_restarts:
+            return bool(self._live_slots())
+        self._restarts += 1
+        self.worker_pool.spawn()
+        return True
+
+    def _live_slots(self):
+        return self.worker_pool.live_slots()
+
+    def finish_file(self, index: int, message: str, success: bool, skipped: bool = False):
+        with self._finish_lock:
+            super().finish_file(index, message, success, skipped)
+            self._completed += 1
+            self.listener.on_progress(int((self._completed / len(self.input_paths)) * 100))
+            self.listener.on_status(
+                f"Processed {self._completed}/{self.total_label()} files "
+                f"with {len(self._live_slots())} Word instances."
+            )
@@ -0,0 +1,396 @@
+import fnmatch
+import os
+import random
+import signal
+import threading
+import zlib
+
+from ExportProfile import find_export_profile
+
+wdDoNotSaveChanges = 0
+wdAlertsNone = 0
+
+# Background work Word does for an interactive user, switched off while converting
+_SESSION_OPTIONS = {
+    "Pagination": False,  # Background repagination
+    "CheckSpellingAsYouType": False,
+    "CheckGrammarAsYouType": False,
+    "SaveInterval": 0,  # AutoRecover
+}
+
+# Smallest file that PDF readers accept; the simulated engine writes it as its "export".
+_PLACEHOLDER_PDF = (
+    b"%PDF-1.4\n"
+    b"1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+    b"2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n"
+    b"3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 612 792]>>endobj\n"
+    b"trailer<</Root 1 0 R>>\n"
+    b"%%EOF\n"
+)
+
+
+class ConversionBackend:
+    """Engine that performs the open / accept-revisions / export / close sequence.
+
+    A backend is created and used on a single thread. `prepare()` checks that the
+    engine's dependencies are importable, `start()` launches the engine and
+    `quit()` shuts it down again. Only kill() may be called from another
+    thread.
+    """
+
+    name = "base"
+    display_name = "conversion engine"
+
+    def prepare(self):
+        pass
+
+    def export_settings(self, profile=None) -> dict:
+        """Everything besides the input file that determines the PDF's content,
+        when exporting with `profile` (an ExportProfile; default: the default
+        profile)."""
+        profile = profile or find_export_profile()
+        return {"backend": self.name, "export_profile": profile.settings()}
+
+    def start(self):
+        pass
+
+    def open_document(self, path: str, password=None, repair=False):
+        """Open a document read-only; with `repair`, the engine's slower
+        open that repairs damaged files."""
+        raise NotImplementedError
+
+    def revision_count(self, doc) -> int:
+        return 0
+
+    def accept_all_revisions(self, doc):
+        pass
+
+    def save_as_pdf(self, doc, output_path: str, profile=None):
+        raise NotImplementedError
+
+    def close_document(self, doc):
+        pass
+
+    def health_check(self):
+        """Make a cheap call into the running engine; raises if it is broken.
+        A hung engine blocks here, so callers apply their own timeout."""
+        pass
+
+    def process_id(self):
+        """PID of the engine's own process if it runs in one, else None."""
+        return None
+
+    def memory_usage(self):
+        """Resident memory of the engine in bytes, or None if unknown."""
+        return None
+
+    def kill(self):
+        """Terminate the engine at once, so that a call hanging in it fails.
+        quit() and start() then bring up a fresh engine."""
+        pass
+
+    def quit(self):
+        pass
+
+
+class WordBackend(ConversionBackend):
+    """Drives a hidden Microsoft Word instance over COM."""
+
+    name = "word"
+    display_name = "Microsoft Word"
+
+    def __init__(self):
+        self.word_app = None
+        self._win32com_client = None
+        self._process_id = None
+        self._killed = False
+        self._saved_options = {}  # Word's own values of the _SESSION_OPTIONS, restored on quit
+
+    def prepare(self):
+        try:
+            import win32com.client
+        except ImportError:
+            raise ImportError("pywin32 is not installed. Please run: pip install pywin32")
+        self._win32com_client = win32com.client
+
+    def start(self):
+        if self._win32com_client is None:
+            self.prepare()
+        self.word_app = self._win32com_client.Dispatch("Word.Application")
+        self.word_app.Visible = False  # Ensure Word stays hidden
+        self._process_id = None
+        self._killed = False
+        self.process_id()  # Known up front, so kill() never has to ask a hung Word
+        self.word_app.ScreenUpdating = False
+        self.word_app.DisplayAlerts = wdAlertsNone
+        # Options are saved with the user's settings when Word quits, so quit() restores them
+        options = self.word_app.Options
+        self._saved_options = {}
+        for name, value in _SESSION_OPTIONS.items():
+            try:
+                self._saved_options[name] = getattr(options, name)
+                setattr(options, name, value)
+            except Exception:
+                pass  # Not available in this Word version
+
+    def open_document(self, path: str, password=None, repair=False):
+        return self.word_app.Documents.Open(
+            FileName=path,
+            ConfirmConversions=False,
+            ReadOnly=True,
+            AddToRecentFiles=False,
+            PasswordDocument="" if password is None else str(password),
+            Visible=False,  # Important: keep document hidden
+            OpenAndRepair=repair,
+            NoEncodingDialog=True,
+        )
+
+    def revision_count(self, doc) -> int:
+        return doc.Revisions.Count
+
+    def accept_all_revisions(self, doc):
+        doc.AcceptAllRevisions()
+
+    def save_as_pdf(self, doc, output_path: str, profile=None):
+        profile = profile or find_export_profile()
+        doc.ExportAsFixedFormat(**profile.export_arguments(output_path))
+
+    def close_document(self, doc):
+        doc.Close(wdDoNotSaveChanges)
+
+    def health_check(self):
+        self.word_app.Documents.Count
+
+    def process_id(self):
+        # COM does not expose WINWORD.EXE's PID: give the hidden main window
+        # ("OpusApp") a unique caption, find it and ask for its process.
+        if self._process_id is None and self.word_app is not None:
+            try:
+                import win32gui
+                import win32process
+                caption = f"word-to-pdf-{os.getpid()}-{id(self)}"
+                self.word_app.Caption = caption
+                hwnd = win32gui.FindWindow("OpusApp", caption)
+                if hwnd:
+                    self._process_id = win32process.GetWindowThreadProcessId(hwnd)[1]
+            except Exception:
+                pass
+        return self._process_id
+
+    def memory_usage(self):
+        pid = self.process_id()
+        if pid is None:
+            return None
+        try:
+            import win32api
+            import win32con
+            import win32process
+            handle = win32api.OpenProcess(win32con.PROCESS_QUERY_INFORMATION | win32con.PROCESS_VM_READ, False, pid)
+            try:
+                return win32process.GetProcessMemoryInfo(handle)["WorkingSetSize"]
+            finally:
+                win32api.CloseHandle(handle)
+        except Exception:
+            return None
+
+    def kill(self):
+        pid = self._process_id
+        if pid is None:
+            return
+        self._killed = True
+        try:
+            os.kill(pid, signal.SIGTERM)  # TerminateProcess on Windows
+        except OSError:
+            pass  # Word already exited
+
+    def quit(self):
+        if self.word_app:
+            try:
+                if not self._killed:
+                    self._restore_options()
+                    self.word_app.Quit()
+            finally:
+                self.word_app = None
+
+    def _restore_options(self):
+        options = self.word_app.Options
+        for name, value in self._saved_options.items():
+            try:
+                setattr(options, name, value)
+            except Exception:
+                pass
+        self._saved_options = {}
+
+
+class SimulatedDocument:
+    def __init__(self, path: str, revisions: int):
+        self.path = path
+        self.revisions = revisions
+        self.closed = False
+
+
+class SimulatedBackend(ConversionBackend):
+    """Deterministic stand-in for Word, used for benchmarking without Office.
+
+    Every stage sleeps for a configurable latency (seconds, keyed by stage name
+    in `latency`) plus `per_megabyte[stage]` seconds per MiB of the document,
+    optionally varied by +/- `jitter` (a fraction of the latency).
+    Failures are injected by matching file names against glob patterns:
+
+    - `password_files`: {pattern: password}; opening without the right password
+      fails with Word's "password is incorrect" error.
+    - `corrupt_files`: patterns whose open fails as unreadable content.
+    - `repair_files`: patterns that only open with repair, which takes
+      the open latency twice.
+    - `failing_files`: patterns whose PDF export fails.
+    - `revision_files`: patterns whose documents carry tracked revisions.
+    - `hanging_files`: patterns whose open never returns, until kill().
+    - `failure_rate`: fraction of remaining files whose open fails.
+
+    `base_memory` and `memory_growth` (bytes) model Word's working set, which
+    grows with every document opened until the engine is restarted.
+
+    Jitter and `failure_rate` are seeded per file path, so a given corpus behaves
+    the same way on every run and in every process.
+    """
+
+    name = "simulated"
+    display_name = "simulated Word engine"
+    STAGES = ("startup", "open", "revisions", "save", "close", "quit")
+
+    def __init__(self, latency=None, jitter=0.0, seed=0, password_files=None,
+                 corrupt_files=None, failing_files=None, revision_files=None,
+                 failure_rate=0.0, per_megabyte=None, base_memory=150 * 1024 * 1024,
+                 memory_growth=0, hanging_files=None, repair_files=None):
+        unknown = (set(latency or {}) | set(per_megabyte or {})) - set(self.STAGES)
+        if unknown:
+            raise ValueError(f"Unknown simulated stage(s): {', '.join(sorted(unknown))}")
+        self.latency = dict.fromkeys(self.STAGES, 0.0)
+        self.latency.update(latency or {})
+        self.per_megabyte = dict(per_megabyte or {})
+        self.jitter = jitter
+        self.seed = seed
+        self.password_files = dict(password_files or {})
+        self.corrupt_files = list(corrupt_files or [])
+        self.failing_files = list(failing_files or [])
+        self.revision_files = list(revision_files or [])
+        self.hanging_files = list(hanging_files or [])
+        self.repair_files = list(repair_files or [])
+        self.failure_rate = failure_rate
+        self.base_memory = base_memory
+        self.memory_growth = memory_growth
+        self.documents_opened = 0
+        self.running = False
+        self._killed = threading.Event()
+
+    def _rng(self, path: str, stage: str) -> random.Random:
+        key = f"{self.seed}:{stage}:{os.path.normcase(os.path.abspath(path))}"
+        return random.Random(zlib.crc32(key.encode("utf-8")))
+
+    def _delay(self, stage: str, path: str = ""):
+        seconds = self.latency[stage]
+        if path and self.per_megabyte.get(stage):
+            try:
+                seconds += self.per_megabyte[stage] * os.path.getsize(path) / (1024 * 1024)
+            except OSError:
+                pass
+        if seconds <= 0:
+            return
+        if self.jitter:
+            seconds *= 1 + self._rng(path, stage).uniform(-self.jitter, self.jitter)
+        self._wait(max(seconds, 0.0))
+
+    def _wait(self, seconds=None):
+        if self._killed.wait(seconds):
+            raise RuntimeError("The remote procedure call failed. (The engine was terminated.)")
+
+    @staticmethod
+    def _matches(path: str, patterns) -> bool:
+        name = os.path.basename(path)
+        return any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+
+    def _password_for(self, path: str):
+        name = os.path.basename(path)
+        for pattern, password in self.password_files.items():
+            if fnmatch.fnmatch(name, pattern):
+                return password
+        return None
+
+    def start(self):
+        self._killed.clear()
+        self._delay("startup")
+        self.documents_opened = 0
+        self.running = True
+
+    def open_document(self, path: str, password=None, repair=False):
+        if not self.running:
+            raise RuntimeError("The simulated Word engine has not been started.")
+        self._delay("open", path)
+        if repair:
+            self._delay("open", path)
+        self.documents_opened += 1
+        if self._matches(path, self.hanging_files):
+            self._wait()
+        if not os.path.isfile(path):
+            raise RuntimeError(f"Sorry, we couldn't find your file. ({path})")
+
+        required_password = self._password_for(path)
+        if required_password is not None and password != required_password:
+            raise RuntimeError("The password is incorrect. Word cannot open the document.")
+        if self._matches(path, self.corrupt_files):
+            raise RuntimeError("Word found unreadable content and was unable to open the file.")
+        if not repair and self._matches(path, self.repair_files):
+            raise RuntimeError("Word found unreadable content in the file.")
+        if self.failure_rate and self._rng(path, "failure").random() < self.failure_rate:
+            raise RuntimeError("Word experienced an error trying to open the file.")
+
+        revisions = 3 if self._matches(path, self.revision_files) else 0
+        return SimulatedDocument(path, revisions)
+
+    def revision_count(self, doc) -> int:
+        return doc.revisions
+
+    def accept_all_revisions(self, doc):
+        self._delay("revisions", doc.path)
+        doc.revisions = 0
+
+    def save_as_pdf(self, doc, output_path: str, profile=None):
+        self._delay("save", doc.path)
+        if self._matches(doc.path, self.failing_files):
+            raise RuntimeError("Command failed.")
+        with open(output_path, "wb") as f:
+            f.write(_PLACEHOLDER_PDF)
+
+    def close_document(self, doc):
+        self._delay("close", doc.path)
+        doc.closed = True
+
+    def health_check(self):
+        if not self.running:
+            raise RuntimeError("The simulated Word engine is not running.")
+
+    def memory_usage(self):
+        return self.base_memory + self.documents_opened * self.memory_growth
+
+    def kill(self):
+        self.running = False
+        self._killed.set()
+
+    def quit(self):
+        if self.running:
+            self._delay("quit")
+            self.running = False
+
+
+BACKENDS = {
+    WordBackend.name: WordBackend,
+    SimulatedBackend.name: SimulatedBackend,
+}
+
+
+def create_backend(name: str = WordBackend.name, **options) -> ConversionBackend:
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown conversion backend '{name}'. Choose from: {', '.join(BACKENDS)}")
+    return backend_class(**options)
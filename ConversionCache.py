@@ -0,0 +1,156 @@
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+import uuid
+
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3  # 2 GiB
+_CHUNK_SIZE = 1024 * 1024
+
+
+def default_cache_dir() -> str:
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "WordToPdfConverter", "cache")
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's content, read in 1 MiB chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _password_fingerprint(digest: str, password: str) -> str:
+    """A slow, per-document hash of `password`, so cache keys do not make
+    passwords cheap to guess."""
+    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), digest.encode("ascii"), 100_000).hex()
+
+
+class ConversionCache:
+    """Persistent, size-bounded store of previously converted PDFs.
+
+    Entries are keyed by the input's content hash, the password that opened
+    it (if any, as a salted PBKDF2 hash) and the export settings, and are stored as
+    `<key>.pdf` files in `cache_dir`. A file's mtime is its last use, which
+    drives least-recently-used eviction once the cache exceeds `max_bytes`.
+
+    Entries created with a password are only served to runs that supply the
+    same password, so the cache never hands out the content of a protected
+    document without the password Word would have asked for.
+
+    fetch() and store() may be called from different threads (a staging
+    area stores PDFs once its mover thread has published them).
+    """
+
+    def __init__(self, cache_dir=None, max_bytes: int = DEFAULT_MAX_BYTES, use_hardlinks: bool = False):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.use_hardlinks = use_hardlinks
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> size, least recently used first
+        self._total_bytes = 0
+        self._lock = threading.Lock()  # Guards the index, the counters and eviction
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        found = []
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith(".pdf"):
+                    stat = entry.stat()
+                    found.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+        self._evict()  # max_bytes may have been lowered since the last run
+
+    @staticmethod
+    def make_key(digest: str, password, settings: dict) -> str:
+        """Cache key for a document opened with `password` (None: without one)."""
+        fingerprint = False if password is None else _password_fingerprint(digest, password)
+        material = json.dumps([digest, fingerprint, settings], sort_keys=True)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".pdf")
+
+    def fetch(self, digest: str, settings: dict, output_path: str, passwords=()) -> bool:
+        """Place a cached PDF at `output_path`. Returns False on a miss.
+
+        An entry that needed a password is only used if it is among `passwords`.
+        """
+        candidates = [None] + [password for password in dict.fromkeys(passwords) if password is not None]
+        for password in candidates:
+            key = self.make_key(digest, password, settings)
+            with self._lock:  # Held while copying, so eviction cannot remove the entry mid-copy
+                if key not in self._entries:
+                    continue
+
+                cached_path = self._path(key)
+                try:
+                    self._materialize(cached_path, output_path)
+                    os.utime(cached_path)
+                except FileNotFoundError:
+                    # Removed behind our back (another process evicted it)
+                    self._forget(key)
+                    continue
+
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True
+
+        with self._lock:
+            self.misses += 1
+        return False
+
+    def _materialize(self, cached_path: str, output_path: str):
+        if self.use_hardlinks:
+            try:
+                os.link(cached_path, output_path)
+                return
+            except OSError:
+                pass  # Different volume or unsupported filesystem
+        shutil.copyfile(cached_path, output_path)
+
+    def store(self, digest: str, settings: dict, output_path: str, password=None):
+        key = self.make_key(digest, password, settings)
+        cached_path = self._path(key)
+        temp_path = os.path.join(self.cache_dir, f".{uuid.uuid4().hex}.tmp")
+        shutil.copyfile(output_path, temp_path)
+
+        with self._lock:
+            os.replace(temp_path, cached_path)
+            self._forget(key)
+            size = os.path.getsize(cached_path)
+            self._entries[key] = size
+            self._total_bytes += size
+            self._evict()
+
+    # Callers of _forget() and _evict() hold self._lock (or are __init__)
+    def _forget(self, key: str):
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            self._forget(key)
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def summary(self) -> str:
+        with self._lock:
+            return f"Cache: {self.hits} hits, {self.misses} misses."
@@ -0,0 +1,191 @@
+import os
+import time
+
+from EncryptionProbe import ENCRYPTED, PLAIN, UNKNOWN
+from ExportProfile import find_export_profile
+
+
+FAST_OPEN = "fast"
+REPAIR_OPEN = "repair"
+
+
+class PasswordRequiredError(Exception):
+    """Raised when none of the known passwords opens a protected document."""
+
+
+class FileResult:
+    """Outcome of a successful conversion."""
+
+    def __init__(self, message: str, password=None, open_tier: str = FAST_OPEN):
+        self.message = message
+        self.password = password  # The password that opened the document, None if none was needed
+        self.open_tier = open_tier  # FAST_OPEN, or REPAIR_OPEN if only Word's repair could open it
+
+def output_path_for(input_path: str, output_dir=None):
+    """Return (output_path, pdf_name) for an input document."""
+    file_name = os.path.basename(input_path)
+    if output_dir:
+        original_base_name = os.path.splitext(file_name)[0]
+        original_base_name = original_base_name.replace(" ", "_")
+        pdf_name = original_base_name + "_converted.pdf"
+        output_path = os.path.join(output_dir, pdf_name)
+    else:
+        original_base_name = os.path.splitext(input_path)[0]
+        pdf_name = os.path.basename(original_base_name) + "_converted.pdf" # get only filename part
+        output_path = original_base_name + "_converted.pdf"
+    return output_path, pdf_name
+
+
+def passwords_to_try(default_password=None, stored_password=None, encryption=UNKNOWN):
+    """Passwords to open a document with, in order; None opens without one.
+
+    A document probed as PLAIN is opened once without a password, an
+    ENCRYPTED one only with the known passwords (possibly none at all).
+    """
+    if encryption == PLAIN:
+        return [None]
+    # Try with no password first, then with default password if provided
+    passwords = [] if encryption == ENCRYPTED else [None]
+    if default_password:
+        passwords.append(default_password)
+    if stored_password:
+        passwords.append(stored_password)
+    return passwords
+
+
+def open_document(backend, input_path: str, passwords):
+    """Open `input_path` with the first password that works.
+
+    Each password is tried with a plain open first; Word's (slow) repair
+    is only used when that fails for another reason than the password.
+    Returns (doc, password, tier) with tier FAST_OPEN or REPAIR_OPEN.
+    Raises PasswordRequiredError if every attempt failed on a password
+    error, otherwise re-raises the last error.
+    """
+    last_error = None
+    for password in passwords:
+        try:
+            return backend.open_document(input_path, password), password, FAST_OPEN
+        except Exception as e:
+            last_error = e
+        if "password" in str(last_error).lower():
+            continue
+        try:
+            return backend.open_document(input_path, password, repair=True), password, REPAIR_OPEN
+        except Exception as e:
+            last_error = e
+
+    if last_error is None:
+        raise PasswordRequiredError("No password is known for this document.")
+    if "password" in str(last_error).lower():
+        raise PasswordRequiredError(str(last_error))
+    raise last_error
+
+
+def convert_file(backend, input_path: str, output_path: str, passwords, on_stage=None, timings=None,
+                 has_revisions=None, export_profile=None) -> FileResult:
+    """Convert one document with an already started backend.
+
+    `has_revisions` is the result of a pre-scan of the file: with False the
+    revisions are left alone, with True they are accepted without counting
+    them first; only with None does Word count them (which is slow on large
+    documents).
+    `export_profile` is the ExportProfile to save with (default: the default profile).
+    `on_stage(stage)` is called after "opened", "revisions" and "saved".
+    If `timings` is a dict, the seconds spent in each stage ("open",
+    "revisions", "save", "close") are stored in it, also when a stage fails.
+    Failures are raised.
+    """
+    timings = {} if timings is None else timings
+    started = time.perf_counter()
+    try:
+        doc, password, open_tier = open_document(backend, input_path, passwords)
+    finally:
+        timings["open"] = time.perf_counter() - started
+    try:
+        if on_stage:
+            on_stage("opened")
+
+        # Accept all tracked changes for a clean final version
+        started = time.perf_counter()
+        try:
+            if has_revisions or (has_revisions is None and backend.revision_count(doc) > 0):
+                backend.accept_all_revisions(doc)
+        finally:
+            timings["revisions"] = time.perf_counter() - started
+        if on_stage:
+            on_stage("revisions")
+
+        started = time.perf_counter()
+        try:
+            backend.save_as_pdf(doc, output_path, export_profile)
+        finally:
+            timings["save"] = time.perf_counter() - started
+        if on_stage:
+            on_stage("saved")
+    finally:
+        started = time.perf_counter()
+        backend.close_document(doc)
+        timings["close"] = time.perf_counter() - started
+
+    return FileResult("✅ Converted", password=password, open_tier=open_tier)
+
+
+def run_pool_child(worker_id: int, backend_factory, conn):
+    """Entry point of a pool child process: owns one backend and converts the
+    tasks received on `conn` until it receives None. A "ping" task is
+    answered with "pong" after a health check of the backend.
+
+    Every message sent back is a tuple (kind, worker_id, file_index, payload);
+    the payload is a FileResult for "converted", the stage name for "stage",
+    the stage durations for "timings" and the backend's memory use in bytes
+    or None for "memory" (both sent before each result),
+    {"startup_seconds", "pid"} for "ready", None for a healthy "pong" and an
+    error text otherwise.
+    Each child has its own pipe, so a child that dies cannot block the others.
+    """
+    backend = backend_factory()
+    try:
+        backend.prepare()
+        started = time.perf_counter()
+        backend.start()
+        startup_seconds = time.perf_counter() - started
+    except Exception as e:
+        conn.send(("fatal", worker_id, None, str(e)))
+        backend.quit()
+        return
+
+    conn.send(("ready", worker_id, None, {"startup_seconds": startup_seconds, "pid": backend.process_id()}))
+    try:
+        while True:
+            try:
+                task = conn.recv()
+            except EOFError:
+                break  # The parent went away
+            if task is None:
+                break
+            if task == "ping":
+                try:
+                    backend.health_check()
+                    conn.send(("pong", worker_id, None, None))
+                except Exception as e:
+                    conn.send(("pong", worker_id, None, str(e)))
+                continue
+
+            index, input_path, output_path, passwords, has_revisions, profile_name = task
+            on_stage = lambda stage, index=index: conn.send(("stage", worker_id, index, stage))
+            timings = {}
+            try:
+                message = ("converted", worker_id, index, convert_file(
+                    backend, input_path, output_path, passwords, on_stage, timings, has_revisions,
+                    find_export_profile(profile_name)
+                ))
+            except PasswordRequiredError as e:
+                message = ("password", worker_id, index, str(e))
+            except Exception as e:
+                message = ("error", worker_id, index, str(e))
+            conn.send(("timings", worker_id, index, timings))
+            conn.send(("memory", worker_id, index, backend.memory_usage()))
+            conn.send(message)
+    finally:
+        backend.quit()
@@ -0,0 +1,225 @@
+import cProfile
+import json
+import os
+import time
+import uuid
+
+FILE_STAGES = ("open", "revisions", "save", "close")
+BACKEND_STAGES = ("startup", "quit")
+
+
+def percentile(sorted_values, fraction: float):
+    """Nearest-rank percentile of an already sorted list (None if empty)."""
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def write_atomically(path: str, text: str):
+    """Write via a temporary file so readers (e.g. a Prometheus textfile
+    collector) never see a half-written file."""
+    temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+def run_profiled(profile_path, function):
+    """Call `function()`; with a `profile_path`, under cProfile, saving the
+    stats there (open them with pstats or snakeviz). Only the calling
+    thread is profiled."""
+    if not profile_path:
+        return function()
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(function)
+    finally:
+        profiler.dump_stats(profile_path)
+
+
+class BatchMetrics:
+    """Per-stage timings, sizes and outcomes of one batch.
+
+    The runner records Word's startup/quit and, for every conversion
+    attempt, the seconds spent in each stage of convert_file() plus the
+    input and output sizes. report() summarises them with p50/p95 per stage
+    and the `slowest_count` slowest documents; the report can be written as
+    JSON or in the Prometheus text exposition format. Files recorded with a
+    predicted duration are also compared against the actual one, and open
+    times are broken down by how the document was opened (with or without
+    Word's repair).
+    """
+
+    def __init__(self, slowest_count=10):
+        self.slowest_count = slowest_count
+        self.started_at = time.time()
+        self.finished_at = None
+        self.backend_timings = {stage: [] for stage in BACKEND_STAGES}
+        self.stage_timings = {stage: [] for stage in FILE_STAGES}
+        self.files = []  # (total_seconds, input_path, timings, success, predicted_seconds)
+        self.converted = 0
+        self.failed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.open_tiers = {}  # "fast" / "repair" -> open seconds of the documents opened that way
+
+    def record_backend(self, stage: str, seconds: float):
+        self.backend_timings[stage].append(seconds)
+
+    def record_file(self, input_path: str, output_path: str, timings: dict, success: bool, predicted_seconds=None):
+        for stage, seconds in timings.items():
+            self.stage_timings[stage].append(seconds)
+        self.files.append((sum(timings.values()), input_path, dict(timings), success, predicted_seconds))
+        if success:
+            self.converted += 1
+        else:
+            self.failed += 1
+        try:
+            self.bytes_in += os.path.getsize(input_path)
+            if success:
+                self.bytes_out += os.path.getsize(output_path)
+        except OSError:
+            pass
+
+    def record_open_tier(self, tier: str, seconds: float):
+        self.open_tiers.setdefault(tier, []).append(seconds)
+
+    def finish(self):
+        self.finished_at = time.time()
+
+    def report(self) -> dict:
+        finished_at = self.finished_at or time.time()
+        stages = {}
+        for stage, values in list(self.backend_timings.items()) + list(self.stage_timings.items()):
+            values = sorted(values)
+            stages[stage] = {
+                "count": len(values),
+                "total_seconds": round(sum(values), 6),
+                "p50_seconds": _rounded(percentile(values, 0.50)),
+                "p95_seconds": _rounded(percentile(values, 0.95)),
+                "max_seconds": _rounded(values[-1] if values else None),
+            }
+        slowest = sorted(self.files, key=lambda entry: entry[0], reverse=True)[:self.slowest_count]
+        return {
+            "started_at": self.started_at,
+            "finished_at": finished_at,
+            "duration_seconds": round(finished_at - self.started_at, 3),
+            "converted": self.converted,
+            "failed": self.failed,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "stages": stages,
+            "open_tiers": {
+                tier: {
+                    "count": len(values),
+                    "total_seconds": round(sum(values), 6),
+                    "mean_seconds": _rounded(sum(values) / len(values)),
+                }
+                for tier, values in sorted(self.open_tiers.items())
+            },
+            "prediction": self._prediction_report(),
+            "slowest": [
+                {
+                    "input": input_path,
+                    "total_seconds": round(total, 6),
+                    "predicted_seconds": _rounded(predicted),
+                    "success": success,
+                    "stages": {stage: round(seconds, 6) for stage, seconds in timings.items()},
+                }
+                for total, input_path, timings, success, predicted in slowest
+            ],
+        }
+
+    def _prediction_report(self):
+        """Predicted against actual seconds of the files converted successfully.
+
+        `rank_correlation` (Spearman) shows how well the estimates order the
+        files, which is what scheduling depends on.
+        """
+        pairs = [(predicted, total) for total, _, _, success, predicted in self.files
+                 if success and predicted is not None]
+        if not pairs:
+            return None
+        predicted_total = sum(predicted for predicted, _ in pairs)
+        actual_total = sum(actual for _, actual in pairs)
+        return {
+            "files": len(pairs),
+            "predicted_seconds": round(predicted_total, 3),
+            "actual_seconds": round(actual_total, 3),
+            "mean_absolute_error_seconds": round(sum(abs(p - a) for p, a in pairs) / len(pairs), 6),
+            "rank_correlation": _rank_correlation(pairs),
+        }
+
+    def write_json(self, path: str):
+        write_atomically(path, json.dumps(self.report(), indent=2, ensure_ascii=False))
+
+    def write_prometheus(self, path: str):
+        write_atomically(path, self.prometheus_text())
+
+    def prometheus_text(self) -> str:
+        report = self.report()
+        lines = [
+            "# HELP word_to_pdf_stage_seconds Time spent per conversion stage in the last batch.",
+            "# TYPE word_to_pdf_stage_seconds summary",
+        ]
+        for stage, values in report["stages"].items():
+            for quantile, key in (("0.5", "p50_seconds"), ("0.95", "p95_seconds")):
+                if values[key] is not None:
+                    lines.append(f'word_to_pdf_stage_seconds{{stage="{stage}",quantile="{quantile}"}} {values[key]}')
+            lines.append(f'word_to_pdf_stage_seconds_sum{{stage="{stage}"}} {values["total_seconds"]}')
+            lines.append(f'word_to_pdf_stage_seconds_count{{stage="{stage}"}} {values["count"]}')
+        lines += [
+            "# HELP word_to_pdf_files Documents attempted in the last batch, by result.",
+            "# TYPE word_to_pdf_files gauge",
+            f'word_to_pdf_files{{result="converted"}} {report["converted"]}',
+            f'word_to_pdf_files{{result="failed"}} {report["failed"]}',
+            "# HELP word_to_pdf_bytes Bytes read from documents and written as PDFs in the last batch.",
+            "# TYPE word_to_pdf_bytes gauge",
+            f'word_to_pdf_bytes{{direction="in"}} {report["bytes_in"]}',
+            f'word_to_pdf_bytes{{direction="out"}} {report["bytes_out"]}',
+        ]
+        if report["prediction"]:
+            lines += [
+                "# HELP word_to_pdf_conversion_seconds Predicted and actual conversion time of the last batch's files.",
+                "# TYPE word_to_pdf_conversion_seconds gauge",
+                f'word_to_pdf_conversion_seconds{{kind="predicted"}} {report["prediction"]["predicted_seconds"]}',
+                f'word_to_pdf_conversion_seconds{{kind="actual"}} {report["prediction"]["actual_seconds"]}',
+            ]
+        lines += [
+            "# HELP word_to_pdf_batch_duration_seconds Wall time of the last batch.",
+            "# TYPE word_to_pdf_batch_duration_seconds gauge",
+            f"word_to_pdf_batch_duration_seconds {report['duration_seconds']}",
+            "# HELP word_to_pdf_batch_finished_timestamp_seconds When the last batch finished.",
+            "# TYPE word_to_pdf_batch_finished_timestamp_seconds gauge",
+            f"word_to_pdf_batch_finished_timestamp_seconds {report['finished_at']:.3f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _ranks(values):
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    start = 0
+    while start < len(order):
+        end = start
+        while end + 1 < len(order) and values[order[end + 1]] == values[order[start]]:
+            end += 1
+        for position in range(start, end + 1):
+            ranks[order[position]] = (start + end) / 2  # Ties share their mean rank
+        start = end + 1
+    return ranks
+
+
+def _rank_correlation(pairs):
+    """Spearman's rank correlation of (x, y) pairs, or None if undefined."""
+    xs = _ranks([x for x, _ in pairs])
+    ys = _ranks([y for _, y in pairs])
+    n = len(pairs)
+    mean_x, mean_y = sum(xs) / n, sum(ys) / n
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    spread = (sum((x - mean_x) ** 2 for x in xs) * sum((y - mean_y) ** 2 for y in ys)) ** 0.5
+    return round(covariance / spread, 4) if spread else None
+
+
+def _rounded(value):
+    return None if value is None else round(value, 6)
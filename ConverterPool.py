@@ -0,0 +1,22 @@
+from ConverterWorker import ConverterWorker
+from BatchRunner import PoolBatchRunner
+from RemoteBatchRunner import RemoteBatchRunner
+
+
+class PoolConverterWorker(ConverterWorker):
+    """ConverterWorker that spreads the batch over a pool of Word processes.
+
+    Accepts `pool_size`, `max_task_retries` and a long-lived `worker_pool`;
+    see PoolBatchRunner.
+    """
+
+    runner_class = PoolBatchRunner
+
+
+class RemoteConverterWorker(ConverterWorker):
+    """ConverterWorker that has the agents of a job server convert the batch.
+
+    Accepts `server_url`; see RemoteBatchRunner.
+    """
+
+    runner_class = RemoteBatchRunner
@@ -0,0 +1,365 @@
+"""Synthetic .docx corpora with controlled properties, for benchmarking.
+
+Documents are written directly as OOXML zip packages (no Word needed) and are
+reproducible for a given seed: same text, images, revisions and zip timestamps.
+A `corpus.json` manifest lists every file with its properties.
+"""
+
+from xml.sax.saxutils import escape
+import io
+import json
+import os
+import random
+import struct
+import zipfile
+import zlib
+
+MANIFEST_NAME = "corpus.json"
+WORDS_PER_PAGE = 300
+_ZIP_DATE = (2024, 1, 1, 0, 0, 0)
+_REVISION_DATE = "2024-01-01T00:00:00Z"
+_VOCABULARY = (
+    "account agreement analysis annual approval board budget client committee contract cost "
+    "customer delivery department document estimate finance forecast invoice legal manager "
+    "market meeting memo minutes notice office order payment period plan policy price "
+    "project proposal quarter record report request review revenue risk sales schedule "
+    "service staff statement summary supplier support team term total update vendor"
+).split()
+
+_W_NAMESPACES = (
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" '
+    'xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing" '
+    'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    'xmlns:pic="http://schemas.openxmlformats.org/drawingml/2006/picture"'
+)
+_XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_RELATIONSHIP_TYPES = {
+    "document": "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument",
+    "core": "http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties",
+    "app": "http://schemas.openxmlformats.org/officeDocument/2006/relationships/extended-properties",
+    "image": "http://schemas.openxmlformats.org/officeDocument/2006/relationships/image",
+    "header": "http://schemas.openxmlformats.org/officeDocument/2006/relationships/header",
+}
+
+
+class DocumentSpec:
+    """The properties of one generated document."""
+
+    def __init__(self, name, pages=1, images=0, image_bytes=0, revisions=0, header_revisions=0,
+                 password=None, collision_group=None):
+        self.name = name  # Relative path inside the corpus
+        self.pages = pages
+        self.images = images
+        self.image_bytes = image_bytes  # Approximate size of each embedded image
+        self.revisions = revisions  # Tracked insertions/deletions in the body
+        self.header_revisions = header_revisions  # ...and in the page header
+        self.password = password
+        self.collision_group = collision_group  # Files whose PDFs would get the same name
+
+
+def png_bytes(width: int, height: int, rng: random.Random) -> bytes:
+    """An RGB PNG of random noise; stored uncompressed so its size is predictable."""
+    row_size = width * 3
+    raw = b"".join(b"\x00" + rng.randbytes(row_size) for _ in range(height))
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(raw, 0)) + chunk(b"IEND", b""))
+
+
+def _relationships(relationships) -> str:
+    items = "".join(
+        f'<Relationship Id="{rid}" Type="{_RELATIONSHIP_TYPES[kind]}" Target="{target}"/>'
+        for rid, kind, target in relationships
+    )
+    return (_XML_DECLARATION
+            + f'<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">{items}</Relationships>')
+
+
+def _run(text: str) -> str:
+    return f'<w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r>'
+
+
+def _revision(kind: str, revision_id: int, text: str) -> str:
+    attributes = f'w:id="{revision_id}" w:author="Benchmark" w:date="{_REVISION_DATE}"'
+    if kind == "ins":
+        return f"<w:ins {attributes}>{_run(text)}</w:ins>"
+    return f'<w:del {attributes}><w:r><w:delText xml:space="preserve">{escape(text)}</w:delText></w:r></w:del>'
+
+
+def _image_paragraph(number: int, rid: str, width: int, height: int) -> str:
+    cx = 5486400  # 6 inches in EMU
+    cy = cx * height // width
+    return (
+        f'<w:p><w:r><w:drawing><wp:inline distT="0" distB="0" distL="0" distR="0">'
+        f'<wp:extent cx="{cx}" cy="{cy}"/><wp:docPr id="{number}" name="Picture {number}"/>'
+        f'<a:graphic><a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/picture">'
+        f'<pic:pic><pic:nvPicPr><pic:cNvPr id="{number}" name="image{number}.png"/><pic:cNvPicPr/></pic:nvPicPr>'
+        f'<pic:blipFill><a:blip r:embed="{rid}"/><a:stretch><a:fillRect/></a:stretch></pic:blipFill>'
+        f'<pic:spPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm>'
+        f'<a:prstGeom prst="rect"><a:avLst/></a:prstGeom></pic:spPr></pic:pic>'
+        f'</a:graphicData></a:graphic></wp:inline></w:drawing></w:r></w:p>'
+    )
+
+
+def docx_bytes(spec: DocumentSpec, rng: random.Random):
+    """Build the package for `spec`; returns (bytes, word_count)."""
+    body = []
+    word_count = 0
+    revision_id = 0
+    revision_slots = set(rng.sample(range(spec.pages * 5), min(spec.revisions, spec.pages * 5)))
+    image_slots = {}  # paragraph slot -> image paragraphs that follow it
+    image_parts = []
+    for image_number in range(1, spec.images + 1):
+        side = max(1, int((max(spec.image_bytes, 3) / 3) ** 0.5))
+        rid = f"rIdImage{image_number}"
+        image_parts.append((rid, f"media/image{image_number}.png", png_bytes(side, side, rng)))
+        slot = rng.randrange(spec.pages * 5)
+        image_slots.setdefault(slot, []).append(_image_paragraph(image_number, rid, side, side))
+
+    for page in range(spec.pages):
+        if page:
+            body.append('<w:p><w:r><w:br w:type="page"/></w:r></w:p>')
+        for paragraph in range(5):
+            slot = page * 5 + paragraph
+            words = [rng.choice(_VOCABULARY) for _ in range(WORDS_PER_PAGE // 5)]
+            word_count += len(words)
+            content = _run(" ".join(words).capitalize() + ". ")
+            if slot in revision_slots:
+                revision_id += 1
+                content += _revision("ins" if revision_id % 2 else "del", revision_id, rng.choice(_VOCABULARY) + " ")
+            body.append(f"<w:p>{content}</w:p>")
+            body.extend(image_slots.get(slot, ()))
+
+    header_content = _run("Synthetic benchmark document")
+    for _ in range(spec.header_revisions):
+        revision_id += 1
+        header_content += _revision("ins", revision_id, " draft")
+
+    document = (
+        _XML_DECLARATION + f"<w:document {_W_NAMESPACES}><w:body>" + "".join(body)
+        + '<w:sectPr><w:headerReference w:type="default" r:id="rIdHeader1"/>'
+        '<w:pgSz w:w="12240" w:h="15840"/><w:pgMar w:top="1440" w:right="1440" w:bottom="1440" '
+        'w:left="1440" w:header="720" w:footer="720" w:gutter="0"/></w:sectPr></w:body></w:document>'
+    )
+    header = _XML_DECLARATION + f"<w:hdr {_W_NAMESPACES}><w:p>{header_content}</w:p></w:hdr>"
+    content_types = (
+        _XML_DECLARATION + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Default Extension="png" ContentType="image/png"/>'
+        '<Override PartName="/word/document.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '<Override PartName="/word/header1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.header+xml"/>'
+        '<Override PartName="/docProps/core.xml" '
+        'ContentType="application/vnd.openxmlformats-package.core-properties+xml"/>'
+        '<Override PartName="/docProps/app.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.extended-properties+xml"/>'
+        '</Types>'
+    )
+    app = (
+        _XML_DECLARATION + '<Properties xmlns="http://schemas.openxmlformats.org/officeDocument/2006/extended-properties" '
+        'xmlns:vt="http://schemas.openxmlformats.org/officeDocument/2006/docPropsVTypes">'
+        f"<Application>Microsoft Office Word</Application><Pages>{spec.pages}</Pages>"
+        f"<Words>{word_count}</Words><Paragraphs>{spec.pages * 5}</Paragraphs></Properties>"
+    )
+    core = (
+        _XML_DECLARATION + '<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+        'xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:dcterms="http://purl.org/dc/terms/" '
+        'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+        f"<dc:title>{escape(os.path.basename(spec.name))}</dc:title><dc:creator>Benchmark corpus</dc:creator>"
+        f'<dcterms:created xsi:type="dcterms:W3CDTF">{_REVISION_DATE}</dcterms:created></cp:coreProperties>'
+    )
+
+    parts = [
+        ("[Content_Types].xml", content_types),
+        ("_rels/.rels", _relationships([
+            ("rId1", "document", "word/document.xml"),
+            ("rId2", "core", "docProps/core.xml"),
+            ("rId3", "app", "docProps/app.xml"),
+        ])),
+        ("word/document.xml", document),
+        ("word/_rels/document.xml.rels", _relationships(
+            [("rIdHeader1", "header", "header1.xml")] + [(rid, "image", target) for rid, target, _ in image_parts]
+        )),
+        ("word/header1.xml", header),
+        ("docProps/app.xml", app),
+        ("docProps/core.xml", core),
+    ] + [(f"word/{target}", data) for _, target, data in image_parts]
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as package:
+        for name, data in parts:
+            info = zipfile.ZipInfo(name, _ZIP_DATE)
+            # Images are stored as-is, like Word does for already compressed media
+            info.compress_type = zipfile.ZIP_STORED if name.endswith(".png") else zipfile.ZIP_DEFLATED
+            package.writestr(info, data)
+    return buffer.getvalue(), word_count
+
+
+def encrypt_docx(data: bytes, password: str, rng: random.Random):
+    """Password-protect a package; returns (bytes, method).
+
+    With msoffcrypto-tool installed this is real ECMA-376 agile encryption
+    that Word opens with `password`. Without it the package is replaced by an
+    OLE compound file with the same EncryptionInfo/EncryptedPackage layout
+    but random content: it is detected as encrypted, but cannot be opened.
+    """
+    try:
+        from msoffcrypto.format.ooxml import OOXMLFile
+    except ImportError:
+        return _placeholder_encrypted_package(len(data), rng), "placeholder"
+    encrypted = io.BytesIO()
+    OOXMLFile(io.BytesIO(data)).encrypt(password, encrypted)
+    return encrypted.getvalue(), "msoffcrypto"
+
+
+def _placeholder_encrypted_package(size: int, rng: random.Random) -> bytes:
+    info_xml = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n'
+        '<encryption xmlns="http://schemas.microsoft.com/office/2006/encryption">'
+        '<keyData saltSize="16" blockSize="16" keyBits="256" hashSize="64" cipherAlgorithm="AES" '
+        'cipherChaining="ChainingModeCBC" hashAlgorithm="SHA512"/></encryption>'
+    ).encode("utf-8")
+    encryption_info = struct.pack("<HHI", 4, 4, 0x40) + info_xml
+    encryption_info += b" " * max(0, 4096 - len(encryption_info))  # Keep it out of the mini stream
+    padded_size = max(4096, (size + 4095) // 4096 * 4096)
+    encrypted_package = struct.pack("<Q", size) + rng.randbytes(padded_size)
+    return ole_compound_file([("EncryptionInfo", encryption_info), ("EncryptedPackage", encrypted_package)])
+
+
+def ole_compound_file(streams) -> bytes:
+    """A minimal OLE compound file (version 3, 512-byte sectors) holding
+    `streams` [(name, data)] directly under the root storage.
+
+    Every stream must be at least 4096 bytes, so no mini stream is needed,
+    and the file must fit the 109 FAT sectors addressed from the header (~7 MB).
+    """
+    sector_size = 512
+    free_sector, end_of_chain, fat_sector, no_stream = 0xFFFFFFFF, 0xFFFFFFFE, 0xFFFFFFFD, 0xFFFFFFFF
+    entries_per_fat_sector = sector_size // 4
+    if any(len(data) < 4096 for _, data in streams):
+        raise ValueError("Streams smaller than 4096 bytes belong in the mini stream, which is not supported.")
+
+    stream_sectors = [(len(data) + sector_size - 1) // sector_size for _, data in streams]
+    directory_sectors = (len(streams) + 1 + 3) // 4
+    fat_count = 1
+    while fat_count * entries_per_fat_sector < fat_count + directory_sectors + sum(stream_sectors):
+        fat_count += 1
+    if fat_count > 109:
+        raise ValueError("The streams are too large for a compound file without DIFAT sectors.")
+
+    fat = [fat_sector] * fat_count
+    first_directory_sector = len(fat)
+    fat += list(range(first_directory_sector + 1, first_directory_sector + directory_sectors)) + [end_of_chain]
+    stream_starts = []
+    for count in stream_sectors:
+        start = len(fat)
+        stream_starts.append(start)
+        fat += list(range(start + 1, start + count)) + [end_of_chain]
+    fat += [free_sector] * (fat_count * entries_per_fat_sector - len(fat))
+
+    def directory_entry(name, entry_type, child=no_stream, right=no_stream, start=end_of_chain, size=0):
+        encoded = (name + "\0").encode("utf-16-le") if name else b""
+        return struct.pack(
+            "<64sHBBIII16sIQQIQ", encoded.ljust(64, b"\0"), len(encoded), entry_type, 1,
+            no_stream, right, child, b"\0" * 16, 0, 0, 0, start, size,
+        )
+
+    # Siblings are ordered by name length, then name; a plain right-leaning chain
+    # is enough for the handful of streams written here.
+    order = sorted(range(len(streams)), key=lambda i: (len(streams[i][0]), streams[i][0].upper()))
+    entries = [directory_entry("Root Entry", 5, child=order[0] + 1)] + [None] * len(streams)
+    for position, i in enumerate(order):
+        right = order[position + 1] + 1 if position + 1 < len(order) else no_stream
+        name, data = streams[i]
+        entries[i + 1] = directory_entry(name, 2, right=right, start=stream_starts[i], size=len(data))
+    while len(entries) % 4:
+        entries.append(directory_entry("", 0, start=0))
+
+    header = struct.pack(
+        "<8s16sHHHHH6sIIIIIIIII", b"\xD0\xCF\x11\xE0\xA1\xB1\x1A\xE1", b"\0" * 16, 0x3E, 3, 0xFFFE, 9, 6,
+        b"\0" * 6, 0, fat_count, first_directory_sector, 0, 4096, end_of_chain, 0, end_of_chain, 0,
+    )
+    header += struct.pack("<109I", *(list(range(fat_count)) + [free_sector] * (109 - fat_count)))
+
+    sectors = [struct.pack(f"<{len(fat)}I", *fat), b"".join(entries)]
+    for _, data in streams:
+        sectors.append(data + b"\0" * (-len(data) % sector_size))
+    return header + b"".join(sectors)
+
+
+def plan_corpus(count: int, rng: random.Random, pages=(1, 10), images=(0, 2), image_kb=(20, 200),
+                revision_rate=0.3, header_revision_rate=0.05, password_rate=0.05, password="benchmark",
+                collision_rate=0.05) -> list:
+    """Draw DocumentSpecs for a corpus of `count` documents.
+
+    Ranges are inclusive (min, max) tuples. A collision turns one planned
+    document into a pair whose PDFs get the same name once spaces are
+    replaced: "<name> copy.docx" and "<name>_copy.docx".
+    """
+    specs = []
+    while len(specs) < count:
+        number = len(specs)
+        page_count = rng.randint(*pages)
+        spec = DocumentSpec(
+            f"document {number:05d}.docx",
+            pages=page_count,
+            images=rng.randint(*images),
+            image_bytes=rng.randint(*image_kb) * 1024,
+            revisions=min(rng.randint(1, 8), page_count * 5) if rng.random() < revision_rate else 0,
+            header_revisions=1 if rng.random() < header_revision_rate else 0,
+            password=password if rng.random() < password_rate else None,
+        )
+        if rng.random() < collision_rate and count - len(specs) >= 2:
+            spec.name = f"document {number:05d} copy.docx"
+            spec.collision_group = number
+            twin = DocumentSpec(f"document {number:05d}_copy.docx", spec.pages, spec.images, spec.image_bytes,
+                                spec.revisions, spec.header_revisions, spec.password, collision_group=number)
+            specs.extend([spec, twin])
+        else:
+            specs.append(spec)
+    return specs
+
+
+def generate_corpus(folder: str, specs, seed: int = 0, settings=None) -> dict:
+    """Write the documents of `specs` below `folder` plus the manifest; returns the manifest."""
+    os.makedirs(folder, exist_ok=True)
+    files = []
+    for spec in specs:
+        rng = random.Random(f"{seed}:{spec.name}")
+        data, word_count = docx_bytes(spec, rng)
+        encryption = None
+        if spec.password:
+            data, encryption = encrypt_docx(data, spec.password, rng)
+        path = os.path.join(folder, spec.name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        files.append({
+            "name": spec.name,
+            "bytes": len(data),
+            "pages": spec.pages,
+            "words": word_count,
+            "images": spec.images,
+            "revisions": spec.revisions,
+            "header_revisions": spec.header_revisions,
+            "password": spec.password,
+            "encryption": encryption,
+            "collision_group": spec.collision_group,
+        })
+
+    manifest = {"seed": seed, "settings": settings or {}, "files": files}
+    with open(os.path.join(folder, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_manifest(folder: str) -> dict:
+    with open(os.path.join(folder, MANIFEST_NAME), "r", encoding="utf-8") as f:
+        return json.load(f)
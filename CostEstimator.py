@@ -0,0 +1,108 @@
+import heapq
+import itertools
+import os
+import re
+import zipfile
+import zlib
+
+SCHEDULES = ("order", "longest", "shortest")
+
+_APP_PROPERTY = re.compile(rb"<(?:\w+:)?(Pages|Words)>\s*(\d+)\s*</")
+
+
+def document_features(path: str) -> dict:
+    """What a conversion's duration depends on, read without Word.
+
+    Returns {"pages", "words", "media_bytes", "file_bytes"}; pages and
+    words come from docProps/app.xml (as last saved by Word) and are None
+    for legacy .doc, encrypted or damaged files.
+    """
+    features = {"pages": None, "words": None, "media_bytes": 0, "file_bytes": 0}
+    try:
+        features["file_bytes"] = os.path.getsize(path)
+        with zipfile.ZipFile(path) as package:
+            for info in package.infolist():
+                if info.filename.startswith("word/media/"):
+                    features["media_bytes"] += info.file_size
+            with package.open("docProps/app.xml") as app:
+                for name, value in _APP_PROPERTY.findall(app.read(64 * 1024)):
+                    features[name.decode("ascii").lower()] = int(value)
+    except (OSError, KeyError, zipfile.BadZipFile, zlib.error, NotImplementedError, RuntimeError, EOFError):
+        pass  # Estimate from what is known
+    return features
+
+
+class CostEstimator:
+    """Predicts the seconds Word needs to convert a document.
+
+    A linear model over document_features(): every document costs
+    `base_seconds` (open, close), plus time per page, per thousand words
+    and per megabyte of embedded media. When the page count is unknown it
+    is guessed from the file size. The estimates only need to rank
+    documents well; the timing report compares them with the actual times.
+    """
+
+    def __init__(self, base_seconds=0.8, seconds_per_page=0.04, seconds_per_thousand_words=0.05,
+                 seconds_per_media_megabyte=0.15, bytes_per_page_guess=40 * 1024):
+        self.base_seconds = base_seconds
+        self.seconds_per_page = seconds_per_page
+        self.seconds_per_thousand_words = seconds_per_thousand_words
+        self.seconds_per_media_megabyte = seconds_per_media_megabyte
+        self.bytes_per_page_guess = bytes_per_page_guess
+
+    def estimate(self, path: str) -> float:
+        features = document_features(path)
+        pages = features["pages"]
+        if pages is None:
+            pages = max(1, (features["file_bytes"] - features["media_bytes"]) // self.bytes_per_page_guess)
+        return (
+            self.base_seconds
+            + pages * self.seconds_per_page
+            + (features["words"] or 0) / 1000 * self.seconds_per_thousand_words
+            + features["media_bytes"] / (1024 * 1024) * self.seconds_per_media_megabyte
+        )
+
+
+class ScheduledQueue:
+    """Work queue ordered by `schedule`: "order" (first in, first out),
+    "longest" (longest job first, for the shortest batch overall when
+    several Word instances share the work) or "shortest" (quick results first).
+
+    push_front() puts an item ahead of everything else, e.g. a retry.
+    """
+
+    def __init__(self, schedule="order"):
+        if schedule not in SCHEDULES:
+            raise ValueError(f"Unknown schedule '{schedule}'. Choose from: {', '.join(SCHEDULES)}")
+        self.schedule = schedule
+        self._heap = []
+        self._sequence = itertools.count()
+
+    def push(self, item, cost: float = 0.0):
+        if self.schedule == "longest":
+            priority = -cost
+        elif self.schedule == "shortest":
+            priority = cost
+        else:
+            priority = 0.0
+        heapq.heappush(self._heap, (priority, next(self._sequence), item))
+
+    def push_front(self, item):
+        heapq.heappush(self._heap, (float("-inf"), -next(self._sequence), item))
+
+    def pop(self):
+        return heapq.heappop(self._heap)[2]
+
+    def peek(self, count: int) -> list:
+        """The next `count` items pop() would return, without removing them."""
+        if count <= 0:
+            return []
+        # The k-th smallest entry of a heap is never deeper than level k
+        candidates = self._heap[:(1 << count) - 1]
+        return [entry[2] for entry in heapq.nsmallest(count, candidates)]
+
+    def clear(self):
+        self._heap.clear()
+
+    def __len__(self):
+        return len(self._heap)
@@ -0,0 +1,90 @@
+import threading
+import time
+
+TIMED_OUT = "timed out"
+CANCELLED = "cancelled"
+
+
+class DocumentWatchdog:
+    """Kills the engine when a document takes longer than `timeout` seconds,
+    or when the batch is stopped while a document is still in flight.
+
+    A Word call that hangs (in Documents.Open or SaveAs, say) cannot be
+    interrupted on its own thread, but it fails as soon as Word's process
+    is gone. The converting thread calls arm() before a document and
+    disarm() after it; `on_expired()` (e.g. backend.kill) is called from
+    the watchdog's own thread, and expired() then tells the converting
+    thread why its call failed.
+    """
+
+    def __init__(self, on_expired, timeout=None):
+        self.on_expired = on_expired
+        self.timeout = timeout
+        self._condition = threading.Condition()
+        self._armed = None  # file index of the document in flight
+        self._deadline = None
+        self._reason = None
+        self._cancel_at = None  # Set by cancel(); also bounds documents armed afterwards
+        self._expired = None  # (file index, reason) of the last document killed
+        self._closed = False
+        self._thread = threading.Thread(target=self._watch, name="document-watchdog", daemon=True)
+        self._thread.start()
+
+    def arm(self, index: int):
+        with self._condition:
+            self._armed = index
+            self._expired = None
+            self._deadline, self._reason = None, None
+            if self.timeout:
+                self._deadline, self._reason = time.monotonic() + self.timeout, TIMED_OUT
+            self._apply_cancel()
+            self._condition.notify_all()
+
+    def disarm(self):
+        with self._condition:
+            self._armed = None
+            self._deadline = None
+            self._condition.notify_all()
+
+    def cancel(self, grace: float):
+        """Kill the document in flight unless it finishes within `grace` seconds.
+        Safe to call from any thread."""
+        with self._condition:
+            self._cancel_at = time.monotonic() + grace
+            if self._armed is not None:
+                self._apply_cancel()
+            self._condition.notify_all()
+
+    def expired(self, index: int):
+        """TIMED_OUT or CANCELLED if document `index` was killed, else None."""
+        with self._condition:
+            if self._expired is not None and self._expired[0] == index:
+                return self._expired[1]
+            return None
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+
+    def _apply_cancel(self):
+        if self._cancel_at is not None and (self._deadline is None or self._cancel_at < self._deadline):
+            self._deadline, self._reason = self._cancel_at, CANCELLED
+
+    def _watch(self):
+        with self._condition:
+            while not self._closed:
+                if self._deadline is None:
+                    self._condition.wait()
+                    continue
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+                self._expired = (self._armed, self._reason)
+                self._armed = self._deadline = None
+                try:
+                    self.on_expired()  # Under the lock, so the next arm() waits until the kill is done
+                except Exception:
+                    pass  # The engine is already gone
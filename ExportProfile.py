@@ -0,0 +1,82 @@
+wdExportFormatPDF = 17
+wdExportOptimizeForPrint = 0
+wdExportOptimizeForOnScreen = 1
+wdExportAllDocument = 0
+wdExportDocumentContent = 0
+
+_OPTIMIZE_FOR = {"print": wdExportOptimizeForPrint, "screen": wdExportOptimizeForOnScreen}
+_BOOKMARKS = {"none": 0, "headings": 1, "word": 2}  # wdExportCreate{No,Heading,Word}Bookmarks
+
+
+class ExportProfile:
+    """A named set of Document.ExportAsFixedFormat options.
+
+    `optimize_for` is "print" (full-resolution images) or "screen" (smaller
+    files); `bookmarks` is "none", "headings" or "word" (every bookmark in
+    the document). Structure tags make the PDF accessible but are the
+    slowest part of exporting a long document. `pdf_a` writes PDF/A-1 for
+    archiving; `bitmap_missing_fonts` renders text whose font cannot be
+    embedded as images, instead of letting the reader substitute a font.
+    """
+
+    def __init__(self, name, label, optimize_for="print", bookmarks="none", structure_tags=False,
+                 pdf_a=False, bitmap_missing_fonts=True, include_properties=True):
+        if optimize_for not in _OPTIMIZE_FOR:
+            raise ValueError(f"Unknown optimization '{optimize_for}'. Choose from: {', '.join(_OPTIMIZE_FOR)}")
+        if bookmarks not in _BOOKMARKS:
+            raise ValueError(f"Unknown bookmarks option '{bookmarks}'. Choose from: {', '.join(_BOOKMARKS)}")
+        self.name = name
+        self.label = label
+        self.optimize_for = optimize_for
+        self.bookmarks = bookmarks
+        self.structure_tags = structure_tags
+        self.pdf_a = pdf_a
+        self.bitmap_missing_fonts = bitmap_missing_fonts
+        self.include_properties = include_properties
+
+    def settings(self) -> dict:
+        """The options as plain values, for cache keys and reports."""
+        return {
+            "optimize_for": self.optimize_for,
+            "bookmarks": self.bookmarks,
+            "structure_tags": self.structure_tags,
+            "pdf_a": self.pdf_a,
+            "bitmap_missing_fonts": self.bitmap_missing_fonts,
+            "include_properties": self.include_properties,
+        }
+
+    def export_arguments(self, output_path: str) -> dict:
+        """Keyword arguments for Document.ExportAsFixedFormat."""
+        return {
+            "OutputFileName": output_path,
+            "ExportFormat": wdExportFormatPDF,
+            "OpenAfterExport": False,
+            "OptimizeFor": _OPTIMIZE_FOR[self.optimize_for],
+            "Range": wdExportAllDocument,
+            "Item": wdExportDocumentContent,
+            "IncludeDocProps": self.include_properties,
+            "KeepIRM": True,
+            "CreateBookmarks": _BOOKMARKS[self.bookmarks],
+            "DocStructureTags": self.structure_tags,
+            "BitmapMissingFonts": self.bitmap_missing_fonts,
+            "UseISO19005_1": self.pdf_a,
+        }
+
+
+EXPORT_PROFILES = {profile.name: profile for profile in (
+    # What SaveAs with wdFormatPDF produces
+    ExportProfile("standard", "Standard (tags and bookmarks)", bookmarks="word", structure_tags=True),
+    ExportProfile("fast", "Fast (no tags or bookmarks)"),
+    ExportProfile("small", "Smallest file (screen quality)", optimize_for="screen", bitmap_missing_fonts=False,
+                  include_properties=False),
+    ExportProfile("archive", "Archive (PDF/A)", bookmarks="headings", structure_tags=True, pdf_a=True),
+)}
+DEFAULT_EXPORT_PROFILE = "standard"
+
+
+def find_export_profile(name=None) -> ExportProfile:
+    """The profile called `name` (default: DEFAULT_EXPORT_PROFILE)."""
+    try:
+        return EXPORT_PROFILES[name or DEFAULT_EXPORT_PROFILE]
+    except KeyError:
+        raise ValueError(f"Unknown export profile '{name}'. Choose from: {', '.join(EXPORT_PROFILES)}")
@@ -0,0 +1,135 @@
+from array import array
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt
+from PyQt6.QtGui import QBrush, QColor
+
+STATUS_PENDING = 0
+STATUS_CONVERTED = 1
+STATUS_FAILED = 2
+STATUS_SKIPPED = 3
+STATUS_DEFERRED = 4
+
+_STATUS_BRUSHES = {
+    STATUS_PENDING: QBrush(QColor("white")),
+    STATUS_CONVERTED: QBrush(QColor("lightgreen")),
+    STATUS_FAILED: QBrush(QColor("#FFCCCB")),
+    STATUS_SKIPPED: QBrush(QColor("lightgray")),
+    STATUS_DEFERRED: QBrush(QColor("#FFF3CD")),
+}
+
+PathRole = Qt.ItemDataRole.UserRole
+StatusRole = Qt.ItemDataRole.UserRole + 1
+
+
+class FileListModel(QAbstractListModel):
+    """Queued documents with their conversion status.
+
+    Per-row state lives in parallel arrays (path, status code, message id)
+    and messages are interned, so 100k rows cost a few bytes each beyond the
+    path itself. `_row_by_path` deduplicates additions in O(1).
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._paths = []
+        self._status = array("b")
+        self._message_ids = array("i")
+        self._messages = [""]  # message id -> text; 0 means no message
+        self._message_index = {"": 0}
+        self._row_by_path = {}
+
+    # --- Qt model interface ---
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._paths)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.ItemDataRole.DisplayRole:
+            message = self._messages[self._message_ids[row]]
+            return f"{self._paths[row]} --- {message}" if message else self._paths[row]
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return _STATUS_BRUSHES[self._status[row]]
+        if role in (Qt.ItemDataRole.ToolTipRole, PathRole):
+            return self._paths[row]
+        if role == StatusRole:
+            return self._status[row]
+        return None
+
+    # --- Queue management ---
+    def add_paths(self, paths) -> list:
+        """Append paths that are not queued yet; returns the ones added."""
+        new_paths = []
+        for path in paths:
+            if path not in self._row_by_path:
+                self._row_by_path[path] = len(self._paths) + len(new_paths)
+                new_paths.append(path)
+        if not new_paths:
+            return new_paths
+
+        first = len(self._paths)
+        self.beginInsertRows(QModelIndex(), first, first + len(new_paths) - 1)
+        self._paths.extend(new_paths)
+        self._status.extend(array("b", [STATUS_PENDING]) * len(new_paths))
+        self._message_ids.extend(array("i", [0]) * len(new_paths))
+        self.endInsertRows()
+        return new_paths
+
+    def clear(self):
+        self.beginResetModel()
+        self._paths = []
+        self._status = array("b")
+        self._message_ids = array("i")
+        self._messages = [""]
+        self._message_index = {"": 0}
+        self._row_by_path = {}
+        self.endResetModel()
+
+    def path(self, row: int) -> str:
+        return self._paths[row]
+
+    def paths(self) -> list:
+        return list(self._paths)
+
+    def row_of(self, path: str) -> int:
+        return self._row_by_path.get(path, -1)
+
+    def status(self, row: int) -> int:
+        return self._status[row]
+
+    def set_status(self, row: int, status: int, message: str = ""):
+        if not 0 <= row < len(self._paths):
+            return
+        self._status[row] = status
+        self._message_ids[row] = self._intern(message)
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def set_statuses(self, updates):
+        """Apply (row, status, message) tuples with a single change notification."""
+        rows = []
+        for row, status, message in updates:
+            if 0 <= row < len(self._paths):
+                self._status[row] = status
+                self._message_ids[row] = self._intern(message)
+                rows.append(row)
+        if rows:
+            self.dataChanged.emit(self.index(min(rows)), self.index(max(rows)))
+
+    def reset_statuses(self):
+        """Return every row to pending with a single change notification."""
+        if not self._paths:
+            return
+        count = len(self._paths)
+        self._status = array("b", [STATUS_PENDING]) * count
+        self._message_ids = array("i", [0]) * count
+        self.dataChanged.emit(self.index(0), self.index(count - 1))
+
+    def _intern(self, message: str) -> int:
+        message_id = self._message_index.get(message)
+        if message_id is None:
+            message_id = len(self._messages)
+            self._messages.append(message)
+            self._message_index[message] = message_id
+        return message_id
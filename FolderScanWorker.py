@@ -0,0 +1,29 @@
+from PyQt6.QtCore import (
+    QObject,
+    QDir,
+    pyqtSignal,
+)
+
+from FolderScanner import iter_word_file_batches
+
+class FolderScanWorker(QObject):
+    files_found = pyqtSignal(list)  # batch of paths, in the dialog's "/" separator style
+    scan_finished = pyqtSignal(int)  # total number of files found
+
+    def __init__(self, root: str, batch_size: int = 200):
+        super().__init__()
+        self.root = root
+        self.batch_size = batch_size
+        self._is_running = True
+
+    def run(self):
+        found = 0
+        for batch in iter_word_file_batches(self.root, self.batch_size):
+            if not self._is_running:
+                break
+            found += len(batch)
+            self.files_found.emit([QDir.fromNativeSeparators(path) for path in batch])
+        self.scan_finished.emit(found)
+
+    def stop(self):
+        self._is_running = False
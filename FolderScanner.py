@@ -0,0 +1,62 @@
+import os
+import time
+
+WORD_EXTENSIONS = (".doc", ".docx")
+
+
+def iter_word_files(root: str, extensions=WORD_EXTENSIONS):
+    """Yield the Word documents below `root` as they are found.
+
+    Walks the tree depth-first with os.scandir, which returns file types with
+    the listing, so no extra stat call is needed per entry. Unreadable
+    directories are skipped and symlinked directories are not followed.
+    """
+    for path in _walk(root, extensions):
+        if path is not None:
+            yield path
+
+
+def _walk(root: str, extensions):
+    """iter_word_files(), but also yielding None for every other entry and
+    directory visited, so callers regain control while nothing matches."""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        subdirectories = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirectories.append(entry.path)
+                        elif entry.name.lower().endswith(extensions) and entry.is_file():
+                            yield entry.path
+                            continue
+                    except OSError:
+                        pass
+                    yield None
+        except OSError:
+            pass
+        yield None
+        stack.extend(reversed(subdirectories))  # Visit subdirectories in listing order
+
+
+def iter_word_file_batches(root: str, batch_size: int = 200, max_delay: float = 0.25, extensions=WORD_EXTENSIONS):
+    """Group iter_word_files() into lists of up to `batch_size` paths.
+
+    A partial batch is also released once `max_delay` seconds have passed
+    since the last one, so files keep flowing from slow network shares. The
+    delay is checked for every directory entry, not only when the next
+    document turns up.
+    """
+    batch = []
+    last_flush = time.monotonic()
+    for path in _walk(root, extensions):
+        if path is not None:
+            batch.append(path)
+        if batch and (len(batch) >= batch_size or time.monotonic() - last_flush >= max_delay):
+            yield batch
+            batch = []
+            last_flush = time.monotonic()
+    if batch:
+        yield batch
@@ -0,0 +1,163 @@
+import os
+import threading
+import time
+
+from FolderScanner import WORD_EXTENSIONS, iter_word_files
+
+
+class HotFolderWatcher:
+    """Polls input folders for Word documents that have finished arriving.
+
+    A file is reported once its size and mtime have not changed for
+    `settle_time` seconds, so documents still being copied (e.g. onto a
+    network share) are left alone. Each version of a file is reported once;
+    saving over it later reports it again. Polling with os.scandir works the
+    same on local disks and SMB shares, where change notifications are
+    unreliable.
+    """
+
+    def __init__(self, folders, settle_time=2.0, recursive=False, extensions=WORD_EXTENSIONS):
+        self.folders = list(folders)
+        self.settle_time = settle_time
+        self.recursive = recursive
+        self.extensions = extensions
+        self._candidates = {}  # path -> [size, mtime, first_seen, last_change]
+        self._reported = {}  # path -> (size, mtime) of the version already reported
+
+    def poll(self, now=None) -> list:
+        """Scan the folders once; returns (path, first_seen) for files that settled."""
+        now = time.time() if now is None else now
+        seen = set()
+        ready = []
+        for path, size, mtime in self._scan():
+            seen.add(path)
+            if self._reported.get(path) == (size, mtime):
+                continue
+            candidate = self._candidates.get(path)
+            if candidate is None:
+                self._candidates[path] = [size, mtime, now, now]
+                continue
+            if (candidate[0], candidate[1]) != (size, mtime):
+                candidate[0], candidate[1], candidate[3] = size, mtime, now
+                continue
+            if size > 0 and now - candidate[3] >= self.settle_time:
+                del self._candidates[path]
+                self._reported[path] = (size, mtime)
+                ready.append((path, candidate[2]))
+
+        # Forget files that were removed or moved away
+        for table in (self._candidates, self._reported):
+            for path in [path for path in table if path not in seen]:
+                del table[path]
+        return ready
+
+    def _scan(self):
+        for folder in self.folders:
+            if self.recursive:
+                paths = iter_word_files(folder, self.extensions)
+            else:
+                paths = self._list_folder(folder)
+            for path in paths:
+                if os.path.basename(path).startswith("~$"):
+                    continue  # Word's owner/lock file next to an open document
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield path, stat.st_size, stat.st_mtime
+
+    def _list_folder(self, folder: str):
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.name.lower().endswith(self.extensions) and entry.is_file():
+                        yield entry.path
+        except OSError:
+            return  # The share is unreachable; try again on the next poll
+
+
+def iter_watch_batches(watcher, poll_interval=1.0, batch_window=2.0, max_batch=200, stop_event=None):
+    """Poll `watcher` until `stop_event` is set and yield bursts of settled files.
+
+    Files that settle within `batch_window` seconds of the first one are
+    coalesced into one list of (path, first_seen) tuples, capped at `max_batch`.
+    """
+    stop_event = stop_event or threading.Event()
+    pending = []
+    pending_since = None
+    while not stop_event.is_set():
+        ready = watcher.poll()
+        if ready and not pending:
+            pending_since = time.monotonic()
+        pending.extend(ready)
+        while len(pending) >= max_batch:
+            yield pending[:max_batch]
+            pending = pending[max_batch:]
+            pending_since = time.monotonic()
+        if pending and time.monotonic() - pending_since >= batch_window:
+            yield pending
+            pending = []
+        stop_event.wait(poll_interval)
+    if pending:
+        yield pending
+
+
+class IntakeStats:
+    """Queue depth and arrival-to-PDF latency of a watched, streaming batch.
+
+    Arrivals are recorded by file index as they are handed to the runner;
+    finishes come from the runner's listener, on another thread.
+    """
+
+    def __init__(self, max_samples=1000):
+        self.max_samples = max_samples
+        self.queued = 0
+        self.converted = 0
+        self.failed = 0
+        self._arrivals = {}  # file index -> first_seen
+        self._latencies = []  # most recent arrival-to-finish times, in seconds
+        self._lock = threading.Lock()
+
+    def record_arrivals(self, first_index: int, first_seen_times):
+        with self._lock:
+            for index, first_seen in enumerate(first_seen_times, first_index):
+                self._arrivals[index] = first_seen
+            self.queued += len(first_seen_times)
+
+    def record_finished(self, index: int, success: bool):
+        with self._lock:
+            if success:
+                self.converted += 1
+            else:
+                self.failed += 1
+            first_seen = self._arrivals.pop(index, None)
+            if first_seen is not None:
+                self._latencies.append(time.time() - first_seen)
+                del self._latencies[:-self.max_samples]
+
+    @property
+    def queue_depth(self) -> int:
+        return self.queued - self.converted - self.failed
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            snapshot = {
+                "queue_depth": self.queued - self.converted - self.failed,
+                "converted": self.converted,
+                "failed": self.failed,
+                "latency_p50_seconds": None,
+                "latency_max_seconds": None,
+            }
+        if latencies:
+            snapshot["latency_p50_seconds"] = round(latencies[len(latencies) // 2], 3)
+            snapshot["latency_max_seconds"] = round(latencies[-1], 3)
+        return snapshot
+
+    def summary(self) -> str:
+        s = self.snapshot()
+        text = f"Queue: {s['queue_depth']} waiting, {s['converted']} converted, {s['failed']} failed or skipped."
+        if s["latency_p50_seconds"] is not None:
+            text += (f" Arrival to PDF: median {s['latency_p50_seconds']:.1f}s,"
+                     f" max {s['latency_max_seconds']:.1f}s.")
+        return text
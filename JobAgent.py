@@ -0,0 +1,133 @@
+import socket
+import threading
+
+from ConversionBackend import WordBackend
+from ConversionEngine import run_pool_child
+from DocumentWatchdog import DocumentWatchdog
+from JobServer import JobServerError
+
+
+class JobAgent:
+    """Converts files leased from a JobServer with the pool child's loop.
+
+    The agent stands in for a pool child's pipe: run_pool_child() receives
+    leased tasks from recv() and its results go back to the server through
+    send(), so a machine converts exactly as a WorkerPool child would. A
+    thread renews the lease while Word works. A document running over
+    `document_timeout` seconds is reported as timed out and Word is
+    restarted; if the server cannot be reached the agent retries every
+    `retry_seconds`.
+    """
+
+    def __init__(self, client, backend_factory=None, name=None, document_timeout=None, poll_seconds=5.0,
+                 retry_seconds=5.0, on_status=None):
+        self.client = client
+        self.backend_factory = backend_factory or WordBackend
+        self.name = name or socket.gethostname()
+        self.document_timeout = document_timeout
+        self.poll_seconds = poll_seconds
+        self.retry_seconds = retry_seconds
+        self.on_status = on_status or (lambda text: None)
+        self.converted = 0
+        self.fatal_error = None
+        self._stopped = threading.Event()
+        self._finished = threading.Event()  # Heartbeats go on until the last document is reported
+        self._lock = threading.Lock()
+        self._lease = None  # The lease being worked on, as returned by JobClient.lease()
+        self._events = []  # [kind, file index, payload] reported with the lease's result
+        self._backend = None
+        self._restart_backend = False
+        self._watchdog = None
+
+    def run(self):
+        """Convert leased files until stop(); returns a fatal error text, or None."""
+        self._finished.clear()
+        heartbeat = threading.Thread(target=self._send_heartbeats, name="job-agent-heartbeat", daemon=True)
+        heartbeat.start()
+        try:
+            while not self._stopped.is_set() and self.fatal_error is None:
+                self._restart_backend = False
+                run_pool_child(0, self._start_backend, self)  # Returns when recv() gives None
+                self._close_watchdog()
+        finally:
+            self._finished.set()
+            heartbeat.join()
+        return self.fatal_error
+
+    def stop(self):
+        """Stop after the document being converted (takes up to `poll_seconds` when idle)."""
+        self._stopped.set()
+
+    def _start_backend(self):
+        self._backend = self.backend_factory()
+        self._watchdog = DocumentWatchdog(self._backend.kill, self.document_timeout)
+        return self._backend
+
+    def _close_watchdog(self):
+        if self._watchdog:
+            self._watchdog.close()
+            self._watchdog = None
+
+    # --- The connection run_pool_child() talks to ---
+    def recv(self):
+        while not self._stopped.is_set() and not self._restart_backend:
+            try:
+                lease = self.client.lease(self.name, self.poll_seconds)
+            except JobServerError as e:
+                self.on_status(f"{e}; retrying in {self.retry_seconds:g} s")
+                self._stopped.wait(self.retry_seconds)
+                continue
+            if lease is None:
+                continue
+            task = lease["task"]
+            with self._lock:
+                self._lease = lease
+                self._events = []
+            self.on_status(f"Converting {task[1]}")
+            self._watchdog.arm(task[0])
+            return tuple(task)
+        return None
+
+    def send(self, message):
+        kind, _, index, payload = message
+        if kind == "ready":
+            self.on_status(f"Agent {self.name} ready; Word started in {payload['startup_seconds']:.1f} s")
+            return
+        if kind == "fatal":
+            self.fatal_error = payload
+            return
+        if kind in ("pong", "memory"):
+            return
+
+        with self._lock:
+            if kind not in ("converted", "error", "password"):
+                self._events.append([kind, index, payload])
+                return
+            self._watchdog.disarm()
+            expired = self._watchdog.expired(index)
+            if expired:
+                kind, payload = "expired", expired
+                self._restart_backend = True  # Word was killed
+            elif kind == "converted":
+                payload = vars(payload)  # FileResult, as JSON
+                self.converted += 1
+            events = self._events + [[kind, index, payload]]
+            lease, self._lease, self._events = self._lease, None, []
+        try:
+            if not self.client.report(lease["lease_id"], events):
+                self.on_status(f"The lease on {lease['task'][1]} expired; another agent converts it")
+        except JobServerError as e:
+            self.on_status(f"Could not report {lease['task'][1]}: {e}")
+
+    def _send_heartbeats(self):
+        while not self._finished.is_set():
+            with self._lock:
+                lease = self._lease
+            interval = lease["lease_seconds"] / 3 if lease else 1.0
+            if lease:
+                try:
+                    if not self.client.heartbeat(lease["lease_id"]):
+                        self.on_status(f"Lost the lease on {lease['task'][1]}")
+                except JobServerError as e:
+                    self.on_status(str(e))
+            self._finished.wait(interval)
@@ -0,0 +1,451 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError, URLError
+import collections
+import hmac
+import ipaddress
+import json
+import os
+import re
+import threading
+import time
+import urllib.request
+import uuid
+
+# Events that end a file's lease; the others ("leased", "requeued", "stage", "timings") are progress
+FINAL_EVENTS = ("converted", "error", "password", "expired")
+TOKEN_ENV = "WORD_TO_PDF_JOB_TOKEN"  # Shared token of JobServer and JobClient when none is passed
+
+
+class JobServerError(Exception):
+    """A request to the job server failed; `status` is the HTTP status, or None
+    when the server could not be reached."""
+
+    def __init__(self, message: str, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class _Lease:
+    def __init__(self, batch_id: str, task: list, agent: str, expires: float):
+        self.batch_id = batch_id
+        self.task = task
+        self.agent = agent
+        self.expires = expires
+
+
+class _Batch:
+    def __init__(self):
+        self.events = []  # [kind, agent, file index, payload], read by the submitter from any offset
+        self.attempts = {}  # file index -> leases that expired
+        self.cancelled = False
+
+
+class JobQueue:
+    """The batches submitted to a JobServer and the leases agents hold on their files.
+
+    A task is the message a pool child receives: [index, input, output,
+    passwords, has_revisions, profile_name]. lease() hands the oldest queued
+    task to an agent for `lease_seconds`; the agent keeps it with
+    heartbeat() and ends it with report(). A lease that is not renewed in
+    time (the agent's machine went away) is queued again at the front,
+    up to `max_attempts` times before the file is reported as failed.
+    Every step is appended to the batch's events for its submitter.
+    """
+
+    def __init__(self, lease_seconds=60.0, max_attempts=3):
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._condition = threading.Condition()
+        self._queue = collections.deque()  # (batch id, task)
+        self._batches = {}
+        self._leases = {}
+        self._agents = {}  # agent name -> time.time() of its last request
+
+    def create_batch(self) -> str:
+        batch_id = uuid.uuid4().hex
+        with self._condition:
+            self._batches[batch_id] = _Batch()
+        return batch_id
+
+    def add_tasks(self, batch_id: str, tasks):
+        with self._condition:
+            batch = self._batch(batch_id)
+            if not batch.cancelled:
+                self._queue.extend((batch_id, list(task)) for task in tasks)
+                self._condition.notify_all()
+
+    def cancel(self, batch_id: str):
+        """Drop the batch's queued files; leased ones may still report."""
+        with self._condition:
+            self._batch(batch_id).cancelled = True
+            self._queue = collections.deque(item for item in self._queue if item[0] != batch_id)
+
+    def close_batch(self, batch_id: str):
+        """Forget the batch once its submitter is done with it."""
+        with self._condition:
+            self.cancel(batch_id)
+            del self._batches[batch_id]
+            for lease_id in [lease_id for lease_id, lease in self._leases.items() if lease.batch_id == batch_id]:
+                del self._leases[lease_id]
+            self._condition.notify_all()
+
+    def events(self, batch_id: str, after: int, wait: float):
+        """The batch's events from offset `after`, waiting up to `wait`
+        seconds for one; returns (events, offset for the next call)."""
+        deadline = time.monotonic() + wait
+        with self._condition:
+            while True:
+                batch = self._batch(batch_id)
+                remaining = deadline - time.monotonic()
+                if len(batch.events) > after or remaining <= 0:
+                    return batch.events[after:], len(batch.events)
+                self._condition.wait(remaining)
+
+    def lease(self, agent: str, wait: float):
+        """Lease the next queued task to `agent`, waiting up to `wait` seconds
+        for one; returns {"lease_id", "task", "lease_seconds"} or None."""
+        deadline = time.monotonic() + wait
+        with self._condition:
+            self._agents[agent] = time.time()
+            while True:
+                self.expire_leases()
+                if self._queue:
+                    batch_id, task = self._queue.popleft()
+                    lease_id = uuid.uuid4().hex
+                    self._leases[lease_id] = _Lease(batch_id, task, agent, time.monotonic() + self.lease_seconds)
+                    self._add_event(batch_id, "leased", agent, task[0], None)
+                    return {"lease_id": lease_id, "task": task, "lease_seconds": self.lease_seconds}
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._condition.wait(min(remaining, self.lease_seconds))
+
+    def heartbeat(self, lease_id: str) -> bool:
+        """Extend a lease; False if it expired and its file went to another agent."""
+        with self._condition:
+            lease = self._leases.get(lease_id)
+            if lease is None:
+                return False
+            lease.expires = time.monotonic() + self.lease_seconds
+            self._agents[lease.agent] = time.time()
+            return True
+
+    def report(self, lease_id: str, events) -> bool:
+        """Append an agent's events [kind, file index, payload] to the lease's
+        batch; a final event ends the lease. False if the lease expired."""
+        with self._condition:
+            lease = self._leases.get(lease_id)
+            if lease is None:
+                return False
+            self._agents[lease.agent] = time.time()
+            for kind, index, payload in events:
+                self._add_event(lease.batch_id, kind, lease.agent, index, payload)
+                if kind in FINAL_EVENTS:
+                    self._leases.pop(lease_id, None)
+                    break  # The file is done; anything after its result is not
+            return True
+
+    def expire_leases(self):
+        """Queue the files of agents that stopped sending heartbeats again."""
+        with self._condition:
+            now = time.monotonic()
+            for lease_id, lease in list(self._leases.items()):
+                if lease.expires > now:
+                    continue
+                del self._leases[lease_id]
+                batch = self._batches.get(lease.batch_id)
+                if batch is None or batch.cancelled:
+                    continue
+                index = lease.task[0]
+                batch.attempts[index] = batch.attempts.get(index, 0) + 1
+                if batch.attempts[index] >= self.max_attempts:
+                    self._add_event(lease.batch_id, "error", lease.agent, index,
+                                    f"Lost the conversion agent {batch.attempts[index]} times")
+                else:
+                    self._queue.appendleft((lease.batch_id, lease.task))
+                    self._add_event(lease.batch_id, "requeued", lease.agent, index, None)
+
+    def status(self) -> dict:
+        with self._condition:
+            now = time.time()
+            return {
+                "queued": len(self._queue),
+                "leased": len(self._leases),
+                "batches": len(self._batches),
+                "agents": {agent: round(now - seen, 1) for agent, seen in self._agents.items()},
+            }
+
+    def _batch(self, batch_id: str) -> _Batch:
+        try:
+            return self._batches[batch_id]
+        except KeyError:
+            raise KeyError(f"Unknown batch {batch_id}")
+
+    def _add_event(self, batch_id: str, kind: str, agent: str, index: int, payload):
+        batch = self._batches.get(batch_id)
+        if batch is not None:
+            batch.events.append([kind, agent, index, payload])
+            self._condition.notify_all()
+
+
+class _JobRequestHandler(BaseHTTPRequestHandler):
+    """JSON over HTTP:
+
+        POST   /batches                      {"tasks"} -> {"batch_id"}
+        POST   /batches/<id>/tasks           {"tasks"}
+        GET    /batches/<id>/events?after=N&wait=S -> {"events", "next"}
+        POST   /batches/<id>/cancel
+        DELETE /batches/<id>
+        POST   /leases                       {"agent", "wait"} -> {"lease": ... or null}
+        POST   /leases/<id>/heartbeat        (410 once the lease expired)
+        POST   /leases/<id>/events           {"events"} (410 once the lease expired)
+        GET    /status
+
+    When the server has a token, every request must carry it as
+    "Authorization: Bearer <token>" (401 otherwise).
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    ROUTES = (
+        ("POST", r"/batches", "create_batch"),
+        ("POST", r"/batches/(\w+)/tasks", "add_tasks"),
+        ("GET", r"/batches/(\w+)/events", "batch_events"),
+        ("POST", r"/batches/(\w+)/cancel", "cancel_batch"),
+        ("DELETE", r"/batches/(\w+)", "close_batch"),
+        ("POST", r"/leases", "lease"),
+        ("POST", r"/leases/(\w+)/heartbeat", "heartbeat"),
+        ("POST", r"/leases/(\w+)/events", "report"),
+        ("GET", r"/status", "status"),
+    )
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method: str):
+        path, _, query = self.path.partition("?")
+        self.query = dict(part.partition("=")[::2] for part in query.split("&") if part)
+        for route_method, pattern, name in self.ROUTES:
+            match = re.fullmatch(pattern, path)
+            if route_method == method and match:
+                break
+        else:
+            self._reply(404, {"error": f"No route for {method} {path}"})
+            return
+        if not self._authorized():
+            # The body is left unread (it may be large); closing keeps it from being parsed as a request
+            self.close_connection = True
+            self._reply(401, {"error": "Missing or wrong job server token"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+            status, reply = getattr(self, name)(self.server.job_queue, body, *match.groups())
+        except KeyError as e:
+            status, reply = 404, {"error": str(e.args[0])}
+        except (ValueError, TypeError) as e:
+            status, reply = 400, {"error": str(e)}
+        self._reply(status, reply)
+
+    def _authorized(self) -> bool:
+        token = self.server.job_token
+        if not token:
+            return True
+        scheme, _, given = (self.headers.get("Authorization") or "").partition(" ")
+        return scheme == "Bearer" and hmac.compare_digest(given.encode("utf-8"), token.encode("utf-8"))
+
+    def _reply(self, status: int, reply: dict):
+        data = json.dumps(reply).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # Agents poll constantly; the default log line per request is noise
+
+    def create_batch(self, queue, body):
+        batch_id = queue.create_batch()
+        queue.add_tasks(batch_id, body.get("tasks", []))
+        return 200, {"batch_id": batch_id}
+
+    def add_tasks(self, queue, body, batch_id):
+        queue.add_tasks(batch_id, body["tasks"])
+        return 200, {}
+
+    def batch_events(self, queue, body, batch_id):
+        events, after = queue.events(batch_id, int(self.query.get("after", 0)), float(self.query.get("wait", 0)))
+        return 200, {"events": events, "next": after}
+
+    def cancel_batch(self, queue, body, batch_id):
+        queue.cancel(batch_id)
+        return 200, {}
+
+    def close_batch(self, queue, body, batch_id):
+        queue.close_batch(batch_id)
+        return 200, {}
+
+    def lease(self, queue, body):
+        return 200, {"lease": queue.lease(body["agent"], float(body.get("wait", 0)))}
+
+    def heartbeat(self, queue, body, lease_id):
+        if queue.heartbeat(lease_id):
+            return 200, {}
+        return 410, {"error": "The lease expired"}
+
+    def report(self, queue, body, lease_id):
+        if queue.report(lease_id, body["events"]):
+            return 200, {}
+        return 410, {"error": "The lease expired"}
+
+    def status(self, queue, body):
+        return 200, queue.status()
+
+
+class JobServer:
+    """A JobQueue served over HTTP, so several machines' converters can share it.
+
+    Clients (RemoteBatchRunner) submit batches and read their files' results
+    as they arrive; agents (JobAgent) lease files, convert them and report
+    back. Paths in the tasks are used as given, so they must mean the same
+    file on every machine (UNC paths on a share). Passwords travel in the
+    tasks unencrypted: bind to localhost or a trusted network only.
+
+    Requests must carry `token` (default: the WORD_TO_PDF_JOB_TOKEN
+    environment variable) when one is set. Binding to anything but a
+    loopback address without a token raises ValueError, since anyone who
+    can reach the port could otherwise read the passwords and have the
+    agents write PDFs anywhere they can.
+    """
+
+    REAP_INTERVAL = 1.0  # seconds between checks for expired leases
+
+    def __init__(self, host="127.0.0.1", port=0, lease_seconds=60.0, max_attempts=3, token=None):
+        token = token or os.environ.get(TOKEN_ENV)
+        if not token and not _is_loopback(host):
+            raise ValueError(f"Serving on {host or 'every address'} needs a token ({TOKEN_ENV})")
+        self.queue = JobQueue(lease_seconds, max_attempts)
+        self._httpd = ThreadingHTTPServer((host, port), _JobRequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.job_queue = self.queue
+        self._httpd.job_token = token
+        self._stopped = threading.Event()
+        self._threads = []
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve on background threads."""
+        self._threads = [
+            threading.Thread(target=self._httpd.serve_forever, name="job-server", daemon=True),
+            threading.Thread(target=self._reap, name="job-server-leases", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def serve_forever(self):
+        """Serve on the calling thread until shutdown() (or Ctrl+C)."""
+        reaper = threading.Thread(target=self._reap, name="job-server-leases", daemon=True)
+        reaper.start()
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._stopped.set()
+            reaper.join()
+
+    def shutdown(self):
+        self._stopped.set()
+        self._httpd.shutdown()
+        for thread in self._threads:
+            thread.join()
+        self._httpd.server_close()
+
+    def _reap(self):
+        while not self._stopped.wait(self.REAP_INTERVAL):
+            self.queue.expire_leases()
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False  # A host name, or "" for every address
+
+
+class JobClient:
+    """Calls a JobServer's HTTP API; used by RemoteBatchRunner and JobAgent.
+    `token` defaults to the WORD_TO_PDF_JOB_TOKEN environment variable."""
+
+    def __init__(self, url: str, timeout=30.0, token=None):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.token = token or os.environ.get(TOKEN_ENV)
+
+    def submit(self, tasks=()) -> str:
+        return self._request("POST", "/batches", {"tasks": list(tasks)})["batch_id"]
+
+    def add_tasks(self, batch_id: str, tasks):
+        self._request("POST", f"/batches/{batch_id}/tasks", {"tasks": list(tasks)})
+
+    def events(self, batch_id: str, after: int, wait=0.0):
+        reply = self._request("GET", f"/batches/{batch_id}/events?after={after}&wait={wait}", wait=wait)
+        return reply["events"], reply["next"]
+
+    def cancel(self, batch_id: str):
+        self._request("POST", f"/batches/{batch_id}/cancel")
+
+    def close_batch(self, batch_id: str):
+        self._request("DELETE", f"/batches/{batch_id}")
+
+    def lease(self, agent: str, wait=0.0):
+        return self._request("POST", "/leases", {"agent": agent, "wait": wait}, wait=wait)["lease"]
+
+    def heartbeat(self, lease_id: str) -> bool:
+        return self._lease_request(f"/leases/{lease_id}/heartbeat", {})
+
+    def report(self, lease_id: str, events) -> bool:
+        return self._lease_request(f"/leases/{lease_id}/events", {"events": list(events)})
+
+    def status(self) -> dict:
+        return self._request("GET", "/status")
+
+    def _lease_request(self, path: str, body: dict) -> bool:
+        try:
+            self._request("POST", path, body)
+        except JobServerError as e:
+            if e.status == 410:
+                return False
+            raise
+        return True
+
+    def _request(self, method: str, path: str, body=None, wait=0.0) -> dict:
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        request = urllib.request.Request(self.url + path, data, method=method, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout + wait) as response:
+                return json.loads(response.read() or b"{}")
+        except HTTPError as e:
+            try:
+                message = json.loads(e.read()).get("error", e.reason)
+            except ValueError:
+                message = e.reason
+            raise JobServerError(f"Job server: {message}", e.code)
+        except (URLError, OSError) as e:
+            raise JobServerError(f"Cannot reach the job server at {self.url}: {getattr(e, 'reason', e)}")
@@ -0,0 +1,149 @@
+import os
+import threading
+
+from ConversionEngine import output_path_for
+
+
+class PlannedOutput:
+    """Where one input's PDF goes, and what is in the way there."""
+
+    def __init__(self, index: int, input_path: str, output_path: str):
+        self.index = index
+        self.input_path = input_path
+        self.output_path = output_path  # Final path, after collisions and renames
+        self.default_path = output_path  # What output_path_for() gives
+        self.existing = None  # os.DirEntry of a PDF already at output_path
+        self.collides_with = None  # Index of an earlier input with the same default path
+
+    def existing_mtime(self):
+        """Modification time of the existing PDF (free on Windows, where the
+        directory listing already carries it)."""
+        return self.existing.stat().st_mtime if self.existing else None
+
+    def notes(self) -> list:
+        """Short remarks for a preview, e.g. ["PDF exists"]."""
+        notes = []
+        if self.collides_with is not None:
+            notes.append(f"same PDF name as file {self.collides_with + 1}, renamed")
+        if self.existing is not None:
+            notes.append("PDF exists")
+        return notes
+
+
+class OutputPlan:
+    """Output paths of a whole batch, worked out before anything is converted.
+
+    Each target directory is listed once with os.scandir, instead of one
+    os.path.exists per file (a network round trip each on a share). Inputs
+    whose names map to the same PDF ("a b.docx" and "a_b.docx") collide;
+    the later ones get a numbered name (a_b_converted_2.pdf) instead of
+    overwriting the first. Names are compared case-insensitively where
+    the file system does, through os.path.normcase.
+    """
+
+    def __init__(self, output_dir=None):
+        self.output_dir = output_dir
+        self.entries = {}  # index -> PlannedOutput
+        self._listings = {}  # normcased directory -> {normcased name: os.DirEntry}
+        self._claims = {}  # normcased output path -> PlannedOutput that will write it
+        self._lock = threading.Lock()
+
+    def add(self, index: int, input_path: str) -> PlannedOutput:
+        with self._lock:
+            output_path, _ = output_path_for(input_path, self.output_dir)
+            planned = PlannedOutput(index, input_path, output_path)
+            claim = self._claims.get(self._key(output_path))
+            if claim is not None and not _same_file(claim.input_path, input_path):
+                planned.collides_with = claim.index
+                planned.output_path = self._free_path(output_path)
+            if claim is not None and planned.collides_with is None:
+                # The same document again (e.g. modified in a watched folder):
+                # the listing predates its earlier conversion
+                planned.existing = _fresh_entry(planned.output_path)
+            else:
+                planned.existing = self._listing(os.path.dirname(planned.output_path)).get(
+                    os.path.normcase(os.path.basename(planned.output_path))
+                )
+            self._claims[self._key(planned.output_path)] = planned
+            self.entries[index] = planned
+            return planned
+
+    def rename(self, index: int) -> str:
+        """Move file `index` to the next free numbered name; returns the new path."""
+        with self._lock:
+            planned = self.entries[index]
+            self._claims.pop(self._key(planned.output_path), None)
+            planned.output_path = self._free_path(planned.default_path)
+            planned.existing = None
+            self._claims[self._key(planned.output_path)] = planned
+            return planned.output_path
+
+    def forget(self, index: int):
+        """Drop file `index`'s entry once it is done. Its output path stays
+        claimed, so later inputs still do not overwrite its PDF."""
+        with self._lock:
+            self.entries.pop(index, None)
+
+    def output_path(self, index: int):
+        planned = self.entries.get(index)
+        return planned.output_path if planned else None
+
+    def collisions(self):
+        return [planned for planned in self.entries.values() if planned.collides_with is not None]
+
+    def existing(self):
+        return [planned for planned in self.entries.values() if planned.existing is not None]
+
+    def _listing(self, directory: str) -> dict:
+        key = os.path.normcase(os.path.abspath(directory or os.curdir))
+        if key not in self._listings:
+            listing = {}
+            try:
+                with os.scandir(directory or os.curdir) as entries:
+                    for entry in entries:
+                        listing[os.path.normcase(entry.name)] = entry
+            except OSError:
+                pass  # Not created yet: nothing is in the way
+            self._listings[key] = listing
+        return self._listings[key]
+
+    def _free_path(self, output_path: str) -> str:
+        """The first `name_N.pdf` that is neither on disk nor planned."""
+        base, extension = os.path.splitext(output_path)
+        listing = self._listing(os.path.dirname(output_path))
+        number = 2
+        while True:
+            candidate = f"{base}_{number}{extension}"
+            if self._key(candidate) not in self._claims and \
+                    os.path.normcase(os.path.basename(candidate)) not in listing:
+                return candidate
+            number += 1
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+
+def plan_outputs(input_paths, output_dir=None) -> OutputPlan:
+    """The OutputPlan of a list of files, e.g. for a dry run."""
+    plan = OutputPlan(output_dir)
+    for index, path in enumerate(input_paths):
+        plan.add(index, path)
+    return plan
+
+
+def _same_file(first: str, second: str) -> bool:
+    return os.path.normcase(os.path.abspath(first)) == os.path.normcase(os.path.abspath(second))
+
+
+def _fresh_entry(path: str):
+    directory = os.path.dirname(path) or os.curdir
+    name = os.path.normcase(os.path.basename(path))
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if os.path.normcase(entry.name) == name:
+                    return entry
+    except OSError:
+        pass
+    return None
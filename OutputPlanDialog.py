@@ -0,0 +1,50 @@
+from PyQt6.QtWidgets import (
+    QAbstractItemView,
+    QDialog,
+    QVBoxLayout,
+    QLabel,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView,
+    QDialogButtonBox,
+)
+
+import os
+
+
+class OutputPlanDialog(QDialog):
+    """Dry run: shows where each document's PDF will go, with name
+    collisions and existing PDFs, before anything is converted."""
+
+    def __init__(self, plan, overwrite_label: str, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Output Preview")
+        self.resize(800, 450)
+
+        layout = QVBoxLayout(self)
+        collisions = len(plan.collisions())
+        existing = len(plan.existing())
+        layout.addWidget(QLabel(
+            f"{len(plan.entries)} files: {collisions} name collisions, {existing} PDFs already exist.\n"
+            f"Existing PDFs: {overwrite_label}"
+        ))
+
+        entries = [plan.entries[index] for index in sorted(plan.entries)]
+        self.table = QTableWidget(len(entries), 3)
+        self.table.setHorizontalHeaderLabels(["File", "PDF", "Notes"])
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        for row, planned in enumerate(entries):
+            file_item = QTableWidgetItem(os.path.basename(planned.input_path))
+            file_item.setToolTip(planned.input_path)
+            self.table.setItem(row, 0, file_item)
+            output_item = QTableWidgetItem(planned.output_path)
+            output_item.setToolTip(planned.output_path)
+            self.table.setItem(row, 1, output_item)
+            self.table.setItem(row, 2, QTableWidgetItem("; ".join(planned.notes())))
+        layout.addWidget(self.table)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
@@ -0,0 +1,94 @@
+from PyQt6.QtWidgets import (
+    QDialog,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QComboBox,
+    QLineEdit,
+    QHeaderView,
+    QDialogButtonBox,
+)
+
+from BatchRunner import PendingPrompt
+
+import os
+
+_OVERWRITE_CHOICES = [
+    ("Overwrite", "overwrite"),
+    ("Keep both (rename)", "rename"),
+    ("Skip", "skip"),
+]
+
+
+class PendingPromptsDialog(QDialog):
+    """One dialog for every file the batch parked: existing PDFs get an
+    overwrite/rename/skip choice, protected documents a password field."""
+
+    def __init__(self, prompts, parent=None):
+        super().__init__(parent)
+        self.prompts = prompts
+        self.editors = []
+        self.setWindowTitle("Files Waiting for Your Decision")
+        self.resize(700, 400)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel(
+            f"{len(prompts)} files were set aside so the rest of the batch could continue.\n"
+            "Choose what to do with each of them. Leave a password empty to skip that file."
+        ))
+
+        self.table = QTableWidget(len(prompts), 3)
+        self.table.setHorizontalHeaderLabels(["File", "Issue", "Action"])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        for row, prompt in enumerate(prompts):
+            file_item = QTableWidgetItem(os.path.basename(prompt.input_path))
+            file_item.setToolTip(prompt.input_path)
+            self.table.setItem(row, 0, file_item)
+
+            if prompt.kind == PendingPrompt.PASSWORD:
+                issue = QTableWidgetItem("Password required")
+                editor = QLineEdit()
+                editor.setEchoMode(QLineEdit.EchoMode.Password)
+                editor.setPlaceholderText("Password...")
+            else:
+                issue = QTableWidgetItem(f"'{prompt.pdf_name}' already exists")
+                issue.setToolTip(prompt.output_path)
+                editor = QComboBox()
+                for label, value in _OVERWRITE_CHOICES:
+                    editor.addItem(label, value)
+                editor.setCurrentIndex(len(_OVERWRITE_CHOICES) - 1)  # Default is 'Skip'
+            self.table.setItem(row, 1, issue)
+            self.table.setCellWidget(row, 2, editor)
+            self.editors.append(editor)
+        layout.addWidget(self.table)
+
+        apply_all_layout = QHBoxLayout()
+        apply_all_layout.addWidget(QLabel("All existing files:"))
+        for label, value in _OVERWRITE_CHOICES:
+            button = QPushButton(label)
+            button.clicked.connect(lambda _, value=value: self.set_all_overwrite_choices(value))
+            apply_all_layout.addWidget(button)
+        apply_all_layout.addStretch()
+        layout.addLayout(apply_all_layout)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def set_all_overwrite_choices(self, value: str):
+        for editor in self.editors:
+            if isinstance(editor, QComboBox):
+                editor.setCurrentIndex(editor.findData(value))
+
+    def apply_answers(self):
+        """Copy the choices into the prompts' `answer` attributes."""
+        for prompt, editor in zip(self.prompts, self.editors):
+            if isinstance(editor, QComboBox):
+                prompt.answer = editor.currentData()
+            else:
+                prompt.answer = editor.text() or None
@@ -0,0 +1,169 @@
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+import mmap
+import os
+import struct
+import threading
+import xml.etree.ElementTree as ElementTree
+import zipfile
+import zlib
+
+from EncryptionProbe import compound_file_streams
+
+_OLE_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+_ZIP_SIGNATURES = (b"PK\x03\x04", b"PK\x05\x06")
+_OFFICE_DOCUMENT = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+_CONTENT_TYPES = "{http://schemas.openxmlformats.org/package/2006/content-types}"
+
+# Files Word cannot open at all; text formats (RTF, HTML, XML, plain text) are left to Word
+_FOREIGN_SIGNATURES = (
+    (b"%PDF", "a PDF"),
+    (b"\x89PNG", "a PNG image"),
+    (b"\xff\xd8\xff", "a JPEG image"),
+    (b"GIF8", "a GIF image"),
+    (b"MZ", "a program"),
+    (b"Rar!", "a RAR archive"),
+    (b"7z\xbc\xaf\x27\x1c", "a 7-Zip archive"),
+    (b"\x1f\x8b", "a gzip archive"),
+)
+_PACKAGE_KINDS = (
+    ("spreadsheetml", "an Excel workbook"),
+    ("presentationml", "a PowerPoint presentation"),
+)
+_OLE_FOREIGN_STREAMS = (
+    ("Workbook", "an Excel workbook"),
+    ("Book", "an Excel workbook"),
+    ("PowerPoint Document", "a PowerPoint presentation"),
+)
+
+
+def validate_document(path: str):
+    """Return why `path` cannot be converted by Word, or None if it may be.
+
+    Rejects Office lock files (~$name.docx), empty files, known non-Word
+    formats, zip packages whose central directory is damaged or that lack
+    the OOXML parts of a Word document, and OLE files without a Word
+    stream. Only headers and directories are read, never whole documents.
+    """
+    if os.path.basename(path).startswith("~$"):
+        return "Office lock file, not a document"
+    try:
+        if os.path.getsize(path) == 0:
+            return "empty file"
+        with open(path, "rb") as f:
+            header = f.read(8)
+            if header.startswith(_ZIP_SIGNATURES):
+                return _validate_package(f)
+            if header == _OLE_SIGNATURE:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    return _validate_compound_file(data)
+    except OSError as e:
+        return f"cannot be read: {e.strerror or e}"
+
+    for signature, kind in _FOREIGN_SIGNATURES:
+        if header.startswith(signature):
+            return f"not a Word document but {kind}"
+    return None
+
+
+def _validate_package(f):
+    try:
+        with zipfile.ZipFile(f) as package:
+            names = set(package.namelist())
+            if "[Content_Types].xml" not in names or "_rels/.rels" not in names:
+                return "not a Word document but a plain zip archive"
+            relationships = ElementTree.fromstring(package.read("_rels/.rels"))
+            targets = [rel.get("Target", "") for rel in relationships if rel.get("Type") == _OFFICE_DOCUMENT]
+            if not targets:
+                return "Office package without a main document"
+            main_part = targets[0].lstrip("/")
+            if main_part not in names:
+                return f"damaged package, {main_part} is missing"
+            content_type = _content_type(ElementTree.fromstring(package.read("[Content_Types].xml")), main_part)
+            if "wordprocessingml" not in content_type and "ms-word" not in content_type:
+                for marker, kind in _PACKAGE_KINDS:
+                    if marker in content_type:
+                        return f"not a Word document but {kind}"
+                return "not a Word document but another kind of Office package"
+            with package.open(main_part):
+                pass  # Reads the part's local header
+    except (zipfile.BadZipFile, zlib.error):
+        return "damaged or truncated zip package"
+    except (ElementTree.ParseError, KeyError, NotImplementedError, RuntimeError, EOFError) as e:
+        return f"damaged package: {e}"
+    return None
+
+
+def _content_type(types, part: str) -> str:
+    for override in types.iter(f"{_CONTENT_TYPES}Override"):
+        if override.get("PartName", "").lstrip("/") == part:
+            return override.get("ContentType", "")
+    extension = part.rsplit(".", 1)[-1].lower()
+    for default in types.iter(f"{_CONTENT_TYPES}Default"):
+        if default.get("Extension", "").lower() == extension:
+            return default.get("ContentType", "")
+    return ""
+
+
+def _validate_compound_file(data):
+    try:
+        streams = compound_file_streams(data)
+    except (ValueError, struct.error):
+        return "damaged or truncated OLE file"
+    if "EncryptionInfo" in streams and "EncryptedPackage" in streams:
+        return None  # A password-protected .docx
+    if "WordDocument" in streams:
+        if streams["WordDocument"][1] > len(data):
+            return "truncated Word document"
+        return None
+    for stream, kind in _OLE_FOREIGN_STREAMS:
+        if stream in streams:
+            return f"not a Word document but {kind}"
+    return "not a Word document but another kind of OLE file"
+
+
+class PreflightChecker:
+    """Validates queued files on a thread pool, ahead of the conversion.
+
+    submit() starts checking a file and result() waits for its verdict.
+    A rejected file is reported through `on_rejected(index, reason)` from
+    the checking thread as soon as it is found, before result() returns,
+    so bad files show up while Word is still busy with earlier ones.
+    """
+
+    # The checks are mostly Python code holding the GIL; more threads only
+    # help on slow shares and take time from the UI thread.
+    def __init__(self, on_rejected, max_workers=2):
+        self.on_rejected = on_rejected
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="preflight")
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def submit(self, index: int, path: str):
+        future = self._executor.submit(self._check, index, path)
+        with self._lock:
+            self._futures[index] = future
+
+    def _check(self, index: int, path: str):
+        try:
+            reason = validate_document(path)
+        except Exception as e:
+            # Whatever the file does to the checks, it must only cost that file
+            reason = f"could not be checked: {e}"
+        if reason is not None:
+            self.on_rejected(index, reason)
+        return reason
+
+    def result(self, index: int):
+        """The reason file `index` was rejected, or None if it may be converted."""
+        with self._lock:
+            future = self._futures.pop(index, None)
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except CancelledError:
+            return None
+
+    def shutdown(self):
+        """Drop the checks not yet started and wait for the running ones."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
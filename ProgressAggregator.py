@@ -0,0 +1,76 @@
+import threading
+
+
+class ProgressAggregator:
+    """Coalesces progress events and delivers them at most every `interval` seconds.
+
+    Producers call set_progress(), set_status() and add_result() from any
+    thread; only the latest percentage and status text are kept, while results
+    accumulate in order. A background thread hands whatever changed to
+    `deliver(percent, status, results)` once per interval. `percent` and
+    `status` are None when they did not change, and `results` is a list that
+    may be empty. flush() delivers immediately, so the final state is never held
+    back. With `interval` 0 every event is delivered as it happens.
+    """
+
+    def __init__(self, deliver, interval=0.1):
+        self.deliver = deliver
+        self.interval = interval
+        self._percent = None
+        self._status = None
+        self._results = []
+        self._dirty = False
+        self._lock = threading.Lock()  # Guards the pending state
+        self._deliver_lock = threading.Lock()  # Keeps deliveries in order
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self.interval > 0 and self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="progress-aggregator", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background thread and deliver what is still pending."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def set_progress(self, percent: int):
+        with self._lock:
+            self._percent = percent
+            self._dirty = True
+        self._deliver_now_if_unbuffered()
+
+    def set_status(self, text: str):
+        with self._lock:
+            self._status = text
+            self._dirty = True
+        self._deliver_now_if_unbuffered()
+
+    def add_result(self, result):
+        with self._lock:
+            self._results.append(result)
+            self._dirty = True
+        self._deliver_now_if_unbuffered()
+
+    def flush(self):
+        with self._deliver_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                percent, status, results = self._percent, self._status, self._results
+                self._percent, self._status, self._results = None, None, []
+                self._dirty = False
+            self.deliver(percent, status, results)
+
+    def _deliver_now_if_unbuffered(self):
+        if self.interval <= 0:
+            self.flush()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.flush()
@@ -0,0 +1,201 @@
+import os
+import time
+
+from BatchRunner import BatchRunner, BatchFatalError
+from ConversionEngine import FileResult
+from CostEstimator import ScheduledQueue
+from DocumentWatchdog import CANCELLED, TIMED_OUT
+from JobServer import JobClient, JobServerError
+
+
+class RemoteBatchRunner(BatchRunner):
+    """Plans the batch here and has the agents of a JobServer convert it.
+
+    Preflight, the cache, output planning, overwrite and password policies
+    and the journal work as in BatchRunner; only the conversions run on
+    whichever machines run a JobAgent for the server at `server_url`.
+    Results stream back per file. Paths are sent as absolute paths, so
+    documents and the output folder must be reachable under the same names
+    by every agent (a UNC share); local staging is therefore not used.
+
+    Each agent applies its own time limit per document. After stop(), the
+    files still queued are withdrawn and agents get `cancel_timeout`
+    seconds to report the ones they hold.
+    """
+
+    POLL_INTERVAL = 0.5  # seconds to wait for results before checking for new files
+    SUBMIT_BATCH = 50  # planned files sent to the server in one request while planning
+
+    def __init__(self, input_paths, output_dir=None, default_password=None, backend_factory=None,
+                 cache=None, listener=None, input_open=False, overwrite_policy="ask", password_policy="ask",
+                 journal=None, metrics=None, recycle_after=None, max_memory_bytes=None, preflight=True,
+                 schedule="order", cost_estimator=None, revision_scanner=None, document_timeout=None,
+                 cancel_timeout=5.0, export_profile=None, prefetch=0, staging_max_bytes=2 * 1024 ** 3,
+                 server_url=None, client=None):
+        super().__init__(input_paths, output_dir, default_password, backend_factory, cache, listener,
+                         input_open, overwrite_policy, password_policy, journal, metrics,
+                         recycle_after, max_memory_bytes, preflight, schedule, cost_estimator,
+                         revision_scanner, document_timeout, cancel_timeout, export_profile, 0,
+                         staging_max_bytes)
+        if client is None:
+            if not server_url:
+                raise ValueError("RemoteBatchRunner needs a server_url or a client")
+            client = JobClient(server_url)
+        self.client = client
+        self._pending = ScheduledQueue(schedule)
+        self._outstanding = {}  # file index -> task submitted and not yet reported
+        self._leased = set()  # outstanding files an agent is working on
+        self._batch_id = None
+        self._next_event = 0
+        self._timings = {}
+        self._agents = set()
+        self._completed = 0
+
+    def run(self) -> str:
+        if not self.wait_for_input(0):
+            return "No files were selected to process."
+
+        self.export_settings = self.backend_factory().export_settings(self.export_profile)
+        self.begin_journal()
+        self.plan_outputs()
+        self.start_preflight()
+
+        fatal_message = None
+        try:
+            self.listener.on_status(f"Submitting the batch to the job server at {self.client.url}...")
+            self._batch_id = self.client.submit()
+
+            i = 0
+            while self._is_running:
+                if not self.wait_for_input(i, timeout=0):
+                    if not self._input_open:
+                        break
+                    self._pump(block=True)
+                    continue
+
+                if not self.preflight_rejected(i):
+                    try:
+                        task = self.plan_file(i, self.input_paths[i])
+                        if task is not None:
+                            self._pending.push(task, self.estimate_cost(i))
+                    except Exception as e:
+                        self.finish_file(i, f"❌ Error: {str(e)}", False)
+
+                i += 1
+                if len(self._pending) >= self.SUBMIT_BATCH:
+                    self._pump(block=False)
+
+            while self._is_running and (self._pending or self._outstanding):
+                self._pump(block=True)
+
+            while self._is_running and self.pending_prompts:
+                for task in self.resolve_prompts():
+                    self._pending.push(task, self.estimate_cost(task[0]))
+                while self._is_running and (self._pending or self._outstanding):
+                    self._pump(block=True)
+
+            if self._outstanding:
+                # After a stop, withdraw the queued files and give agents a while for the ones they hold
+                self._pending.clear()
+                self.client.cancel(self._batch_id)
+                self._pump(block=False)  # Every lease taken before the cancel is among these events
+                self._cancel_files([index for index in self._outstanding if index not in self._leased])
+                cancel_deadline = time.monotonic() + self.cancel_timeout
+                while self._outstanding and time.monotonic() < cancel_deadline:
+                    self._pump(block=True)
+                self._cancel_files(list(self._outstanding))
+            self.resolve_prompts()  # Report files still parked as skipped
+
+        except JobServerError as e:
+            fatal_message = str(e)
+
+        finally:
+            self.stop_preflight()
+            if self._batch_id is not None:
+                try:
+                    self.client.close_batch(self._batch_id)
+                except JobServerError:
+                    pass  # The server went away; it forgets the batch with it
+            if self.metrics:
+                self.metrics.finish()
+
+        if fatal_message:
+            message = f"A fatal error occurred: {fatal_message}"
+            self.end_journal(message)
+            raise BatchFatalError(message)
+
+        self.listener.on_progress(100)
+        summary = self.summary(
+            f"Batch complete. {self.success_count} of {len(self.input_paths)} files converted successfully "
+            f"by {len(self._agents)} conversion agents."
+        )
+        self.end_journal(summary)
+        return summary
+
+    def _pump(self, block: bool):
+        """Submit the planned files, then process the results reported so far."""
+        messages = []
+        while self._pending:
+            task = self._pending.pop()
+            index, input_path, output_path, passwords, _ = task
+            self._outstanding[index] = task
+            messages.append([index, os.path.abspath(input_path), os.path.abspath(output_path), passwords,
+                             self.revision_scans.get(index), self.export_profile.name])
+        if messages:
+            self.client.add_tasks(self._batch_id, messages)
+
+        events, self._next_event = self.client.events(
+            self._batch_id, self._next_event, self.POLL_INTERVAL if block else 0
+        )
+        for event in events:
+            self._handle_event(*event)
+
+    def _handle_event(self, kind, agent, index, payload):
+        task = self._outstanding.get(index)
+        if task is None:
+            return  # Already finished, e.g. cancelled
+        if kind == "leased":
+            self._leased.add(index)
+            self.listener.on_status(f"{os.path.basename(task[1])} is converting on {agent}")
+            return
+        if kind == "requeued":
+            self._leased.discard(index)
+            self.listener.on_status(f"Lost {agent}; {os.path.basename(task[1])} goes to another agent")
+            return
+        if kind == "timings":
+            self._timings[index] = payload
+            return
+        if kind == "stage":
+            self.record_stage(index, payload)
+            return
+
+        del self._outstanding[index]
+        self._leased.discard(index)
+        self._agents.add(agent)
+        timings = self._timings.pop(index, {})
+        self.record_file_timings(task, timings, kind == "converted")
+        if kind == "converted":
+            result = FileResult(**payload)
+            _, _, output_path, _, digest = task
+            self.record_open_tier(result.open_tier, timings.get("open", 0.0))
+            self.complete_file(index, output_path, digest, result)
+        elif kind == "expired":
+            message = f"⏱ Timed out on {agent}" if payload == TIMED_OUT else self.expired_message(payload)
+            self.finish_file(index, message, False)
+        elif kind == "error":
+            self.finish_file(index, f"❌ Error: {payload}", False)
+        elif kind == "password":
+            self.handle_password_required(task, payload)
+
+    def _cancel_files(self, indices):
+        for index in indices:
+            del self._outstanding[index]
+            self._leased.discard(index)
+            self.finish_file(index, self.expired_message(CANCELLED), False)
+
+    def finish_file(self, index: int, message: str, success: bool, skipped: bool = False):
+        with self._finish_lock:
+            super().finish_file(index, message, success, skipped)
+            self._completed += 1
+            self.listener.on_progress(int((self._completed / len(self.input_paths)) * 100))
+            self.listener.on_status(f"Processed {self._completed}/{self.total_label()} files on the job server.")
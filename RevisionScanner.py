@@ -0,0 +1,93 @@
+from collections import OrderedDict
+import os
+import re
+import threading
+import zipfile
+import zlib
+
+# Every kind of tracked change Word lists in Document.Revisions: insertions,
+# deletions, moves, table cell changes and property ("...Change") changes.
+_REVISION_MARKUP = re.compile(
+    rb"<(?:[A-Za-z_][\w.-]*:)?(?:ins|del|moveFrom|moveTo|cellIns|cellDel|cellMerge|[a-zA-Z]+Change)[\s/>]"
+)
+_STORY_PARTS = re.compile(r"word/(?:document|header\d*|footer\d*|footnotes|endnotes|comments)\.xml")
+_CHUNK_SIZE = 64 * 1024
+_OVERLAP = 64  # Longer than any revision tag, so tags across chunk borders are found
+
+
+def scan_for_revisions(path: str):
+    """True if a .docx contains tracked changes, False if it does not, None
+    if that cannot be told without Word (legacy .doc, encrypted, damaged).
+
+    The main document, headers, footers, footnotes, endnotes and comments
+    are decompressed in chunks and searched for revision markup, so memory
+    use does not grow with the document.
+    """
+    try:
+        with zipfile.ZipFile(path) as package:
+            for name in package.namelist():
+                if _STORY_PARTS.fullmatch(name) and _part_has_revisions(package, name):
+                    return True
+    except (OSError, zipfile.BadZipFile, zlib.error, NotImplementedError, RuntimeError, EOFError):
+        return None  # Word counts the revisions itself, and may still repair the file
+    return False
+
+
+def _part_has_revisions(package, name: str) -> bool:
+    tail = b""
+    with package.open(name) as part:
+        for chunk in iter(lambda: part.read(_CHUNK_SIZE), b""):
+            if _REVISION_MARKUP.search(tail + chunk):
+                return True
+            tail = chunk[-_OVERLAP:]
+    return False
+
+
+class RevisionScanner:
+    """scan_for_revisions() with results remembered per document.
+
+    Results are keyed by content hash when the caller has one (the
+    conversion cache computes it anyway), otherwise by path, size and
+    modification time, which costs one stat. The same document converted
+    again (a later batch, a watched folder, a copy under another name when
+    hashed) is not scanned again. At most `max_entries` results are kept,
+    least recently used first out.
+    """
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._results = OrderedDict()  # digest or (path, size, mtime) -> True / False / None
+        self._lock = threading.Lock()
+
+    def scan(self, path: str, digest=None, source_path=None):
+        """Scan `path`; `source_path` is the file it is a local copy of, if any,
+        which identifies the document when there is no digest."""
+        key = digest or _stat_key(source_path or path)
+        if key is None:
+            return scan_for_revisions(path)
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._results[key]
+        result = scan_for_revisions(path)
+        with self._lock:
+            self._results[key] = result
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+        return result
+
+
+def _stat_key(path: str):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return os.path.normcase(os.path.abspath(path)), stat.st_size, stat.st_mtime_ns
+
+
+_shared_scanner = RevisionScanner()
+
+
+def shared_revision_scanner() -> RevisionScanner:
+    """The scanner all batches of this process share."""
+    return _shared_scanner
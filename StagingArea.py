@@ -0,0 +1,160 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+import shutil
+import tempfile
+import threading
+
+
+class StagingArea:
+    """Local copies of documents on slow shares, made ahead of Word.
+
+    prefetch() copies upcoming inputs into a local temporary folder on
+    background threads while the current document converts; input_path()
+    hands Word the local copy once it is there (or the original path if it
+    could not be staged). PDFs are written to output_path() locally and
+    publish() moves them to their real destination in the background:
+    copied next to it under a temporary name, then renamed over it, so
+    readers never see half a PDF.
+
+    Staged inputs and PDFs not yet moved together use at most `max_bytes`:
+    prefetching skips files that do not fit (until a later call finds room),
+    and publish() waits while moves are behind.
+    """
+
+    def __init__(self, prefetch=2, max_bytes=2 * 1024 ** 3, directory=None, copy_threads=2):
+        self.prefetch_depth = prefetch
+        self.max_bytes = max_bytes
+        self.root = tempfile.mkdtemp(prefix="word-to-pdf-staging-", dir=directory)
+        self.staged_bytes = 0
+        self._inputs = {}  # file index -> (future of the local path or None, bytes reserved)
+        self._outputs = {}  # file index -> local PDF path
+        self._copier = ThreadPoolExecutor(copy_threads, thread_name_prefix="staging-copy")
+        self._mover = ThreadPoolExecutor(1, thread_name_prefix="staging-move")
+        self._moves = 0
+        self._space_freed = threading.Condition()
+        self._callback_error = None  # First exception raised by a publish() callback, re-raised by close()
+
+    def prefetch(self, index: int, path: str):
+        """Start copying file `index` unless it is staged already or does not fit."""
+        with self._space_freed:
+            if index in self._inputs:
+                return
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                return  # Word reads it from the share, and reports the error
+            if self.staged_bytes + size > self.max_bytes:
+                return  # Not now; tried again if it is prefetched once space is freed
+            self.staged_bytes += size
+            self._inputs[index] = (self._copier.submit(self._copy_in, index, path), size)
+
+    def _copy_in(self, index: int, path: str):
+        folder = os.path.join(self.root, "in", str(index))
+        os.makedirs(folder, exist_ok=True)
+        local_path = os.path.join(folder, os.path.basename(path))
+        shutil.copyfile(path, local_path)
+        return local_path
+
+    def input_path(self, index: int, path: str) -> str:
+        """The local copy of file `index`, waiting for it if it is being copied.
+        Starts the copy if it was not prefetched; `path` if it does not fit."""
+        self.prefetch(index, path)
+        return self.staged_input(index, path)
+
+    def staged_input(self, index: int, path: str) -> str:
+        """Like input_path(), but never starts a copy: `path` unless file
+        `index` was prefetched."""
+        with self._space_freed:
+            future, _ = self._inputs.get(index, (None, 0))
+        if future is None:
+            return path
+        try:
+            return future.result()
+        except OSError:
+            return path
+
+    def release_input(self, index: int):
+        """Delete file `index`'s local copy once Word is done with it."""
+        with self._space_freed:
+            future, size = self._inputs.pop(index, (None, 0))
+        if future is not None:
+            future.cancel()
+            try:
+                local_path = future.result()
+            except Exception:
+                local_path = None
+            if local_path:
+                _remove(local_path)
+        self._free(size)
+
+    def output_path(self, index: int, output_path: str) -> str:
+        """Where Word writes file `index`'s PDF before it is published."""
+        folder = os.path.join(self.root, "out", str(index))
+        os.makedirs(folder, exist_ok=True)
+        self._outputs[index] = os.path.join(folder, os.path.basename(output_path))
+        return self._outputs[index]
+
+    def local_output(self, index: int):
+        """File `index`'s local PDF path while it is not yet published, else None."""
+        return self._outputs.get(index)
+
+    def publish(self, index: int, output_path: str, on_done):
+        """Move file `index`'s PDF to `output_path` in the background, then
+        call `on_done(error)` from the mover's thread (error is None on success)."""
+        local_path = self._outputs.pop(index)
+        try:
+            size = os.path.getsize(local_path)
+        except OSError:
+            size = 0
+        with self._space_freed:
+            self._space_freed.wait_for(lambda: self._moves == 0 or self.staged_bytes + size <= self.max_bytes)
+            self.staged_bytes += size
+            self._moves += 1
+        self._mover.submit(self._move_out, local_path, output_path, size, on_done)
+
+    def discard_output(self, index: int):
+        local_path = self._outputs.pop(index, None)
+        if local_path:
+            _remove(local_path)
+
+    def _move_out(self, local_path: str, output_path: str, size: int, on_done):
+        partial_path = f"{output_path}.partial"
+        error = None
+        try:
+            shutil.copyfile(local_path, partial_path)
+            os.replace(partial_path, output_path)
+        except OSError as e:
+            error = e
+            _remove(partial_path)
+        finally:
+            _remove(local_path)
+            with self._space_freed:
+                self._moves -= 1
+            self._free(size)
+        try:
+            on_done(error)
+        except Exception as e:
+            # The executor would swallow it and the file would never be reported
+            with self._space_freed:
+                self._callback_error = self._callback_error or e
+
+    def _free(self, size: int):
+        with self._space_freed:
+            self.staged_bytes -= size
+            self._space_freed.notify_all()
+
+    def close(self):
+        """Finish the pending moves and delete the staging folder. Raises the
+        first exception a publish() callback raised, if any."""
+        self._copier.shutdown(wait=True, cancel_futures=True)
+        self._mover.shutdown(wait=True)
+        shutil.rmtree(self.root, ignore_errors=True)
+        if self._callback_error is not None:
+            raise self._callback_error
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -5,27 +5,56 @@ from PyQt6.QtWidgets import (
     QLabel,
     QHBoxLayout,
     QPushButton,
-    QListWidget,
+    QListView,
+    QAbstractItemView,
     QLineEdit,
     QProgressBar,
     QMessageBox,
     QFileDialog,
-    QInputDialog,
     QFrame,
+    QSpinBox,
+    QCheckBox,
+    QComboBox,
+    QDialog,
 )
 
-from PyQt6.QtCore import Qt, QThread, QObject
-from PyQt6.QtGui import QColor, QFont
-from typing import Type
+from PyQt6.QtCore import QThread, QObject, QDir
+from PyQt6.QtGui import QFont
+from typing import Callable, Optional, Type
+
+from BatchJournal import BatchJournal
+from ConversionCache import ConversionCache
+from ConversionMetrics import BatchMetrics
+from ExportProfile import DEFAULT_EXPORT_PROFILE, EXPORT_PROFILES
+from FolderScanWorker import FolderScanWorker
+from FileListModel import FileListModel
+from OutputPlan import plan_outputs
+from OutputPlanDialog import OutputPlanDialog
+from PendingPromptsDialog import PendingPromptsDialog
+from WorkerPool import WorkerPool
 
 import qtawesome as qta
 import os
 import sys
+import time
 
 class WordToPdfConverter(QMainWindow):
-    def __init__(self, converter_worker: Type[QObject]):
+    def __init__(
+        self,
+        converter_worker: Type[QObject],
+        backend_factory: Optional[Callable] = None,
+        pool_worker: Optional[Type[QObject]] = None,
+        metrics_dir: Optional[str] = None,
+        remote_worker: Optional[Type[QObject]] = None,
+    ):
         super().__init__()
         self.converter_worker = converter_worker
+        self.backend_factory = backend_factory
+        self.pool_worker = pool_worker  # Used when more than one Word instance is requested
+        self.remote_worker = remote_worker  # Used when a job server is given
+        self.metrics_dir = metrics_dir  # Per-batch timing reports are written here when set
+        self.metrics = None
+        self.worker_pool = None  # Word instances kept running between batches
         self.setWindowIcon(qta.icon("fa5s.file-pdf", color="#f44336"))
         self.setWindowTitle("Batch Word to PDF Converter")
         self.setGeometry(100, 100, 700, 600)
@@ -61,17 +90,29 @@ class WordToPdfConverter(QMainWindow):
         button_layout = QHBoxLayout()
         self.add_button = QPushButton("Add Files")
         self.add_button.setIcon(qta.icon("fa5s.folder-open", color="white"))
+        self.add_folder_button = QPushButton("Add Folder (recursive)")
+        self.add_folder_button.setIcon(qta.icon("fa5s.folder-plus", color="white"))
         self.clear_button = QPushButton("Clear List")
         self.clear_button.setIcon(qta.icon("fa5s.trash", color="white"))
         self.clear_button.setObjectName("danger")
+        self.resume_button = QPushButton("Resume Last Batch")
+        self.resume_button.setIcon(qta.icon("fa5s.redo", color="white"))
+        self.retry_failed_button = QPushButton("Retry Failed")
+        self.retry_failed_button.setIcon(qta.icon("fa5s.sync", color="white"))
         button_layout.addWidget(self.add_button)
+        button_layout.addWidget(self.add_folder_button)
         button_layout.addWidget(self.clear_button)
+        button_layout.addWidget(self.resume_button)
+        button_layout.addWidget(self.retry_failed_button)
         button_layout.addStretch()
         step1_layout.addLayout(button_layout)
         
-        self.file_list_widget = QListWidget()
-        self.file_list_widget.setSelectionMode(QListWidget.SelectionMode.ExtendedSelection)
-        step1_layout.addWidget(self.file_list_widget)
+        self.file_list_model = FileListModel(self)
+        self.file_list_view = QListView()
+        self.file_list_view.setModel(self.file_list_model)
+        self.file_list_view.setUniformItemSizes(True)  # Lets the view skip measuring every row
+        self.file_list_view.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        step1_layout.addWidget(self.file_list_view)
         
         self.main_layout.addWidget(step1_frame)
 
@@ -139,13 +180,134 @@ class WordToPdfConverter(QMainWindow):
         step4_label = QLabel("4. Start conversion")
         step4_label.setStyleSheet("font-weight: bold;")
         step4_layout.addWidget(step4_label)
+
+        if self.pool_worker is not None:
+            pool_layout = QHBoxLayout()
+            pool_label = QLabel("Parallel Word instances:")
+            self.pool_size_spin = QSpinBox()
+            self.pool_size_spin.setRange(1, max(1, os.cpu_count() or 1))
+            self.pool_size_spin.setValue(1)
+            pool_layout.addWidget(pool_label)
+            pool_layout.addWidget(self.pool_size_spin)
+            self.keep_word_checkbox = QCheckBox("Keep Word running between batches")
+            self.keep_word_checkbox.setChecked(True)
+            pool_layout.addWidget(self.keep_word_checkbox)
+            pool_layout.addStretch()
+            step4_layout.addLayout(pool_layout)
+
+            # Word leaks memory over long runs; a fresh instance is cheap by comparison
+            recycle_layout = QHBoxLayout()
+            recycle_layout.addWidget(QLabel("Restart Word after"))
+            self.recycle_after_spin = QSpinBox()
+            self.recycle_after_spin.setRange(0, 100000)
+            self.recycle_after_spin.setValue(200)
+            self.recycle_after_spin.setSpecialValueText("never")
+            self.recycle_after_spin.setSuffix(" documents")
+            recycle_layout.addWidget(self.recycle_after_spin)
+            recycle_layout.addWidget(QLabel("or above"))
+            self.recycle_memory_spin = QSpinBox()
+            self.recycle_memory_spin.setRange(0, 64 * 1024)
+            self.recycle_memory_spin.setValue(1024)
+            self.recycle_memory_spin.setSingleStep(128)
+            self.recycle_memory_spin.setSpecialValueText("no memory limit")
+            self.recycle_memory_spin.setSuffix(" MB")
+            recycle_layout.addWidget(self.recycle_memory_spin)
+            recycle_layout.addStretch()
+            step4_layout.addLayout(recycle_layout)
+        else:
+            self.pool_size_spin = None
+            self.keep_word_checkbox = None
+            self.recycle_after_spin = None
+            self.recycle_memory_spin = None
+
+        if self.remote_worker is not None:
+            server_layout = QHBoxLayout()
+            server_layout.addWidget(QLabel("Job server:"))
+            self.server_url_edit = QLineEdit()
+            self.server_url_edit.setPlaceholderText("Convert on this computer")
+            self.server_url_edit.setToolTip("Send the batch to a job server (e.g. http://host:8765); "
+                                            "the conversion agents connected to it convert the files. A server "
+                                            "that needs a token reads it from WORD_TO_PDF_JOB_TOKEN")
+            server_layout.addWidget(self.server_url_edit)
+            step4_layout.addLayout(server_layout)
+        else:
+            self.server_url_edit = None
         
+        self.cache_checkbox = QCheckBox("Reuse PDFs of unchanged documents (conversion cache)")
+        step4_layout.addWidget(self.cache_checkbox)
+
+        self.journal_checkbox = QCheckBox("Keep a journal so an interrupted batch can be resumed")
+        self.journal_checkbox.setChecked(True)
+        step4_layout.addWidget(self.journal_checkbox)
+
+        # Files that need an answer never stop the batch; they are decided by these
+        # policies or parked and asked about together at the end.
+        policy_layout = QHBoxLayout()
+        policy_layout.addWidget(QLabel("If a PDF already exists:"))
+        self.overwrite_policy_combo = QComboBox()
+        self.overwrite_policy_combo.addItem("Ask at the end", "ask")
+        self.overwrite_policy_combo.addItem("Skip", "skip")
+        self.overwrite_policy_combo.addItem("Overwrite", "overwrite")
+        self.overwrite_policy_combo.addItem("Keep both (rename)", "rename")
+        self.overwrite_policy_combo.addItem("Overwrite if the Word file is newer", "newer")
+        policy_layout.addWidget(self.overwrite_policy_combo)
+        policy_layout.addWidget(QLabel("If a password is needed:"))
+        self.password_policy_combo = QComboBox()
+        self.password_policy_combo.addItem("Ask at the end", "ask")
+        self.password_policy_combo.addItem("Skip", "skip")
+        policy_layout.addWidget(self.password_policy_combo)
+        policy_layout.addStretch()
+        step4_layout.addLayout(policy_layout)
+
+        schedule_layout = QHBoxLayout()
+        schedule_layout.addWidget(QLabel("Conversion order:"))
+        self.schedule_combo = QComboBox()
+        self.schedule_combo.addItem("As listed", "order")
+        self.schedule_combo.addItem("Longest documents first (finishes the batch soonest)", "longest")
+        self.schedule_combo.addItem("Shortest documents first (first PDFs soonest)", "shortest")
+        schedule_layout.addWidget(self.schedule_combo)
+        schedule_layout.addWidget(QLabel("Time limit per document:"))
+        self.document_timeout_spin = QSpinBox()
+        self.document_timeout_spin.setRange(0, 3600)
+        self.document_timeout_spin.setValue(300)
+        self.document_timeout_spin.setSuffix(" s")
+        self.document_timeout_spin.setSpecialValueText("none")
+        self.document_timeout_spin.setToolTip("Word is restarted when a document takes longer than this")
+        schedule_layout.addWidget(self.document_timeout_spin)
+        schedule_layout.addWidget(QLabel("Copy ahead:"))
+        self.prefetch_spin = QSpinBox()
+        self.prefetch_spin.setRange(0, 16)
+        self.prefetch_spin.setSuffix(" files")
+        self.prefetch_spin.setSpecialValueText("off")
+        self.prefetch_spin.setToolTip("Copy upcoming documents to this computer while Word converts, "
+                                      "and write PDFs locally first; helps with slow network folders")
+        schedule_layout.addWidget(self.prefetch_spin)
+        schedule_layout.addStretch()
+        step4_layout.addLayout(schedule_layout)
+
+        profile_layout = QHBoxLayout()
+        profile_layout.addWidget(QLabel("PDF export profile:"))
+        self.export_profile_combo = QComboBox()
+        for profile in EXPORT_PROFILES.values():
+            self.export_profile_combo.addItem(profile.label, profile.name)
+        self.export_profile_combo.setCurrentIndex(self.export_profile_combo.findData(DEFAULT_EXPORT_PROFILE))
+        profile_layout.addWidget(self.export_profile_combo)
+        profile_layout.addStretch()
+        step4_layout.addLayout(profile_layout)
+
         self.convert_button = QPushButton("Convert All to PDF")
         self.convert_button.setIcon(qta.icon("fa5s.file-export", color="white"))
         self.convert_button.setEnabled(False)
         self.convert_button.setObjectName("convert-btn")
         
-        step4_layout.addWidget(self.convert_button)
+        self.preview_button = QPushButton("Preview Output")
+        self.preview_button.setIcon(qta.icon("fa5s.list", color="white"))
+        self.preview_button.setEnabled(False)
+
+        convert_layout = QHBoxLayout()
+        convert_layout.addWidget(self.preview_button)
+        convert_layout.addWidget(self.convert_button, 1)
+        step4_layout.addLayout(convert_layout)
 
         # Progress area
         progress_frame = QFrame()
@@ -171,14 +333,30 @@ class WordToPdfConverter(QMainWindow):
 
         # --- Connect Signals ---
         self.add_button.clicked.connect(self.add_files)
+        self.add_folder_button.clicked.connect(self.add_folder)
         self.clear_button.clicked.connect(self.clear_list)
         self.output_dir_button.clicked.connect(self.select_output_folder)
         self.set_password_button.clicked.connect(self.set_default_password)
         self.convert_button.clicked.connect(self.start_conversion)
+        self.preview_button.clicked.connect(self.preview_output)
         self.open_destination_loc.clicked.connect(self.open_destination_folder)
+        self.resume_button.clicked.connect(lambda: self.load_from_journal(failed_only=False))
+        self.retry_failed_button.clicked.connect(lambda: self.load_from_journal(failed_only=True))
 
         self.thread = None
         self.worker = None
+        self.processing = False
+        self.folder_scans = []  # (QThread, FolderScanWorker) pairs, kept alive until their thread ends
+        self.active_scans = 0
+
+        try:
+            self.journal = BatchJournal()
+        except OSError:
+            self.journal = None
+            self.journal_checkbox.setChecked(False)
+            self.journal_checkbox.setEnabled(False)
+            self.resume_button.setEnabled(False)
+            self.retry_failed_button.setEnabled(False)
 
         self.apply_styles()
 
@@ -221,11 +399,76 @@ class WordToPdfConverter(QMainWindow):
     def add_files(self):
         file_paths, _ = QFileDialog.getOpenFileNames(self, "Select Word Documents", "", "Word Files (*.doc *.docx)")
         if file_paths:
-            for path in file_paths:
-                if not self.file_list_widget.findItems(path, Qt.MatchFlag.MatchExactly):
-                    self.file_list_widget.addItem(path)
+            self.file_list_model.add_paths(file_paths)
             self.update_ui_state()
 
+    def add_folder(self):
+        folder_path = QFileDialog.getExistingDirectory(self, "Select Folder with Word Documents")
+        if not folder_path:
+            return
+
+        scan_thread = QThread()
+        scanner = FolderScanWorker(folder_path)
+        scanner.moveToThread(scan_thread)
+        scan_thread.started.connect(scanner.run)
+        scanner.files_found.connect(self.on_files_found)
+        scanner.scan_finished.connect(self.on_scan_finished)
+        scanner.scan_finished.connect(scan_thread.quit)
+        scan_thread.finished.connect(self.forget_folder_scan)
+
+        self.folder_scans.append((scan_thread, scanner))
+        self.active_scans += 1
+        self.statusBar().showMessage(f"Scanning {folder_path}...")
+        scan_thread.start()
+
+    def on_files_found(self, paths: list):
+        added = self.file_list_model.add_paths(paths)
+        if not added:
+            return
+        if self.processing:
+            # Feed the running batch; row numbers and worker indices stay aligned
+            self.worker.add_paths(added)
+        else:
+            self.update_ui_state()
+
+    def on_scan_finished(self, count: int):
+        self.active_scans -= 1
+        self.statusBar().showMessage(f"Folder scan finished: {count} Word files found.", 5000)
+        if not self.active_scans and self.processing:
+            self.worker.close_input()
+
+    def forget_folder_scan(self):
+        scan_thread = self.sender()
+        self.folder_scans = [scan for scan in self.folder_scans if scan[0] is not scan_thread]
+
+    def stop_folder_scans(self):
+        for _, scanner in self.folder_scans:
+            scanner.stop()
+
+    def load_from_journal(self, failed_only: bool):
+        """Queue the files of the last journaled batch that still need converting."""
+        batch = self.journal.last_batch() if self.journal else None
+        if batch is None:
+            QMessageBox.information(self, "Batch Journal", "No previous batch was recorded.")
+            return
+
+        if failed_only:
+            paths = self.journal.failed_paths(batch.batch_id)
+        else:
+            paths = self.journal.unfinished_paths(batch.batch_id)
+        if not paths:
+            QMessageBox.information(
+                self, "Batch Journal",
+                "The last batch has no failed files." if failed_only else "The last batch was completed."
+            )
+            return
+
+        self.clear_list()
+        self.file_list_model.add_paths([QDir.fromNativeSeparators(path) for path in paths])
+        self.output_dir_edit.setText(QDir.fromNativeSeparators(batch.output_dir) if batch.output_dir else "")
+        self.update_ui_state()
+        self.statusBar().showMessage(f"{len(paths)} files loaded from the last batch.", 5000)
+
     def select_output_folder(self):
         folder_path = QFileDialog.getExistingDirectory(self, "Select Output Folder")
         if folder_path:
@@ -240,84 +483,126 @@ class WordToPdfConverter(QMainWindow):
         )
 
     def start_conversion(self):
-        paths_to_process = [self.file_list_widget.item(i).text() for i in range(self.file_list_widget.count())]
+        paths_to_process = self.file_list_model.paths()
         output_dir = self.output_dir_edit.text()
 
-        if not paths_to_process:
+        if not paths_to_process and not self.active_scans:
             return
 
+        policies = dict(
+            overwrite_policy=self.overwrite_policy_combo.currentData(),
+            password_policy=self.password_policy_combo.currentData(),
+            schedule=self.schedule_combo.currentData(),
+            document_timeout=self.document_timeout_spin.value() or None,
+            export_profile=self.export_profile_combo.currentData(),
+            prefetch=self.prefetch_spin.value(),
+        )
+        cache = None
+        if self.cache_checkbox.isChecked():
+            try:
+                cache = ConversionCache()
+            except OSError as e:
+                QMessageBox.warning(self, "Conversion Cache", f"The conversion cache is unavailable and will not be used:\n{e}")
+
+        journal = self.journal if self.journal_checkbox.isChecked() else None
+        self.metrics = BatchMetrics() if self.metrics_dir else None
+
         self.set_ui_for_processing(True)
 
         self.thread = QThread()
-        self.worker = self.converter_worker(paths_to_process, output_dir, self.default_password)
+        pool_size = self.pool_size_spin.value() if self.pool_size_spin else 1
+        if self.recycle_after_spin:
+            policies["recycle_after"] = self.recycle_after_spin.value() or None
+            policies["max_memory_bytes"] = self.recycle_memory_spin.value() * 1024 * 1024 or None
+        server_url = self.server_url_edit.text().strip() if self.server_url_edit else ""
+        worker_pool = None if server_url else self.shared_worker_pool(pool_size, policies)
+        if server_url:
+            self.worker = self.remote_worker(
+                paths_to_process, output_dir, self.default_password,
+                backend_factory=self.backend_factory, cache=cache,
+                input_open=self.active_scans > 0, journal=journal, metrics=self.metrics,
+                server_url=server_url, **policies
+            )
+        elif pool_size > 1 or worker_pool:
+            self.worker = self.pool_worker(
+                paths_to_process, output_dir, self.default_password,
+                backend_factory=self.backend_factory, cache=cache,
+                input_open=self.active_scans > 0, journal=journal, metrics=self.metrics,
+                pool_size=pool_size, worker_pool=worker_pool, **policies
+            )
+        else:
+            self.worker = self.converter_worker(
+                paths_to_process, output_dir, self.default_password,
+                backend_factory=self.backend_factory, cache=cache,
+                input_open=self.active_scans > 0,  # Folder scans keep feeding the batch
+                journal=journal, metrics=self.metrics, **policies
+            )
         self.worker.moveToThread(self.thread)
 
         # Connect all signals
         self.thread.started.connect(self.worker.run)
         self.worker.overall_progress.connect(self.progress_bar.setValue)
         self.worker.current_file_progress.connect(self.current_file_label.setText)
-        self.worker.file_finished.connect(self.on_file_finished)
+        self.worker.files_updated.connect(self.file_list_model.set_statuses)
         self.worker.batch_finished.connect(self.on_batch_finished)
         self.worker.fatal_error.connect(self.on_fatal_error)
-        self.worker.password_required.connect(self.handle_password_required)
-        # --- ADD THIS NEW CONNECTION ---
-        self.worker.overwrite_request.connect(self.handle_overwrite_request) 
-        
+        self.worker.prompts_pending.connect(self.handle_prompts_pending)
+
         self.thread.finished.connect(self.thread.deleteLater)
         self.worker.batch_finished.connect(self.thread.quit)
         self.worker.fatal_error.connect(self.thread.quit)
 
         self.thread.start()
 
-    def handle_password_required(self, file_index, file_path):
-        item = self.file_list_widget.item(file_index)
-        original_text = item.text().split(" --- ")[0]
-        filename = os.path.basename(original_text)
-        
-        password, ok = QInputDialog.getText(
-            self, 
-            f"Password Required for: {filename}",
-            f"The document '{filename}' is password protected.\nPlease enter the password:",
-            QLineEdit.EchoMode.Password
-        )
-        
-        if ok and password:
-            self.worker.provide_password(password)
-        else:
-            # User cancelled - skip this file
-            item.setText(f"{original_text} --- ❌ Skipped (password required)")
-            item.setBackground(QColor("#FFCCCB"))
-            self.worker.provide_password(None)
-
-    # --- ADD THIS NEW SLOT FOR OVERWRITE HANDLING ---
-    def handle_overwrite_request(self, file_index: int, full_output_path: str, pdf_name_only: str):
-        item = self.file_list_widget.item(file_index)
-        original_text = item.text().split(" --- ")[0]
-
-        reply = QMessageBox.question(
-            self, # Parent is the main window
-            "Overwrite Existing File",
-            f"The file '{pdf_name_only}' already exists at '{os.path.dirname(full_output_path)}'.\nDo you want to overwrite it?",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-            QMessageBox.StandardButton.No # Default button is 'No'
-        )
-
-        if reply == QMessageBox.StandardButton.Yes:
-            self.worker.set_overwrite_action('yes')
-        else: # QMessageBox.StandardButton.No or dialog closed
-            self.worker.set_overwrite_action('no')
-            # Update the list item immediately to reflect the skip
-            item.setText(f"{original_text} --- ➖ Skipped (user chose not to overwrite)")
-            item.setBackground(QColor("lightgray"))
+    def preview_output(self):
+        plan = plan_outputs(self.file_list_model.paths(), self.output_dir_edit.text())
+        OutputPlanDialog(plan, self.overwrite_policy_combo.currentText(), self).exec()
+
+    def shared_worker_pool(self, pool_size: int, policies: dict):
+        """The window's long-lived Word instances, if they are to be kept running."""
+        if not self.keep_word_checkbox or not self.keep_word_checkbox.isChecked():
+            self.shutdown_worker_pool()
+            return None
+        if self.worker_pool is None:
+            self.worker_pool = WorkerPool(self.backend_factory, pool_size)
+        self.worker_pool.resize(pool_size)
+        self.worker_pool.recycle_after = policies.get("recycle_after")
+        self.worker_pool.max_memory_bytes = policies.get("max_memory_bytes")
+        return self.worker_pool
+
+    def shutdown_worker_pool(self):
+        if self.worker_pool is not None:
+            self.worker_pool.shutdown()
+            self.worker_pool = None
+
+    def closeEvent(self, event):
+        self.stop_folder_scans()
+        if self.processing and self.worker:
+            # Word would outlive the window: stop the batch and wait until its runner has quit
+            self.current_file_label.setText("Stopping the conversion...")
+            self.worker.stop()
+            self.thread.quit()  # Ends the thread once run() returns; batch_finished's quit waits on this thread
+            self.thread.wait()
+        self.shutdown_worker_pool()  # Quit the Word instances kept running between batches
+        super().closeEvent(event)
+
+    def handle_prompts_pending(self, prompts: list):
+        dialog = PendingPromptsDialog(prompts, self)
+        if dialog.exec() == QDialog.DialogCode.Accepted:
+            dialog.apply_answers()
+        # Unanswered prompts are skipped by the worker
+        self.worker.prompts_resolved()
 
     def clear_list(self):
-        self.file_list_widget.clear()
+        self.stop_folder_scans()
+        self.file_list_model.clear()
         self.reset_list_visuals()
         self.update_ui_state()
 
     def update_ui_state(self):
-        has_items = self.file_list_widget.count() > 0
+        has_items = self.file_list_model.rowCount() > 0
         self.convert_button.setEnabled(has_items)
+        self.preview_button.setEnabled(has_items)
         self.clear_button.setEnabled(has_items)
         if not has_items:
             self.current_file_label.setText("Ready to start.")
@@ -325,26 +610,51 @@ class WordToPdfConverter(QMainWindow):
             self.statusBar().showMessage("Ready")
 
     def set_ui_for_processing(self, processing: bool):
+        self.processing = processing
         self.add_button.setEnabled(not processing)
+        self.add_folder_button.setEnabled(not processing)  # A running batch only takes files from scans it started with
         self.clear_button.setEnabled(not processing)
         self.convert_button.setEnabled(not processing)
+        self.preview_button.setEnabled(not processing)
         self.output_dir_button.setEnabled(not processing)
-        self.file_list_widget.setEnabled(not processing)
+        self.file_list_view.setEnabled(not processing)
         self.set_password_button.setEnabled(not processing)
         self.password_edit.setEnabled(not processing)
-
-    def on_file_finished(self, index: int, message: str, success: bool):
-        item = self.file_list_widget.item(index)
-        if item:
-            original_text = item.text().split(" --- ")[0]
-            item.setText(f"{original_text} --- {message}")
-            color = QColor("lightgreen") if success else QColor("#FFCCCB")
-            item.setBackground(color)
+        self.cache_checkbox.setEnabled(not processing)
+        self.journal_checkbox.setEnabled(not processing and self.journal is not None)
+        self.resume_button.setEnabled(not processing and self.journal is not None)
+        self.retry_failed_button.setEnabled(not processing and self.journal is not None)
+        self.overwrite_policy_combo.setEnabled(not processing)
+        self.password_policy_combo.setEnabled(not processing)
+        self.schedule_combo.setEnabled(not processing)
+        self.document_timeout_spin.setEnabled(not processing)
+        self.export_profile_combo.setEnabled(not processing)
+        self.prefetch_spin.setEnabled(not processing)
+        if self.pool_size_spin:
+            self.pool_size_spin.setEnabled(not processing)
+            self.keep_word_checkbox.setEnabled(not processing)
+            self.recycle_after_spin.setEnabled(not processing)
+            self.recycle_memory_spin.setEnabled(not processing)
+        if self.server_url_edit:
+            self.server_url_edit.setEnabled(not processing)
 
     def on_batch_finished(self, message: str):
         self.statusBar().showMessage("Batch conversion complete.", 5000)
         self.current_file_label.setText(message)
         self.set_ui_for_processing(False)
+        self.write_metrics()
+
+    def write_metrics(self):
+        """Save the batch's timing report as JSON and as a Prometheus text file."""
+        if not self.metrics:
+            return
+        try:
+            os.makedirs(self.metrics_dir, exist_ok=True)
+            stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.metrics.started_at))
+            self.metrics.write_json(os.path.join(self.metrics_dir, f"batch-{stamp}.json"))
+            self.metrics.write_prometheus(os.path.join(self.metrics_dir, "word_to_pdf.prom"))
+        except OSError as e:
+            self.statusBar().showMessage(f"Could not write the timing report: {e}", 5000)
 
     def on_fatal_error(self, message: str):
         QMessageBox.critical(self, "Fatal Error", message)
@@ -352,11 +662,7 @@ class WordToPdfConverter(QMainWindow):
         self.current_file_label.setText(message)
         self.progress_bar.setValue(0)
         self.set_ui_for_processing(False)
+        self.write_metrics()
 
     def reset_list_visuals(self):
-        for i in range(self.file_list_widget.count()):
-            item = self.file_list_widget.item(i)
-            if item:
-                original_path = item.text().split(" --- ")[0]
-                item.setText(original_path)
-                item.setBackground(QColor("white"))
+        self.file_list_model.reset_statuses()
@@ -0,0 +1,249 @@
+from multiprocessing.connection import wait
+import multiprocessing
+import os
+import signal
+import time
+
+from ConversionBackend import WordBackend
+from ConversionEngine import run_pool_child
+
+
+class _PoolSlot:
+    """Parent-side handle on one child process and the task it is working on."""
+
+    def __init__(self, worker_id, process, conn):
+        self.worker_id = worker_id
+        self.process = process
+        self.conn = conn
+        self.ready = False
+        self.task = None
+        self.task_started = None  # time.monotonic() when the task was sent
+        self.closed = False
+        self.word_pid = None  # Word's own process, reported by the child once it started
+        self.documents = 0  # Documents converted since this Word started
+        self.memory = None  # Word's working set in bytes after the last document, if known
+        self.ping_sent = None
+
+
+class WorkerPool:
+    """Child processes that each keep one Word instance running, across batches.
+
+    Starting Word costs seconds, so the pool can be created once and handed
+    to every PoolBatchRunner; a batch borrows the warm children and leaves
+    them running. Word leaks memory over long runs, so maintain() retires a
+    child (Word quits cleanly) and starts a replacement once it converted
+    `recycle_after` documents or its Word grew beyond `max_memory_bytes`.
+    check_health() makes a cheap call into every idle Word and replaces the
+    children that fail or do not answer within `health_timeout` seconds.
+
+    Only one batch may use the pool at a time.
+    """
+
+    SHUTDOWN_TIMEOUT = 10  # seconds a child gets to quit Word before it is terminated
+
+    def __init__(self, backend_factory, size=None, recycle_after=None, max_memory_bytes=None, health_timeout=30):
+        self.backend_factory = backend_factory or WordBackend
+        self.size = max(1, size or os.cpu_count() or 1)
+        self.recycle_after = recycle_after
+        self.max_memory_bytes = max_memory_bytes
+        self.health_timeout = health_timeout
+        self.recycled = 0
+        self.replaced_unhealthy = 0
+        self.slots = {}
+        self._context = multiprocessing.get_context("spawn")  # COM and Qt are not fork-safe
+        self._next_worker_id = 0
+        self._retiring = []  # Children told to quit, joined once they exited
+        self._backlog = []  # Messages received while checking health, for the next receive()
+
+    def spawn(self):
+        worker_id = self._next_worker_id
+        self._next_worker_id += 1
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=run_pool_child,
+            args=(worker_id, self.backend_factory, child_conn),
+            name=f"word-to-pdf-worker-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        slot = _PoolSlot(worker_id, process, parent_conn)
+        self.slots[worker_id] = slot
+        return slot
+
+    def ensure_size(self, count=None):
+        """Start children until `count` (default: the pool size) are alive."""
+        for _ in range((count or self.size) - len(self.live_slots())):
+            self.spawn()
+
+    def resize(self, size: int):
+        """Change the pool size; surplus idle children are retired."""
+        self.size = max(1, size)
+        for slot in self.live_slots()[self.size:]:
+            if slot.task is None:
+                self.retire(slot)
+
+    def live_slots(self):
+        return [slot for slot in list(self.slots.values()) if not slot.closed]
+
+    def busy_slots(self):
+        return [slot for slot in self.slots.values() if slot.task is not None]
+
+    def idle_slots(self):
+        return [
+            slot for slot in self.slots.values()
+            if slot.ready and slot.task is None and not slot.closed and slot.ping_sent is None
+        ]
+
+    def exited_slots(self):
+        """Children that exited without being told to."""
+        return [slot for slot in self.live_slots() if not slot.process.is_alive()]
+
+    def overdue_slots(self, timeout: float):
+        """Children still working on a task sent more than `timeout` seconds ago."""
+        now = time.monotonic()
+        return [slot for slot in self.busy_slots() if now - slot.task_started > timeout]
+
+    def send_task(self, slot, task, message):
+        slot.task = task
+        slot.task_started = time.monotonic()
+        try:
+            slot.conn.send(message)
+        except OSError:
+            pass  # The child died; it shows up in exited_slots()
+
+    def receive(self, timeout):
+        """Wait up to `timeout` seconds and return the children's messages
+        (kind, worker_id, file_index, payload) that concern the batch."""
+        messages, self._backlog = self._backlog, []
+        connections = {slot.conn: slot for slot in self.live_slots()}
+        for conn in wait(list(connections), 0 if messages else timeout):
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                continue  # The child exited
+            if self._handle_message(connections[conn], message):
+                messages.append(message)
+        self._join_retired()
+        return messages
+
+    def _handle_message(self, slot, message) -> bool:
+        kind, _, _, payload = message
+        if kind == "ready":
+            slot.ready = True
+            slot.word_pid = payload["pid"]
+        elif kind in ("converted", "error", "password"):
+            slot.documents += 1
+        elif kind == "memory":
+            slot.memory = payload
+            return False
+        elif kind == "pong":
+            slot.ping_sent = None
+            if payload is not None:
+                self.replace(slot)  # Word answered, but with an error
+                self.replaced_unhealthy += 1
+            return False
+        return True
+
+    def maintain(self):
+        """Recycle idle children whose Word is due for a restart."""
+        for slot in self.idle_slots():
+            if self._recycle_due(slot):
+                self.retire(slot)
+                self.spawn()
+                self.recycled += 1
+
+    def _recycle_due(self, slot) -> bool:
+        if self.recycle_after and slot.documents >= self.recycle_after:
+            return True
+        return bool(self.max_memory_bytes and slot.memory is not None and slot.memory > self.max_memory_bytes)
+
+    def check_health(self) -> int:
+        """Ping every idle child's Word; replace those that fail or hang.
+
+        Returns the number of children replaced.
+        """
+        replaced = 0
+        for slot in self.exited_slots():
+            self.replace(slot)  # Died while the pool was idle
+            replaced += 1
+        pinged = self.idle_slots()
+        for slot in pinged:
+            slot.ping_sent = time.monotonic()
+            try:
+                slot.conn.send("ping")
+            except OSError:
+                pass
+        deadline = time.monotonic() + self.health_timeout
+        while any(slot.ping_sent is not None and not slot.closed and slot.process.is_alive() for slot in pinged):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._backlog.extend(self.receive(min(remaining, 0.1)))
+
+        for slot in pinged:
+            if slot.closed:
+                replaced += 1  # Answered with an error
+            elif slot.ping_sent is not None:
+                self.replace(slot)
+                self.replaced_unhealthy += 1
+                replaced += 1
+        return replaced
+
+    def retire(self, slot):
+        """Let the child quit Word and exit on its own."""
+        slot.closed = True
+        del self.slots[slot.worker_id]
+        try:
+            slot.conn.send(None)
+        except OSError:
+            pass
+        self._retiring.append(slot)
+
+    def remove(self, slot):
+        """Drop a child that exited, failed or hangs, killing it and its Word."""
+        self.slots.pop(slot.worker_id, None)
+        slot.closed = True
+        self._kill(slot)
+        slot.conn.close()
+
+    def replace(self, slot):
+        self.remove(slot)
+        return self.spawn()
+
+    def _kill(self, slot):
+        if slot.process.is_alive():
+            slot.process.terminate()
+            slot.process.join(self.SHUTDOWN_TIMEOUT)
+        # Word runs in its own process; a child that died or hung leaves it behind
+        if slot.word_pid:
+            try:
+                os.kill(slot.word_pid, signal.SIGTERM)
+            except OSError:
+                pass  # Word already quit
+            slot.word_pid = None
+
+    def _join_retired(self):
+        for slot in list(self._retiring):
+            if not slot.process.is_alive():
+                slot.process.join()
+                slot.conn.close()
+                self._retiring.remove(slot)
+
+    def shutdown(self):
+        """Quit every Word and stop the children; spawn() starts over."""
+        for slot in self.slots.values():
+            slot.closed = True
+            self._retiring.append(slot)
+            try:
+                slot.conn.send(None)
+            except OSError:
+                pass
+        self.slots.clear()
+        self._backlog.clear()
+        for slot in self._retiring:
+            slot.process.join(self.SHUTDOWN_TIMEOUT)
+            if slot.process.is_alive():
+                self._kill(slot)
+            slot.conn.close()
+        self._retiring.clear()
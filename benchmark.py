@@ -0,0 +1,384 @@
+"""Reproducible throughput benchmarks.
+
+Generate a synthetic corpus once, run the conversion pipeline against it
+(simulated engine by default, or Word) and compare stored results:
+
+    python benchmark.py generate corpus --docs 500 --pages 1 20 --images 0 3 --seed 1
+    python benchmark.py run corpus --workers 4 --label pool4 --ui
+    python benchmark.py compare
+
+With several --export-profile names, `run` converts the corpus once per
+profile and compares export time and PDF size side by side.
+
+Each run stores a JSON result (docs/sec, per-stage latency, peak RSS, UI
+event-loop lag, environment) in --results-dir, named after its time and label.
+"""
+
+import argparse
+import functools
+import glob
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from BatchRunner import BatchFatalError, BatchRunner, PoolBatchRunner
+from ConversionBackend import BACKENDS, SimulatedBackend
+from ConversionMetrics import BatchMetrics
+from CostEstimator import SCHEDULES
+from CorpusGenerator import generate_corpus, load_manifest, plan_corpus
+from ExportProfile import DEFAULT_EXPORT_PROFILE, EXPORT_PROFILES
+
+DEFAULT_RESULTS_DIR = "benchmark-results"
+
+
+class PeakMemorySampler:
+    """Peak resident memory of this process and its children while running.
+
+    Uses psutil when installed, sampling the whole process tree (and
+    WINWORD.EXE, which COM starts outside it) every `interval` seconds.
+    Without psutil it falls back to the OS peak counters: getrusage on
+    POSIX (including pool children), the peak working set on Windows
+    (this process only).
+    """
+
+    def __init__(self, interval=0.2, include_word=False):
+        self.interval = interval
+        self.include_word = include_word
+        self.peak = 0
+        self.source = None
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        try:
+            import psutil
+        except ImportError:
+            return
+        self.source = "psutil"
+        self._thread = threading.Thread(target=self._sample, args=(psutil,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stopped.set()
+            self._thread.join()
+            return self.peak
+        try:
+            import resource
+        except ImportError:
+            self.source = "peak_working_set"
+            self.peak = _windows_peak_working_set()
+            return self.peak
+        self.source = "getrusage"
+        scale = 1 if sys.platform == "darwin" else 1024  # ru_maxrss is in KiB on Linux, bytes on macOS
+        self.peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) * scale
+        return self.peak
+
+    def _sample(self, psutil):
+        me = psutil.Process()
+        while True:
+            total = 0
+            processes = [me] + me.children(recursive=True)
+            if self.include_word:
+                processes += [p for p in psutil.process_iter(["name"]) if (p.info["name"] or "").upper() == "WINWORD.EXE"]
+            for process in processes:
+                try:
+                    total += process.memory_info().rss
+                except psutil.Error:
+                    pass
+            self.peak = max(self.peak, total)
+            if self._stopped.wait(self.interval):
+                break
+
+
+def _windows_peak_working_set():
+    try:
+        import ctypes
+        from ctypes import wintypes
+    except ImportError:
+        return None
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    process = ctypes.windll.kernel32.GetCurrentProcess()
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+        return None
+    return counters.PeakWorkingSetSize
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": commit,
+    }
+
+
+def parse_stage_seconds(items) -> dict:
+    """["open=0.05", "save=0.1"] -> {"open": 0.05, "save": 0.1}"""
+    seconds = {}
+    for item in items or []:
+        stage, _, value = item.partition("=")
+        seconds[stage] = float(value)
+    return seconds
+
+
+def simulated_backend_for(manifest: dict, latency=None, per_megabyte=None, jitter=0.0):
+    """A SimulatedBackend factory that knows which corpus files are protected
+    or carry revisions, so it behaves like Word on the same corpus."""
+    files = manifest["files"]
+    return functools.partial(
+        SimulatedBackend,
+        latency=latency,
+        per_megabyte=per_megabyte,
+        jitter=jitter,
+        seed=manifest.get("seed", 0),
+        password_files={os.path.basename(f["name"]): f["password"] for f in files if f["password"]},
+        revision_files=[os.path.basename(f["name"]) for f in files if f["revisions"] or f["header_revisions"]],
+    )
+
+
+def run_benchmark(corpus_dir: str, args, export_profile=DEFAULT_EXPORT_PROFILE, label=None) -> dict:
+    manifest = load_manifest(corpus_dir)
+    input_paths = [os.path.join(corpus_dir, f["name"]) for f in manifest["files"]]
+    latency = parse_stage_seconds(args.latency)
+    per_megabyte = parse_stage_seconds(args.per_mb)
+    if args.backend == "simulated":
+        backend_factory = simulated_backend_for(manifest, latency, per_megabyte, args.jitter)
+    else:
+        backend_factory = BACKENDS[args.backend]
+
+    output_dir = tempfile.mkdtemp(prefix="word-to-pdf-bench-")
+    metrics = BatchMetrics(args.slowest)
+    runner_options = dict(
+        output_dir=output_dir,
+        default_password=manifest["settings"].get("password"),
+        backend_factory=backend_factory,
+        metrics=metrics,
+        overwrite_policy=args.overwrite,
+        password_policy="skip",
+        schedule=args.schedule,
+        export_profile=export_profile,
+    )
+    if args.workers > 1:
+        runner = PoolBatchRunner(input_paths, pool_size=args.workers, **runner_options)
+    else:
+        runner = BatchRunner(input_paths, **runner_options)
+
+    sampler = PeakMemorySampler(include_word=args.backend == "word")
+    sampler.start()
+    started = time.perf_counter()
+    fatal_error = None
+    try:
+        summary = runner.run()
+    except BatchFatalError as e:
+        summary, fatal_error = None, str(e)
+    duration = time.perf_counter() - started
+    peak_rss = sampler.stop()
+    pdf_bytes = sum(os.path.getsize(path) for path in glob.glob(os.path.join(output_dir, "*.pdf")))
+
+    ui_results = None
+    try:
+        if args.ui and not fatal_error:
+            shutil.rmtree(output_dir, ignore_errors=True)
+            os.makedirs(output_dir)
+            ui_results = run_ui_benchmarks(input_paths, output_dir, backend_factory, args.ui_intervals)
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    report = metrics.report()
+    return {
+        "label": label or args.label,
+        "created_at": time.time(),
+        "environment": environment(),
+        "corpus": {
+            "path": os.path.abspath(corpus_dir),
+            "files": len(input_paths),
+            "bytes": sum(f["bytes"] for f in manifest["files"]),
+            "seed": manifest.get("seed"),
+            "settings": manifest["settings"],
+        },
+        "config": {
+            "backend": args.backend,
+            "workers": args.workers,
+            "latency": latency,
+            "per_megabyte": per_megabyte,
+            "jitter": args.jitter,
+            "overwrite_policy": args.overwrite,
+            "schedule": args.schedule,
+            "export_profile": export_profile,
+        },
+        "summary": summary,
+        "fatal_error": fatal_error,
+        "duration_seconds": round(duration, 3),
+        "docs_per_second": round(report["converted"] / duration, 2) if duration else None,
+        "peak_rss_bytes": peak_rss,
+        "pdf_bytes": pdf_bytes,
+        "peak_rss_source": sampler.source,
+        "metrics": report,
+        "ui": ui_results,
+    }
+
+
+def run_ui_benchmarks(input_paths, output_dir, backend_factory, intervals):
+    from PyQt6.QtWidgets import QApplication
+    from ui_latency_benchmark import run_ui_benchmark
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    results = []
+    for interval in intervals:
+        results.append(run_ui_benchmark(input_paths, output_dir, interval, backend_factory=backend_factory))
+        app.processEvents()
+        for path in glob.glob(os.path.join(output_dir, "*")):
+            os.remove(path)
+    return results
+
+
+def result_path(results_dir: str, label: str) -> str:
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    safe_label = "".join(c if c.isalnum() or c in "-_" else "_" for c in label)
+    return os.path.join(results_dir, f"{stamp}-{safe_label}.json")
+
+
+def comparison_rows(result: dict) -> dict:
+    rows = {
+        "docs/sec": result["docs_per_second"],
+        "duration s": result["duration_seconds"],
+        "peak RSS MiB": round(result["peak_rss_bytes"] / 2 ** 20, 1) if result.get("peak_rss_bytes") else None,
+        "PDF MiB": round(result["pdf_bytes"] / 2 ** 20, 2) if result.get("pdf_bytes") else None,
+    }
+    for stage, values in result["metrics"]["stages"].items():
+        if values["count"]:
+            rows[f"{stage} p50 ms"] = round(values["p50_seconds"] * 1000, 2)
+            rows[f"{stage} p95 ms"] = round(values["p95_seconds"] * 1000, 2)
+    for ui in result.get("ui") or []:
+        rows[f"UI lag p95 ms @{ui['progress_interval']}s"] = ui["lag_p95_ms"]
+    return rows
+
+
+def print_comparison(results, names):
+    rows = [comparison_rows(result) for result in results]
+    keys = list(dict.fromkeys(key for row in rows for key in row))
+    width = max(12, *(len(name) for name in names))
+    print(f"{'':24}" + "".join(f"{name:>{width + 2}}" for name in names) + ("    change" if len(results) == 2 else ""))
+    for key in keys:
+        values = [row.get(key) for row in rows]
+        line = f"{key:24}" + "".join(f"{'-' if v is None else v:>{width + 2}}" for v in values)
+        if len(values) == 2 and values[0] and values[1] is not None:
+            line += f"  {(values[1] - values[0]) / values[0] * 100:+7.1f}%"
+        print(line)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Word to PDF pipeline on a synthetic corpus.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="Create a synthetic .docx corpus")
+    generate.add_argument("folder")
+    generate.add_argument("--docs", type=int, default=200)
+    generate.add_argument("--pages", type=int, nargs=2, default=(1, 10), metavar=("MIN", "MAX"))
+    generate.add_argument("--images", type=int, nargs=2, default=(0, 2), metavar=("MIN", "MAX"),
+                          help="Embedded images per document")
+    generate.add_argument("--image-kb", type=int, nargs=2, default=(20, 200), metavar=("MIN", "MAX"),
+                          help="Size of each image; with --pages this controls the document size")
+    generate.add_argument("--revisions", type=float, default=0.3, help="Fraction of documents with tracked changes")
+    generate.add_argument("--header-revisions", type=float, default=0.05,
+                          help="Fraction of documents with tracked changes in the page header")
+    generate.add_argument("--protected", type=float, default=0.05, help="Fraction of password-protected documents")
+    generate.add_argument("--password", default="benchmark")
+    generate.add_argument("--collisions", type=float, default=0.05,
+                          help="Fraction of documents paired with a twin whose PDF name collides")
+    generate.add_argument("--seed", type=int, default=0)
+
+    run = commands.add_parser("run", help="Convert a corpus and store the result")
+    run.add_argument("folder")
+    run.add_argument("--backend", choices=sorted(BACKENDS), default="simulated")
+    run.add_argument("--workers", type=int, default=1)
+    run.add_argument("--latency", nargs="*", metavar="STAGE=SECONDS", default=["open=0.02", "save=0.03"],
+                     help="Simulated base latency per stage")
+    run.add_argument("--per-mb", nargs="*", metavar="STAGE=SECONDS", default=["open=0.05", "save=0.1"],
+                     help="Simulated extra latency per MiB of document")
+    run.add_argument("--jitter", type=float, default=0.2)
+    run.add_argument("--overwrite", choices=("skip", "overwrite", "rename"), default="rename",
+                     help="Policy for colliding PDF names")
+    run.add_argument("--schedule", choices=SCHEDULES, default="order",
+                     help="Conversion order: as listed, longest or shortest predicted duration first")
+    run.add_argument("--export-profile", nargs="+", choices=list(EXPORT_PROFILES), default=[DEFAULT_EXPORT_PROFILE],
+                     help="PDF export profile; with several, one run per profile")
+    run.add_argument("--slowest", type=int, default=10)
+    run.add_argument("--ui", action="store_true", help="Also measure UI event-loop lag through the GUI")
+    run.add_argument("--ui-intervals", type=float, nargs="+", default=[0.1])
+    run.add_argument("--label", default="run")
+    run.add_argument("--results-dir", default=DEFAULT_RESULTS_DIR)
+
+    compare = commands.add_parser("compare", help="Compare stored results (default: the latest two)")
+    compare.add_argument("results", nargs="*")
+    compare.add_argument("--results-dir", default=DEFAULT_RESULTS_DIR)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        settings = {key: getattr(args, key) for key in
+                    ("docs", "pages", "images", "image_kb", "revisions", "header_revisions",
+                     "protected", "password", "collisions")}
+        specs = plan_corpus(
+            args.docs, random.Random(args.seed), pages=tuple(args.pages), images=tuple(args.images),
+            image_kb=tuple(args.image_kb), revision_rate=args.revisions, header_revision_rate=args.header_revisions,
+            password_rate=args.protected, password=args.password, collision_rate=args.collisions,
+        )
+        manifest = generate_corpus(args.folder, specs, args.seed, settings)
+        total = sum(f["bytes"] for f in manifest["files"])
+        print(f"Generated {len(manifest['files'])} documents ({total / 2 ** 20:.1f} MiB) in {args.folder}.")
+        return 0
+
+    if args.command == "run":
+        os.makedirs(args.results_dir, exist_ok=True)
+        results = []
+        for profile in args.export_profile:
+            label = args.label if len(args.export_profile) == 1 else f"{args.label}-{profile}"
+            result = run_benchmark(args.folder, args, profile, label)
+            path = result_path(args.results_dir, label)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=2)
+            print(f"{label}: {result['fatal_error'] or result['summary']}")
+            print(f"Result saved to {path}")
+            results.append(result)
+        print_comparison(results, [result["label"] for result in results])
+        return 0 if not any(result["fatal_error"] for result in results) else 2
+
+    paths = args.results or sorted(glob.glob(os.path.join(args.results_dir, "*.json")))[-2:]
+    if not paths:
+        print(f"No results found in {args.results_dir}.", file=sys.stderr)
+        return 1
+    results = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            results.append(json.load(f))
+    print_comparison(results, [f"{r['label']}" for r in results])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
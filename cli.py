@@ -0,0 +1,462 @@
+"""Headless batch conversion.
+
+Runs the same BatchRunner as the GUI without importing PyQt6 or qtawesome, so
+scheduled jobs start quickly and do not need a desktop session.
+
+    python cli.py "C:/Reports/**/*.docx" --output-dir C:/PDFs --report result.json
+
+With --watch it runs as a hot-folder daemon, converting documents dropped
+into the watched folders with one Word instance kept warm between arrivals:
+
+    python cli.py --watch //server/inbox --output-dir //server/pdf
+
+With --dry-run it only lists where each PDF would go, with name collisions
+and existing PDFs, and converts nothing.
+
+Several machines can share one queue: run a job server, start an agent on
+every machine with Word, and submit batches to the server (paths must be
+reachable from every agent, e.g. on a share):
+
+    python cli.py --serve 127.0.0.1:8765
+    python cli.py --agent http://127.0.0.1:8765
+    python cli.py "//server/reports/*.docx" --server http://127.0.0.1:8765
+
+To accept other machines, serve on their network with a shared token, set
+in the WORD_TO_PDF_JOB_TOKEN environment variable of the server, the agents
+and the clients (or named with --token-env):
+
+    python cli.py --serve 0.0.0.0:8765
+    python cli.py --agent http://server:8765
+"""
+
+import argparse
+import getpass
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+from BatchJournal import BatchJournal, default_journal_path
+from BatchRunner import BatchFatalError, BatchListener, BatchRunner, PendingPrompt, PoolBatchRunner
+from ConversionBackend import BACKENDS
+from ConversionCache import DEFAULT_MAX_BYTES, ConversionCache
+from ConversionEngine import output_path_for
+from ConversionMetrics import BatchMetrics, run_profiled
+from CostEstimator import SCHEDULES
+from ExportProfile import DEFAULT_EXPORT_PROFILE, EXPORT_PROFILES
+from FolderScanner import WORD_EXTENSIONS, iter_word_files
+from HotFolder import HotFolderWatcher, IntakeStats, iter_watch_batches
+from JobAgent import JobAgent
+from JobServer import TOKEN_ENV, JobClient, JobServer
+from OutputPlan import plan_outputs
+from RemoteBatchRunner import RemoteBatchRunner
+
+EXIT_OK = 0
+EXIT_FILES_FAILED = 1
+EXIT_FATAL = 2
+
+
+class CliListener(BatchListener):
+    """Prints progress to stderr, asks for parked passwords on the terminal
+    and records every file's outcome for the report."""
+
+    def __init__(self, quiet: bool = False, stats=None, stats_interval=60.0):
+        self.quiet = quiet
+        self.results = {}
+        self.runner = None  # Set for --report: the runner forgets each file's paths once reported
+        self.paths = {}  # index -> (input, output) of the finished files, for the report
+        self.stats = stats  # IntakeStats while watching folders
+        self.stats_interval = stats_interval
+        self._last_stats = time.monotonic()
+
+    def on_status(self, text: str):
+        if not self.quiet:
+            print(text, file=sys.stderr)
+
+    def on_file_finished(self, index: int, message: str, success: bool):
+        self.results[index] = (message, success)
+        if self.runner:
+            self.paths[index] = (self.runner.input_paths[index], self.runner.output_plan.output_path(index))
+        if self.stats:
+            self.stats.record_finished(index, success)
+            if time.monotonic() - self._last_stats >= self.stats_interval:
+                self._last_stats = time.monotonic()
+                self.on_status(self.stats.summary())
+
+    def on_output_plan(self, plan):
+        for planned in plan.collisions():
+            self.on_status(f"Name collision: {planned.input_path} would overwrite the PDF of "
+                           f"{plan.entries[planned.collides_with].input_path}; "
+                           f"writing {os.path.basename(planned.output_path)} instead")
+        existing = plan.existing()
+        if existing:
+            self.on_status(f"{len(existing)} PDFs already exist:")
+            for planned in existing:
+                self.on_status(f"  {planned.output_path}")
+
+    def resolve_prompts(self, prompts):
+        if not sys.stdin.isatty():
+            return
+        for prompt in prompts:
+            if prompt.kind == PendingPrompt.PASSWORD:
+                file_name = os.path.basename(prompt.input_path)
+                prompt.answer = getpass.getpass(f"Password for {file_name} (empty to skip): ") or None
+
+
+def expand_inputs(patterns, file_list=None):
+    """Expand globs, folders (recursively) and an optional list file into
+    unique Word documents, in order."""
+    candidates = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) or [pattern]
+        for match in matches:
+            if os.path.isdir(match):
+                candidates.extend(iter_word_files(match))
+            else:
+                candidates.append(match)
+    if file_list:
+        with open(file_list, "r", encoding="utf-8-sig") as f:
+            candidates.extend(line.strip() for line in f if line.strip())
+
+    seen = set()
+    paths = []
+    for path in candidates:
+        key = os.path.normcase(os.path.abspath(path))
+        if key in seen or not path.lower().endswith(WORD_EXTENSIONS):
+            continue
+        seen.add(key)
+        paths.append(path)
+    return paths
+
+
+def print_output_plan(plan, overwrite_policy: str):
+    """Dry run: list where every PDF would go, and what is in the way."""
+    for index, planned in sorted(plan.entries.items()):
+        notes = planned.notes()
+        if planned.existing is not None:
+            notes[-1] += f" ({overwrite_policy})"
+        suffix = f"  [{'; '.join(notes)}]" if notes else ""
+        print(f"{planned.input_path} -> {planned.output_path}{suffix}")
+    print(f"{len(plan.entries)} files, {len(plan.collisions())} name collisions, "
+          f"{len(plan.existing())} existing PDFs.", file=sys.stderr)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Convert Word documents to PDF without the GUI.")
+    parser.add_argument("inputs", nargs="*", help="Word files, folders or glob patterns (use ** for recursion)")
+    parser.add_argument("--file-list", help="Text file with one input path per line")
+    parser.add_argument("--output-dir", help="Folder for the PDFs (default: next to each input)")
+    parser.add_argument("--overwrite", choices=("skip", "overwrite", "rename", "newer"),
+                        help="What to do when the PDF already exists: 'newer' overwrites it only if the "
+                             "document changed since (default: skip, or newer with --watch)")
+    parser.add_argument("--password-env", metavar="VAR",
+                        help="Environment variable holding the default password for protected files")
+    parser.add_argument("--on-password", choices=("skip", "prompt"), default="skip",
+                        help="When no known password works: skip the file, or ask on the terminal "
+                             "once the other files are done")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="word")
+    parser.add_argument("--workers", type=int, default=1, help="Number of parallel Word instances")
+    parser.add_argument("--server", metavar="URL",
+                        help="Have the agents of the job server at URL convert the batch")
+    parser.add_argument("--serve", metavar="[HOST:]PORT",
+                        help="Run a job server for --server clients and --agent machines (localhost "
+                             "unless HOST is given), until Ctrl+C")
+    parser.add_argument("--agent", metavar="URL",
+                        help="Convert the files queued on the job server at URL, until Ctrl+C")
+    parser.add_argument("--token-env", metavar="VAR", default=TOKEN_ENV,
+                        help="Environment variable holding the job server's shared token, required to "
+                             f"--serve beyond localhost (default: {TOKEN_ENV})")
+    parser.add_argument("--agent-name", help="Name of this agent on the job server (default: host name)")
+    parser.add_argument("--lease-seconds", type=float, default=60.0,
+                        help="With --serve: files of agents silent for this long go to other agents")
+    parser.add_argument("--recycle-after", type=int, metavar="N",
+                        help="Restart each Word instance after it converted N documents")
+    parser.add_argument("--recycle-memory-mb", type=int, metavar="MB",
+                        help="Restart a Word instance once it uses more than MB megabytes")
+    parser.add_argument("--schedule", choices=SCHEDULES, default="order",
+                        help="Conversion order: as given, longest documents first (shortest batch "
+                             "with --workers) or shortest first (first PDFs soonest)")
+    parser.add_argument("--export-profile", choices=list(EXPORT_PROFILES), default=DEFAULT_EXPORT_PROFILE,
+                        help="PDF options: 'fast' and 'small' skip structure tags and bookmarks, "
+                             "'archive' writes PDF/A")
+    parser.add_argument("--document-timeout", type=float, metavar="SECONDS",
+                        help="Give up on a document after SECONDS, restarting its Word instance")
+    parser.add_argument("--prefetch", type=int, default=0, metavar="K",
+                        help="Copy the next K documents to a local folder while Word converts, and "
+                             "write PDFs there before moving them; helps with slow network shares")
+    parser.add_argument("--staging-max-mb", type=int, default=2048, metavar="MB",
+                        help="Disk space the local copies of --prefetch may use (default: %(default)s)")
+    parser.add_argument("--no-preflight", action="store_true",
+                        help="Hand every file to Word, without first rejecting lock files, "
+                             "non-Word and damaged files")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Only list each input's PDF, name collisions and existing PDFs, then exit")
+    parser.add_argument("--cache", action="store_true", help="Reuse PDFs of unchanged documents")
+    parser.add_argument("--cache-dir", help="Conversion cache folder (implies --cache)")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024))
+    parser.add_argument("--journal", nargs="?", const=default_journal_path(), metavar="PATH",
+                        help="Record progress in a SQLite journal so the batch can be resumed")
+    resume_group = parser.add_mutually_exclusive_group()
+    resume_group.add_argument("--resume", action="store_true",
+                              help="Convert the files the last journaled batch did not finish (implies --journal)")
+    resume_group.add_argument("--retry-failed", action="store_true",
+                              help="Convert only the files that failed in the last journaled batch (implies --journal)")
+    parser.add_argument("--watch", action="append", metavar="FOLDER",
+                        help="Keep running and convert Word files as they arrive in FOLDER (repeatable)")
+    parser.add_argument("--recursive", action="store_true", help="Also watch the subfolders of watched folders")
+    parser.add_argument("--settle-seconds", type=float, default=2.0,
+                        help="How long a file's size and mtime must stay unchanged before it is converted")
+    parser.add_argument("--poll-seconds", type=float, default=1.0, help="Interval between scans of watched folders")
+    parser.add_argument("--batch-window", type=float, default=2.0,
+                        help="Seconds to gather a burst of arriving files before queueing them together")
+    parser.add_argument("--stats-seconds", type=float, default=60.0,
+                        help="Interval for printing queue depth and arrival-to-PDF latency while watching")
+    parser.add_argument("--metrics-json", metavar="PATH",
+                        help="Write per-stage timings (p50/p95, bytes in/out, slowest documents) as JSON")
+    parser.add_argument("--metrics-prom", metavar="PATH",
+                        help="Write the same timings as a Prometheus text file (e.g. for a textfile collector)")
+    parser.add_argument("--slowest", type=int, default=10, help="Number of slowest documents in the timing report")
+    parser.add_argument("--profile", metavar="PATH", help="Save a cProfile of the conversion thread to PATH")
+    parser.add_argument("--report", help="Write a JSON result report to this path ('-' for stdout)")
+    parser.add_argument("--quiet", action="store_true", help="Only print the final summary")
+    return parser
+
+
+def write_report(path: str, report: dict):
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if path == "-":
+        print(text)
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def watch_folders(runner, args, stats, listener):
+    """Run `runner` on a background thread and feed it the files arriving in
+    the watched folders until Ctrl+C; returns (summary, fatal_error)."""
+    outcome = {"summary": None, "fatal_error": None}
+    runner_done = threading.Event()
+
+    def run_batch():
+        try:
+            outcome["summary"] = run_profiled(args.profile, runner.run)
+        except BatchFatalError as e:
+            outcome["fatal_error"] = str(e)
+        finally:
+            runner_done.set()
+
+    thread = threading.Thread(target=run_batch, name="batch-runner", daemon=True)
+    thread.start()
+    watcher = HotFolderWatcher(args.watch, args.settle_seconds, args.recursive)
+    listener.on_status(f"Watching {', '.join(args.watch)} (Ctrl+C to stop)...")
+    try:
+        for batch in iter_watch_batches(watcher, args.poll_seconds, args.batch_window, stop_event=runner_done):
+            stats.record_arrivals(len(runner.input_paths), [first_seen for _, first_seen in batch])
+            listener.on_status(f"Queued {len(batch)} new files. {stats.summary()}")
+            runner.add_paths([path for path, _ in batch])
+    except KeyboardInterrupt:
+        pass
+
+    runner.close_input()
+    try:
+        if thread.is_alive():
+            listener.on_status(f"Stopped watching; finishing {stats.queue_depth} queued files (Ctrl+C to abort)...")
+        while thread.is_alive():
+            thread.join(0.5)
+    except KeyboardInterrupt:
+        runner.stop()
+        thread.join()
+        outcome["fatal_error"] = outcome["fatal_error"] or "Interrupted."
+    return outcome["summary"], outcome["fatal_error"]
+
+
+def serve(args) -> int:
+    host, _, port = args.serve.rpartition(":")
+    try:
+        server = JobServer(host or "127.0.0.1", int(port), args.lease_seconds, token=job_token(args))
+    except (ValueError, OSError) as e:
+        print(f"Cannot serve on {args.serve}: {e}", file=sys.stderr)
+        return EXIT_FATAL
+    print(f"Job server listening on {server.url} (Ctrl+C to stop)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return EXIT_OK
+
+
+def job_token(args):
+    return os.environ.get(args.token_env) or None
+
+
+def run_agent(args) -> int:
+    on_status = (lambda text: None) if args.quiet else (lambda text: print(text, file=sys.stderr))
+    agent = JobAgent(JobClient(args.agent, token=job_token(args)), BACKENDS[args.backend], args.agent_name, args.document_timeout,
+                     on_status=on_status)
+    thread = threading.Thread(target=agent.run, name="job-agent", daemon=True)
+    thread.start()
+    try:
+        while thread.is_alive():
+            thread.join(0.5)
+    except KeyboardInterrupt:
+        on_status("Stopping after the current document (Ctrl+C again to abort)...")
+        agent.stop()
+        thread.join()
+    print(agent.fatal_error or f"Agent stopped after converting {agent.converted} files.", file=sys.stderr)
+    return EXIT_FATAL if agent.fatal_error else EXIT_OK
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.serve and args.agent:
+        parser.error("--serve and --agent need separate processes")
+    if args.serve:
+        return serve(args)
+    if args.agent:
+        return run_agent(args)
+    if args.server and args.workers > 1:
+        parser.error("--workers cannot be used with --server; every agent runs its own Word")
+    if args.watch and args.on_password == "prompt":
+        parser.error("--on-password prompt cannot be used with --watch")
+    if args.watch and args.dry_run:
+        parser.error("--dry-run cannot be used with --watch")
+    input_paths = expand_inputs(args.inputs, args.file_list)
+
+    journal = None
+    if args.journal or args.resume or args.retry_failed:
+        try:
+            journal = BatchJournal(args.journal or default_journal_path())
+        except OSError as e:
+            print(e, file=sys.stderr)
+            return EXIT_FATAL
+    if args.resume or args.retry_failed:
+        batch = journal.last_batch()
+        if batch is None:
+            print("The journal has no previous batch.", file=sys.stderr)
+            return EXIT_FATAL
+        if args.resume:
+            input_paths += journal.unfinished_paths(batch.batch_id)
+        else:
+            input_paths += journal.failed_paths(batch.batch_id)
+        if args.output_dir is None:
+            args.output_dir = batch.output_dir
+
+    if args.dry_run:
+        print_output_plan(plan_outputs(input_paths, args.output_dir), args.overwrite or "skip")
+        if journal:
+            journal.close()
+        return EXIT_OK
+
+    if args.output_dir:
+        try:
+            os.makedirs(args.output_dir, exist_ok=True)
+        except OSError as e:
+            print(f"Cannot create the output folder {args.output_dir}: {e}", file=sys.stderr)
+            if journal:
+                journal.close()
+            return EXIT_FATAL
+
+    default_password = os.environ.get(args.password_env) if args.password_env else None
+
+    cache = None
+    if args.cache or args.cache_dir:
+        cache = ConversionCache(args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024)
+
+    stats = IntakeStats() if args.watch else None
+    if stats:
+        stats.record_arrivals(0, [time.time()] * len(input_paths))
+    listener = CliListener(args.quiet, stats, args.stats_seconds)
+    metrics = BatchMetrics(args.slowest) if args.metrics_json or args.metrics_prom else None
+    runner_options = dict(
+        input_open=bool(args.watch),
+        overwrite_policy=args.overwrite or ("newer" if args.watch else "skip"),
+        password_policy="ask" if args.on_password == "prompt" else "skip",
+        output_dir=args.output_dir,
+        default_password=default_password,
+        backend_factory=BACKENDS[args.backend],
+        cache=cache,
+        listener=listener,
+        journal=journal,
+        metrics=metrics,
+        preflight=not args.no_preflight,
+        schedule=args.schedule,
+        document_timeout=args.document_timeout,
+        export_profile=args.export_profile,
+        prefetch=max(0, args.prefetch),
+        staging_max_bytes=args.staging_max_mb * 1024 * 1024,
+        recycle_after=args.recycle_after,
+        max_memory_bytes=args.recycle_memory_mb * 1024 * 1024 if args.recycle_memory_mb else None,
+    )
+    if args.server:
+        runner = RemoteBatchRunner(input_paths, client=JobClient(args.server, token=job_token(args)),
+                                   **runner_options)
+    elif args.workers > 1:
+        runner = PoolBatchRunner(input_paths, pool_size=args.workers, **runner_options)
+    else:
+        runner = BatchRunner(input_paths, **runner_options)
+    if args.report:
+        listener.runner = runner
+
+    started = time.time()
+    fatal_error = None
+    if args.watch:
+        summary, fatal_error = watch_folders(runner, args, stats, listener)
+    else:
+        try:
+            summary = run_profiled(args.profile, runner.run)
+        except BatchFatalError as e:
+            summary, fatal_error = None, str(e)
+        except KeyboardInterrupt:
+            runner.stop()
+            summary, fatal_error = None, "Interrupted."
+    finished = time.time()
+    if journal:
+        journal.close()
+    if metrics:
+        if args.metrics_json:
+            metrics.write_json(args.metrics_json)
+        if args.metrics_prom:
+            metrics.write_prometheus(args.metrics_prom)
+
+    files = []
+    for index, input_path in enumerate(runner.input_paths):
+        message, success = listener.results.get(index, ("Not processed", False))
+        input_path, output_path = listener.paths.get(index, (input_path, runner.output_plan.output_path(index)))
+        if input_path is not None:  # None: finished, and only kept with --report
+            output_path = output_path or output_path_for(input_path, args.output_dir)[0]
+        files.append({
+            "index": index,
+            "input": input_path and os.path.abspath(input_path),
+            "output": output_path and os.path.abspath(output_path),
+            "success": success,
+            "message": message,
+        })
+
+    if args.report:
+        write_report(args.report, {
+            "started_at": started,
+            "finished_at": finished,
+            "duration_seconds": round(finished - started, 3),
+            "backend": args.backend,
+            "workers": args.workers,
+            "summary": summary,
+            "fatal_error": fatal_error,
+            "converted": sum(1 for f in files if f["success"]),
+            "failed": sum(1 for f in files if not f["success"]),
+            "intake": stats.snapshot() if stats else None,
+            "files": files,
+        })
+
+    print(fatal_error or summary, file=sys.stderr)
+    if fatal_error:
+        return EXIT_FATAL
+    return EXIT_OK if all(f["success"] for f in files) else EXIT_FILES_FAILED
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -1,11 +1,28 @@
 from PyQt6.QtWidgets import QApplication
 from ConverterWorker import ConverterWorker
+from ConverterPool import PoolConverterWorker, RemoteConverterWorker
 from WordToPdfConverter import WordToPdfConverter
+from ConversionBackend import BACKENDS
 
+import functools
+import multiprocessing
+import os
 import sys
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Pool workers re-launch the frozen executable
     app = QApplication(sys.argv)
-    window = WordToPdfConverter(converter_worker=ConverterWorker)
+    # WORD_TO_PDF_BACKEND=simulated runs the GUI without Microsoft Word (profiling, Linux builds)
+    backend_factory = BACKENDS[os.environ.get("WORD_TO_PDF_BACKEND", "word")]
+    # WORD_TO_PDF_METRICS_DIR saves per-batch timing reports; WORD_TO_PDF_PROFILE saves
+    # a cProfile of the conversion thread (both opt-in, for diagnosing slow batches)
+    profile_path = os.environ.get("WORD_TO_PDF_PROFILE")
+    window = WordToPdfConverter(
+        converter_worker=functools.partial(ConverterWorker, profile_path=profile_path),
+        backend_factory=backend_factory,
+        pool_worker=functools.partial(PoolConverterWorker, profile_path=profile_path),
+        metrics_dir=os.environ.get("WORD_TO_PDF_METRICS_DIR"),
+        remote_worker=functools.partial(RemoteConverterWorker, profile_path=profile_path),
+    )
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    sys.exit(app.exec())
@@ -0,0 +1,135 @@
+"""Measures how responsive the GUI stays while a batch reports progress.
+
+Converts a folder of placeholder documents with the simulated Word engine
+through the real window, once with every progress event sent to the UI
+thread as it happens and once through the progress aggregator, and reports
+how late a 10 ms timer on the UI thread fires (event-loop lag) and how long
+the batch took.
+
+    python ui_latency_benchmark.py --files 5000
+    QT_QPA_PLATFORM=offscreen python ui_latency_benchmark.py --json
+"""
+
+import argparse
+import functools
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from PyQt6.QtCore import QElapsedTimer, QEventLoop, QTimer
+from PyQt6.QtWidgets import QApplication
+
+from ConversionBackend import SimulatedBackend
+from ConversionMetrics import percentile
+from ConverterWorker import ConverterWorker
+from CorpusGenerator import DocumentSpec, docx_bytes
+from WordToPdfConverter import WordToPdfConverter
+
+TICK_MS = 10
+
+
+def make_placeholder_corpus(folder: str, count: int) -> list:
+    """Copies of one small generated .docx; the simulated engine only checks
+    that they exist, but they must pass the pre-flight validation."""
+    content, _ = docx_bytes(DocumentSpec("placeholder.docx"), random.Random(0))
+    paths = []
+    for number in range(count):
+        path = os.path.join(folder, f"document_{number:06d}.docx")
+        with open(path, "wb") as f:
+            f.write(content)
+        paths.append(path)
+    return paths
+
+
+def run_ui_benchmark(input_paths, output_dir: str, progress_interval: float, latency=None,
+                     backend_factory=None) -> dict:
+    """Convert `input_paths` through a WordToPdfConverter window and measure its event loop."""
+    worker_class = functools.partial(ConverterWorker, progress_interval=progress_interval)
+    backend_factory = backend_factory or functools.partial(SimulatedBackend, latency=latency)
+    window = WordToPdfConverter(worker_class, backend_factory)
+    window.journal_checkbox.setChecked(False)
+    window.overwrite_policy_combo.setCurrentIndex(window.overwrite_policy_combo.findData("rename"))
+    window.password_policy_combo.setCurrentIndex(window.password_policy_combo.findData("skip"))
+    window.output_dir_edit.setText(output_dir)
+    window.file_list_model.add_paths(input_paths)
+    window.show()
+
+    lags = []
+    clock = QElapsedTimer()
+    ticker = QTimer()
+    ticker.setInterval(TICK_MS)
+
+    def on_tick():
+        elapsed = clock.restart()
+        lags.append(max(0, elapsed - TICK_MS))
+
+    ticker.timeout.connect(on_tick)
+    loop = QEventLoop()
+    started = time.perf_counter()
+    clock.start()
+    ticker.start()
+    window.start_conversion()
+    window.worker.batch_finished.connect(loop.quit)
+    window.worker.fatal_error.connect(loop.quit)
+    loop.exec()
+    duration = time.perf_counter() - started
+    ticker.stop()
+
+    window.thread.wait()
+    window.close()
+    window.deleteLater()
+
+    lags.sort()
+    return {
+        "progress_interval": progress_interval,
+        "files": len(input_paths),
+        "duration_seconds": round(duration, 3),
+        "files_per_second": round(len(input_paths) / duration, 1) if duration else None,
+        "ticks": len(lags),
+        "lag_p50_ms": percentile(lags, 0.50) or 0,
+        "lag_p95_ms": percentile(lags, 0.95) or 0,
+        "lag_max_ms": lags[-1] if lags else 0,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark UI event-loop latency during a batch.")
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--open-latency", type=float, default=0.0, help="Simulated seconds per document open")
+    parser.add_argument("--intervals", type=float, nargs="+", default=[0.0, 0.1],
+                        help="Progress intervals to compare (0 sends every event unbatched)")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    work_dir = tempfile.mkdtemp(prefix="word-to-pdf-ui-bench-")
+    try:
+        input_dir = os.path.join(work_dir, "in")
+        output_dir = os.path.join(work_dir, "out")
+        os.makedirs(input_dir)
+        os.makedirs(output_dir)
+        input_paths = make_placeholder_corpus(input_dir, args.files)
+
+        results = []
+        for interval in args.intervals:
+            results.append(run_ui_benchmark(input_paths, output_dir, interval, {"open": args.open_latency}))
+            app.processEvents()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'interval':>9} {'files/s':>9} {'lag p50':>8} {'lag p95':>8} {'lag max':>8}")
+        for r in results:
+            print(f"{r['progress_interval']:>8.3f}s {r['files_per_second']:>9} "
+                  f"{r['lag_p50_ms']:>6}ms {r['lag_p95_ms']:>6}ms {r['lag_max_ms']:>6}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())